@@ -0,0 +1,60 @@
+"""
+Read-through cache for the signed-in user.
+
+``AuthenticationMiddleware`` resolves ``request.user`` from the session
+whenever a view or template looks at it, and ``ModelBackend`` fetches the
+``User`` row to do so: one query per request for every signed-in visitor,
+on top of loading the session. With ``AUTH_CACHE`` on, sessions use the
+``cached_db`` engine and ``CachedModelBackend`` keeps users in the cache,
+so a returning user's request needs neither table.
+
+Cached users are keyed by a per-user version, an opaque token that
+``accounts.signals`` replaces when the user is saved or deleted or logs
+out, the same scheme ``frtuna.cache`` uses for the catalog. The session
+still carries the password hash check, so a password change made
+elsewhere ends other sessions once the new version is seen.
+"""
+
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from frtuna.cache import stats
+
+
+def _version_key(user_id):
+    return f'accounts:user-version:{user_id}'
+
+
+def get_user_version(user_id):
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        cache.add(_version_key(user_id), uuid.uuid4().hex, None)
+        version = cache.get(_version_key(user_id))
+    return version or uuid.uuid4().hex
+
+
+def bump_user_version(user_id):
+    """Stop serving the cached copy of this user."""
+    cache.set(_version_key(user_id), uuid.uuid4().hex, None)
+
+
+class CachedModelBackend(ModelBackend):
+    """``ModelBackend`` whose ``get_user`` reads through the cache when ``AUTH_CACHE`` is on."""
+
+    def get_user(self, user_id):
+        if not settings.AUTH_CACHE:
+            return super().get_user(user_id)
+        key = f'accounts:user:{user_id}:{get_user_version(user_id)}'
+        user = cache.get(key)
+        if user is not None:
+            stats.hit('user')
+            return user
+
+        stats.miss('user')
+        user = super().get_user(user_id)
+        if user is not None:
+            cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
@@ -0,0 +1,41 @@
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import Lower
+
+
+# A frozen copy of accounts.models.USER_EMAIL_UNIQUE.
+EMAIL_UNIQUE = models.UniqueConstraint(
+    Lower('email'), condition=~Q(email=''), name='accounts_user_email_ci_uniq',
+)
+
+
+def add_constraint(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    duplicates = list(
+        User.objects.using(schema_editor.connection.alias).exclude(email='')
+        .values(email_lower=Lower('email')).annotate(n=Count('id')).filter(n__gt=1)
+        .values_list('email_lower', flat=True)[:10]
+    )
+    if duplicates:
+        raise RuntimeError(
+            'Cannot make user emails unique; these are shared by several accounts: '
+            + ', '.join(duplicates)
+        )
+    schema_editor.add_constraint(User, EMAIL_UNIQUE)
+
+
+def remove_constraint(apps, schema_editor):
+    schema_editor.remove_constraint(apps.get_model('auth', 'User'), EMAIL_UNIQUE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    # auth.User belongs to another app, so the constraint is created on its
+    # table directly rather than through a model state change.
+    operations = [
+        migrations.RunPython(add_constraint, remove_constraint),
+    ]
@@ -1,3 +1,14 @@
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Lower
 
 # Create your models here.
+
+# auth.User only makes usernames unique. Migration 0001 adds this
+# constraint to its table, so two accounts cannot share an email in any
+# letter case; blank emails (e.g. from createsuperuser) are left alone.
+# ``accounts.views`` filters with the same expression and condition so the
+# lookup can use the index.
+USER_EMAIL_UNIQUE = models.UniqueConstraint(
+    Lower('email'), condition=~Q(email=''), name='accounts_user_email_ci_uniq',
+)
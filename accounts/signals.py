@@ -0,0 +1,22 @@
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_logged_out
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .backends import bump_user_version
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_cached_user(sender, instance, using, **kwargs):
+    """Drop the cached copy of a changed user (including ``last_login`` on login)."""
+    # As for the catalog: now, and again once a concurrent request can no
+    # longer have cached the row as it was before this transaction.
+    bump_user_version(instance.pk)
+    transaction.on_commit(lambda: bump_user_version(instance.pk), using=using)
+
+
+@receiver(user_logged_out)
+def forget_logged_out_user(sender, request, user, **kwargs):
+    if user is not None:
+        bump_user_version(user.pk)
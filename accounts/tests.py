@@ -1,3 +1,276 @@
+from django.contrib.auth.models import User
+from django.contrib.messages import get_messages
+from django.db import IntegrityError, transaction
 from django.test import TestCase
+from django.urls import reverse
 
 # Create your tests here.
+
+
+class RegisterTest(TestCase):
+    """Test cases for signing up"""
+
+    def setUp(self):
+        """Create an existing account"""
+        User.objects.create_user(username='abebe', email='Abebe@Example.com', password='pass12345')
+
+    def _form(self, **overrides):
+        form = {
+            'first_name': 'Sara', 'last_name': 'Tesfaye', 'username': 'sara',
+            'email': 'sara@example.com', 'password': 'pass12345', 'confirm-password': 'pass12345',
+        }
+        form.update(overrides)
+        return form
+
+    def _messages(self, response):
+        return [str(message) for message in get_messages(response.wsgi_request)]
+
+    def test_register_creates_user(self):
+        """A valid signup creates the account with a hashed password"""
+        response = self.client.post(reverse('register'), self._form())
+        self.assertRedirects(response, reverse('login'), fetch_redirect_response=False)
+        user = User.objects.get(username='sara')
+        self.assertEqual(user.first_name, 'Sara')
+        self.assertTrue(user.check_password('pass12345'))
+
+    def test_taken_username_and_email(self):
+        """Usernames and emails in use are rejected, emails in any letter case"""
+        response = self.client.post(reverse('register'), self._form(username='abebe'))
+        self.assertEqual(self._messages(response), ['username taken'])
+        response = self.client_class().post(reverse('register'), self._form(email='ABEBE@example.COM'))
+        self.assertEqual(self._messages(response), ['email taken'])
+        self.assertFalse(User.objects.filter(username='sara').exists())
+
+    def test_uniqueness_is_checked_in_one_query(self):
+        """Username and email are looked up together"""
+        from .views import _conflicts
+        with self.assertNumQueries(1):
+            self.assertEqual(list(_conflicts('nobody', 'abebe@example.com')), ['abebe'])
+
+    def test_database_rejects_case_variant_emails(self):
+        """The unique index holds even when the view's check is bypassed"""
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            User.objects.create_user(username='other', email='abebe@EXAMPLE.com')
+        # Accounts without an email are not affected.
+        User.objects.create_user(username='blank1')
+        User.objects.create_user(username='blank2')
+
+    def test_concurrent_signup_loses_to_the_constraint(self):
+        """A duplicate that slips past the check is reported, not created"""
+        from unittest import mock
+        with mock.patch('accounts.views._conflict_message', side_effect=[None, 'email taken']):
+            response = self.client.post(reverse('register'), self._form(email='abebe@example.com'))
+        self.assertEqual(self._messages(response), ['email taken'])
+        self.assertEqual(User.objects.filter(email__iexact='abebe@example.com').count(), 1)
+
+    async def test_async_register_hashes_off_the_event_loop(self):
+        """aregister creates the account with the hash computed on a worker thread"""
+        import threading
+        from unittest import mock
+        from django.contrib.auth.hashers import make_password
+        from django.contrib.messages.storage.fallback import FallbackStorage
+        from django.contrib.sessions.backends.db import SessionStore
+        from django.test import AsyncRequestFactory
+        from . import views
+
+        loop_thread, threads = threading.current_thread(), []
+
+        def hash_password(password):
+            threads.append(threading.current_thread())
+            return make_password(password)
+
+        def request(form):
+            request = AsyncRequestFactory().post('/accounts/register', form)
+            request.session = SessionStore()
+            request._messages = FallbackStorage(request)
+            return request
+
+        with mock.patch('accounts.views.make_password', hash_password):
+            response = await views.aregister(request(self._form()))
+            self.assertEqual(response.url, reverse('login'))
+            taken = request(self._form(username='other', email='SARA@example.com'))
+            self.assertEqual((await views.aregister(taken)).url, reverse('register'))
+
+        self.assertEqual([str(message) for message in taken._messages], ['email taken'])
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], loop_thread)
+        user = await User.objects.aget(username='sara')
+        self.assertTrue(await user.acheck_password('pass12345'))
+
+
+class AuthCacheTest(TestCase):
+    """Test the cached sessions and signed-in user"""
+
+    def setUp(self):
+        """Start from an empty cache with a signed-in user"""
+        from django.core.cache import cache
+        cache.clear()
+        self.user = User.objects.create_user(username='abebe', password='pass12345', first_name='Abebe')
+        self.client.force_login(self.user)
+
+    def test_signed_in_requests_need_no_queries(self):
+        """Once cached, neither the session nor the user is read from the database"""
+        self.client.get(reverse('index'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('index'))
+        self.assertContains(response, 'Abebe')
+
+    def test_saving_the_user_refreshes_the_cache(self):
+        """Changes to the user show up on the next request, deactivation signs out"""
+        self.client.get(reverse('index'))
+        self.user.first_name = 'Almaz'
+        self.user.save()
+        self.assertContains(self.client.get(reverse('index')), 'Almaz')
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertNotContains(self.client.get(reverse('index')), 'Almaz')
+
+    def test_logout_ends_the_cached_session(self):
+        """After logging out the old session cookie no longer signs anyone in"""
+        from django.conf import settings
+        self.client.get(reverse('index'))
+        cookie = self.client.cookies[settings.SESSION_COOKIE_NAME].value
+        self.client.get(reverse('logout'))
+
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = cookie
+        self.assertNotContains(self.client.get(reverse('index')), 'Abebe')
+
+    def test_anonymous_visitors_never_read_sessions(self):
+        """Pages and failed logins of anonymous visitors do not touch the session table"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        client = self.client_class()
+        with CaptureQueriesContext(connection) as queries:
+            client.get(reverse('index'))
+            client.get(reverse('register'))
+            client.post(reverse('login'), {'username': 'abebe', 'password': 'wrong'})
+            response = client.get(reverse('login'))
+        self.assertContains(response, 'invalid credentials')
+        self.assertFalse([query['sql'] for query in queries if 'django_session' in query['sql']])
+
+    def test_cache_can_be_turned_off(self):
+        """Without AUTH_CACHE every lookup goes to the database"""
+        from django.test import override_settings
+        from .backends import CachedModelBackend
+        with override_settings(AUTH_CACHE=False), self.assertNumQueries(2):
+            CachedModelBackend().get_user(self.user.pk)
+            CachedModelBackend().get_user(self.user.pk)
+
+
+class LoginThrottleTest(TestCase):
+    """Test that login attempts over the limits are turned away before hashing"""
+
+    def setUp(self):
+        """Small limits, empty counts and a user to log in as"""
+        from django.core.cache import caches
+        from django.test import override_settings
+        from .throttling import stats
+        throttled = override_settings(LOGIN_THROTTLE={'IP_LIMIT': 4, 'USERNAME_LIMIT': 2, 'WINDOW': 60})
+        throttled.enable()
+        self.addCleanup(throttled.disable)
+        caches['login-throttle'].clear()
+        stats.reset()
+        self.stats = stats
+        User.objects.create_user(username='abebe', password='pass12345')
+
+    def _login(self, username, password='wrong', **extra):
+        return self.client.post(reverse('login'), {'username': username, 'password': password}, **extra)
+
+    def test_username_limit(self):
+        """Once a username is over its limit even the right password is refused"""
+        self.assertEqual(self._login('abebe').status_code, 302)
+        self.assertEqual(self._login('Abebe').status_code, 302)
+        response = self._login('abebe', 'pass12345')
+        self.assertEqual(response.status_code, 429)
+        self.assertLessEqual(int(response['Retry-After']), 60)
+        self.assertContains(response, 'too many login attempts', status_code=429)
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+    def test_ip_limit_spans_usernames(self):
+        """Trying many usernames from one address is limited too"""
+        statuses = [self._login(f'user{i}').status_code for i in range(6)]
+        self.assertEqual(statuses, [302] * 4 + [429] * 2)
+        # Another address is unaffected.
+        self.assertEqual(self._login('user9', REMOTE_ADDR='10.0.0.2').status_code, 302)
+
+    def test_success_clears_the_username_count(self):
+        """Earlier typos do not count against the next session"""
+        self._login('abebe')
+        self.assertEqual(self._login('abebe', 'pass12345').status_code, 302)
+        self.client.logout()
+        self.assertEqual(self._login('abebe').status_code, 302)
+        self.assertEqual(self._login('abebe', 'pass12345').status_code, 302)
+        self.assertEqual(self.stats.snapshot(),
+                         {'allowed': 4, 'rejected': 0, 'failed': 2, 'succeeded': 2})
+
+    def test_rejected_attempts_do_not_extend_a_username_lockout(self):
+        """Only wrong passwords count against a username, so guessing on cannot keep it locked"""
+        from django.core.cache import caches
+        from django.test import RequestFactory
+        from .throttling import LoginThrottle
+        now = [1020.0]  # the start of a 60-second bucket
+        throttle = LoginThrottle(cache=caches['login-throttle'], clock=lambda: now[0])
+        request = RequestFactory().post('/')
+        for _ in range(2):
+            self.assertIsNone(throttle.attempt(request, 'abebe'))
+            throttle.failed('abebe')
+
+        now[0] = 1050
+        for i in range(6):
+            request.META['REMOTE_ADDR'] = f'10.0.0.{i}'
+            self.assertIsNotNone(throttle.attempt(request, 'Abebe'))
+        now[0] = 1110  # half into the next bucket: the failures have faded to one
+        self.assertIsNone(throttle.attempt(request, 'abebe'))
+
+    def test_window_slides(self):
+        """The previous window's hits fade out as the current one goes on"""
+        from django.core.cache import caches
+        from .throttling import SlidingWindowCounter
+        now = [1000.0]  # the start of a 10-second bucket
+        counter = SlidingWindowCounter(caches['login-throttle'], 'test', 10, clock=lambda: now[0])
+        for _ in range(4):
+            counter.hit('key')
+        now[0] = 1012.5  # a quarter into the next bucket
+        self.assertEqual(counter.hit('key'), 1 + 4 * 0.75)
+        self.assertEqual(counter.retry_after(), 8)
+        now[0] = 1025
+        self.assertEqual(counter.hit('key'), 1 + 1 * 0.5)
+
+    def test_client_ip_behind_proxies(self):
+        """Only X-Forwarded-For entries added by trusted proxies are believed"""
+        from django.test import RequestFactory
+        from .throttling import client_ip
+        request = RequestFactory().post('/', HTTP_X_FORWARDED_FOR='1.1.1.1, 2.2.2.2', REMOTE_ADDR='3.3.3.3')
+        self.assertEqual(client_ip(request), '3.3.3.3')
+        self.assertEqual(client_ip(request, proxy_count=1), '2.2.2.2')
+        self.assertEqual(client_ip(request, proxy_count=3), '3.3.3.3')
+
+    def test_cpu_stays_flat_under_attack(self):
+        """A burst of guesses hashes only up to the limit, and rejections are cheap"""
+        import time
+        from unittest import mock
+        from django.contrib.auth import authenticate
+        from django.test import override_settings
+
+        calls = []
+
+        def counting_authenticate(*args, **kwargs):
+            calls.append(1)
+            return authenticate(*args, **kwargs)
+
+        cpu = []
+        with mock.patch('accounts.views.auth.authenticate', counting_authenticate):
+            for i in range(40):
+                started = time.process_time()
+                self._login(f'victim{i % 3}')
+                cpu.append(time.process_time() - started)
+
+        self.assertEqual(len(calls), 4)
+        hashed, rejected = cpu[:4], cpu[4:]
+        self.assertLess(sum(rejected) / len(rejected), min(hashed) / 10)
+        self.assertEqual(self.stats.snapshot()['rejected'], 36)
+
+        with override_settings(METRICS_TOKEN='s3cret'):
+            response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer s3cret')
+        self.assertContains(response, 'frtuna_login_attempts_total{outcome="rejected"} 36')
@@ -0,0 +1,151 @@
+"""
+Login throttling.
+
+Every login POST used to reach ``auth.authenticate``, which runs the
+password hasher even for unknown usernames (to keep timing uniform), so a
+credential-stuffing burst was a CPU denial of service. ``LoginThrottle``
+counts attempts per client IP and failed attempts per username in sliding
+windows, and turns away attempts over either limit before anything is
+hashed. Turned-away attempts count against the IP only: counting them
+against the username too would let anyone keep an account locked out for
+good by guessing at it once a window.
+
+A window is approximated from two fixed buckets: the count of the current
+bucket plus the previous bucket's count weighted by how much of it still
+overlaps the window. That needs two cache reads, and one ``incr`` per hit.
+
+Counts live in the ``login-throttle`` cache (``LOGIN_THROTTLE_CACHE``).
+``locmem`` keeps them per worker, which bounds each worker's hashing but
+lets several workers together allow proportionally more attempts; ``file``
+or ``db`` share them between workers. Their ``incr`` is a read and a write,
+so concurrent attempts can undercount slightly.
+"""
+
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class SlidingWindowCounter:
+    """Approximate number of hits per key in the last ``window`` seconds."""
+
+    def __init__(self, cache, scope, window, clock=time.time):
+        self.cache = cache
+        self.scope = scope
+        self.window = window
+        self.clock = clock
+
+    def _key(self, ident, bucket):
+        digest = hashlib.md5(ident.encode(), usedforsecurity=False).hexdigest()
+        return f'accounts:throttle:{self.scope}:{digest}:{bucket}'
+
+    def _buckets(self, ident, now):
+        bucket = int(now // self.window)
+        overlap = 1 - (now % self.window) / self.window
+        return self._key(ident, bucket), self._key(ident, bucket - 1), overlap
+
+    def hit(self, ident):
+        """Record a hit and return the count including it."""
+        current, previous, overlap = self._buckets(ident, self.clock())
+        # Buckets are read for one more window after their own ends.
+        self.cache.add(current, 0, self.window * 2)
+        try:
+            count = self.cache.incr(current)
+        except ValueError:  # evicted between add() and incr()
+            self.cache.set(current, 1, self.window * 2)
+            count = 1
+        return count + self.cache.get(previous, 0) * overlap
+
+    def count(self, ident):
+        """The count without recording a hit."""
+        current, previous, overlap = self._buckets(ident, self.clock())
+        counts = self.cache.get_many([current, previous])
+        return counts.get(current, 0) + counts.get(previous, 0) * overlap
+
+    def retry_after(self):
+        """Seconds until the current bucket ends, a lower bound on the wait."""
+        now = self.clock()
+        return math.ceil(self.window - now % self.window)
+
+    def reset(self, ident):
+        current, previous, _ = self._buckets(ident, self.clock())
+        self.cache.delete_many([current, previous])
+
+
+class ThrottleStats:
+    """Thread-safe, per-process counts of login attempts by outcome."""
+
+    OUTCOMES = ('allowed', 'rejected', 'failed', 'succeeded')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self.OUTCOMES, 0)
+
+    def record(self, outcome):
+        with self._lock:
+            self._counts[outcome] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self):
+        with self._lock:
+            self._counts = dict.fromkeys(self.OUTCOMES, 0)
+
+
+stats = ThrottleStats()
+
+
+def client_ip(request, proxy_count=0):
+    """
+    The client address. Behind ``proxy_count`` trusted proxies it is that
+    many entries from the right of ``X-Forwarded-For``; entries further
+    left were written by the client and cannot be trusted.
+    """
+    if proxy_count:
+        forwarded = [part.strip() for part in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')]
+        if len(forwarded) >= proxy_count and forwarded[-proxy_count]:
+            return forwarded[-proxy_count]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+class LoginThrottle:
+    """Per-IP and per-username limits on login attempts, from ``LOGIN_THROTTLE``."""
+
+    def __init__(self, options=None, cache=None, clock=time.time):
+        options = options or settings.LOGIN_THROTTLE
+        cache = cache or caches['login-throttle']
+        self.ip_limit = options['IP_LIMIT']
+        self.username_limit = options['USERNAME_LIMIT']
+        self.proxy_count = options.get('PROXY_COUNT', 0)
+        self.by_ip = SlidingWindowCounter(cache, 'ip', options['WINDOW'], clock)
+        self.by_username = SlidingWindowCounter(cache, 'username', options['WINDOW'], clock)
+
+    def attempt(self, request, username):
+        """
+        Count a login attempt against the IP. Returns ``None`` if it may go
+        ahead, or the seconds to wait if the IP is over its limit or the
+        username has used up its failures. Rejected attempts count against
+        the IP too, so a steady attack from one address stays rejected.
+        """
+        ip_count = self.by_ip.hit(client_ip(request, self.proxy_count))
+        if ip_count > self.ip_limit or self.by_username.count(username.lower()) >= self.username_limit:
+            stats.record('rejected')
+            return self.by_ip.retry_after()
+        stats.record('allowed')
+        return None
+
+    def failed(self, username):
+        """Count a wrong password against ``username``."""
+        stats.record('failed')
+        self.by_username.hit(username.lower())
+
+    def succeeded(self, username):
+        """Forget earlier mistakes on this username; the IP's count stands."""
+        stats.record('succeeded')
+        self.by_username.reset(username.lower())
@@ -1,10 +1,14 @@
+from django.conf import settings
 from django.urls import path
 
 from . import views
 
+# See frtuna.urls: the async view only pays off under an ASGI server.
+register = views.aregister if settings.ASYNC_VIEWS else views.register
+
 urlpatterns = [
 
-    path('register', views.register, name= 'register'),
+    path('register', register, name= 'register'),
     path('login', views.login, name= 'login'),
     path('logout', views.logout, name= 'logout'),
-]
\ No newline at end of file
+]
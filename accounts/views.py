@@ -1,60 +1,139 @@
+from asgiref.sync import sync_to_async
 from django.shortcuts import render,redirect
 from django.contrib import messages
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User, auth
+from django.db import IntegrityError, transaction
+from django.db.models import Q, Value
+from django.db.models.functions import Lower
+
+from .models import USER_EMAIL_UNIQUE
+from .throttling import LoginThrottle
 
 
 def login(request):
     if request.method == 'POST':
-         username = request.POST['username']
-         password = request.POST['password']
+         username = request.POST.get('username', '')
+         password = request.POST.get('password', '')
+
+         # Before authenticate(): it hashes the password even for unknown users.
+         throttle = LoginThrottle()
+         retry_after = throttle.attempt(request, username)
+         if retry_after is not None:
+             messages.info(request, f'too many login attempts, try again in {retry_after} seconds')
+             response = render(request, 'login.html', status=429)
+             response['Retry-After'] = str(retry_after)
+             return response
 
          user = auth.authenticate(username=username, password=password)
-        
+
          if user is not None:
+             throttle.succeeded(username)
              auth.login(request,user)
              return redirect('/')
          else:
+             throttle.failed(username)
              messages.info(request,'invalid credentials')
              return redirect('login')
     else:
         return render(request, 'login.html')
-    
+
+
+def _registration(post):
+    """The new account's fields from the form, normalized as ``create_user`` would."""
+    return {
+        'first_name': post.get('first_name', ''),
+        'last_name': post.get('last_name', ''),
+        'username': User.normalize_username(post.get('username', '')),
+        'email': User.objects.normalize_email(post.get('email', '')),
+    }
+
+
+def _conflicts(username, email):
+    """
+    Usernames of at most two accounts holding ``username`` or ``email``,
+    in one query. Matches ``USER_EMAIL_UNIQUE`` exactly, so both sides of
+    the OR are index lookups.
+    """
+    return (
+        User.objects.alias(email_lower=Lower('email'))
+        .filter(Q(username=username) | Q(Q(email_lower=Lower(Value(email))), USER_EMAIL_UNIQUE.condition))
+        .values_list('username', flat=True)[:2]
+    )
+
+
+def _conflict_message(username, taken):
+    if username in taken:
+        return 'username taken'
+    return 'email taken' if taken else None
+
+
+def _create_user(fields, password_hash):
+    """
+    Insert the account, or return why it cannot be. The unique indexes are
+    the real check: a concurrent signup for the same name or email that
+    got past ``_conflicts`` fails here instead of creating a duplicate.
+    """
+    try:
+        with transaction.atomic():
+            User.objects.create(password=password_hash, **fields)
+    except IntegrityError:
+        taken = list(_conflicts(fields['username'], fields['email']))
+        return _conflict_message(fields['username'], taken) or 'username or email taken'
+    return None
+
+
 def register(request):
-    
+
     if request.method == 'POST':
-        
-        first_name = request.POST['first_name']
-        last_name = request.POST['last_name']
-        username = request.POST['username']
-        password = request.POST['password']
-        confirm_password = request.POST['confirm-password']
-        email = request.POST['email']
-
-        if password == confirm_password:
-            if User.objects.filter(username=username).exists():
-                messages.info(request,'username taken')
-                return redirect('register')
-            elif User.objects.filter(email=email).exists():
-                messages.info(request,'email taken')
-                return redirect('register')
-            else:
-
-                user = User.objects.create_user(username=username, password=password, email=email, first_name=first_name, last_name=last_name)  
-                user.save();
-                print('user created')
-                return redirect('login')
-               
-
-        else:
+        fields = _registration(request.POST)
+        password = request.POST.get('password', '')
+
+        if password != request.POST.get('confirm-password'):
             messages.info(request,"password is not matching.")
             return redirect('register')
-        return redirect('/')
+
+        # Check before hashing: a rejected signup should not cost a hash.
+        error = _conflict_message(fields['username'], list(_conflicts(fields['username'], fields['email'])))
+        if error is None:
+            error = _create_user(fields, make_password(password))
+        if error:
+            messages.info(request, error)
+            return redirect('register')
+        return redirect('login')
 
     else:
 
         return render(request, 'register.html')
 
 
+async def aregister(request):
+    """
+    Async ``register``. Password hashing takes a few hundred milliseconds
+    of CPU, so it runs on the default thread pool (hashlib releases the GIL
+    while it works) rather than on the event loop or the single thread that
+    async views share for database access.
+    """
+    if request.method != 'POST':
+        return render(request, 'register.html')
+
+    fields = _registration(request.POST)
+    password = request.POST.get('password', '')
+    if password != request.POST.get('confirm-password'):
+        messages.info(request,"password is not matching.")
+        return redirect('register')
+
+    taken = [username async for username in _conflicts(fields['username'], fields['email'])]
+    error = _conflict_message(fields['username'], taken)
+    if error is None:
+        password_hash = await sync_to_async(make_password, thread_sensitive=False)(password)
+        error = await sync_to_async(_create_user)(fields, password_hash)
+    if error:
+        messages.info(request, error)
+        return redirect('register')
+    return redirect('login')
+
+
 def logout(request):
     auth.logout(request)
     return redirect('/')
@@ -0,0 +1,7 @@
+"""
+Benchmarks for the Ethiopian Places site.
+
+Each module is runnable with ``python -m benchmarks.<name>``. Unless a
+``--database-url`` is given they run against a throwaway SQLite database,
+never the one in ``DATABASE_URL``.
+"""
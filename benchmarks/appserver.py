@@ -0,0 +1,76 @@
+"""
+Throughput of ``manage.py runserver`` versus the gunicorn configuration.
+
+    python -m benchmarks.appserver --threads 16 --requests 100
+    python -m benchmarks.appserver --servers gunicorn --path /api/destinations
+
+Each server is started against the same seeded database with
+``DEBUG=False`` and loaded over keep-alive HTTP connections from client
+threads. The client shares the machine with the server, so run it on an
+otherwise idle host and compare numbers from the same machine only.
+"""
+
+import argparse
+import json
+import sys
+
+from benchmarks.common import (
+    free_port, http_load, seed_destinations, setup_django, start_server,
+    stop_server, summarize,
+)
+
+
+SERVERS = {
+    'runserver': lambda port: [sys.executable, 'manage.py', 'runserver', '--noreload', f'127.0.0.1:{port}'],
+    'gunicorn': lambda port: [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+                              '--bind', f'127.0.0.1:{port}'],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--servers', nargs='+', choices=SERVERS, default=list(SERVERS))
+    parser.add_argument('--path', nargs='+', default=['/', '/api/destinations'])
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=100, help='Requests per thread.')
+    parser.add_argument('--database-url')
+    parser.add_argument('--json', help='Write results to this file.')
+    args = parser.parse_args()
+
+    setup_django(args.database_url)
+    seed_destinations(args.rows)
+    env = {'DEBUG': 'False', 'SECURE_SSL_REDIRECT': 'False'}
+
+    results = []
+    for server in args.servers:
+        port = free_port()
+        process = start_server(SERVERS[server](port), port, env)
+        try:
+            for path in args.path:
+                http_load(port, path, 2, 5)  # warm up
+                samples, elapsed, errors = http_load(port, path, args.threads, args.requests)
+                result = {
+                    'server': server,
+                    'path': path,
+                    'threads': args.threads,
+                    'throughput_rps': len(samples) / elapsed,
+                    'errors': errors,
+                    **summarize(samples),
+                }
+                results.append(result)
+                print(
+                    f'{server:>10} {path:<20} {result["throughput_rps"]:8.1f} req/s  '
+                    f'p50 {result["p50_ms"]:7.2f} ms  p95 {result["p95_ms"]:7.2f} ms  '
+                    f'p99 {result["p99_ms"]:7.2f} ms  {errors} errors'
+                )
+        finally:
+            stop_server(process)
+
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
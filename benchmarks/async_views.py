@@ -0,0 +1,116 @@
+"""
+Sync views on threaded WSGI versus async views on ASGI, under load.
+
+    python -m benchmarks.async_views --concurrency 64 --slow-clients 16
+    python -m benchmarks.async_views --path /api/destinations --threads 8
+
+Both modes run a single gunicorn worker, so the numbers show how many
+connections one worker can juggle: ``sync`` uses ``gthread`` with
+``--threads`` threads and the sync views, ``async`` uses uvicorn's worker
+with ``ASYNC_VIEWS=True`` (``pip install uvicorn`` first).
+
+``--slow-clients`` opens connections that trickle their request headers
+one byte at a time, like clients on a poor mobile link. A threaded worker
+ties up a thread per such connection; the event loop does not.
+"""
+
+import argparse
+import json
+import socket
+import sys
+import threading
+import time
+
+from benchmarks.common import (
+    free_port, http_load, seed_destinations, setup_django, start_server,
+    stop_server, summarize,
+)
+
+
+def server_env(mode, threads):
+    env = {
+        'DEBUG': 'False', 'SECURE_SSL_REDIRECT': 'False',
+        'WEB_CONCURRENCY': '1', 'GUNICORN_THREADS': str(threads),
+        # Slow clients must not be cut off by the worker timeout mid-run.
+        'GUNICORN_TIMEOUT': '120',
+    }
+    if mode == 'async':
+        env.update({'GUNICORN_WORKER_CLASS': 'uvicorn.workers.UvicornWorker', 'ASYNC_VIEWS': 'True'})
+    else:
+        env.update({'GUNICORN_WORKER_CLASS': 'gthread', 'ASYNC_VIEWS': 'False'})
+    return env
+
+
+def slow_clients(port, count, stop):
+    """Hold ``count`` connections open, sending one header byte per second."""
+
+    def trickle():
+        try:
+            with socket.create_connection(('127.0.0.1', port)) as sock:
+                sock.sendall(b'GET / HTTP/1.1\r\nHost: 127.0.0.1\r\n')
+                while not stop.wait(1):
+                    sock.sendall(b'X')
+        except OSError:
+            pass
+
+    clients = [threading.Thread(target=trickle, daemon=True) for _ in range(count)]
+    for client in clients:
+        client.start()
+    time.sleep(0.5)  # let them connect before the measured load starts
+    return clients
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--modes', nargs='+', choices=['sync', 'async'], default=['sync', 'async'])
+    parser.add_argument('--path', default='/')
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=64, help='Concurrent client connections.')
+    parser.add_argument('--requests', type=int, default=20, help='Requests per connection.')
+    parser.add_argument('--threads', type=int, default=4, help='gthread threads in sync mode.')
+    parser.add_argument('--slow-clients', type=int, default=0)
+    parser.add_argument('--database-url')
+    parser.add_argument('--json', help='Write results to this file.')
+    args = parser.parse_args()
+
+    setup_django(args.database_url)
+    seed_destinations(args.rows)
+    command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py']
+
+    results = []
+    for mode in args.modes:
+        port = free_port()
+        process = start_server(command + ['--bind', f'127.0.0.1:{port}'], port,
+                               server_env(mode, args.threads))
+        stop = threading.Event()
+        try:
+            http_load(port, args.path, 2, 5)  # warm up
+            slow_clients(port, args.slow_clients, stop)
+            samples, elapsed, errors = http_load(port, args.path, args.concurrency, args.requests)
+        finally:
+            stop.set()
+            stop_server(process)
+
+        result = {
+            'mode': mode,
+            'path': args.path,
+            'concurrency': args.concurrency,
+            'slow_clients': args.slow_clients,
+            'throughput_rps': len(samples) / elapsed,
+            'errors': errors,
+            **summarize(samples),
+        }
+        results.append(result)
+        print(
+            f'{mode:>6} {args.path:<20} {result["throughput_rps"]:8.1f} req/s  '
+            f'p50 {result["p50_ms"]:8.2f} ms  p95 {result["p95_ms"]:8.2f} ms  '
+            f'p99 {result["p99_ms"]:8.2f} ms  {errors} errors'
+        )
+
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
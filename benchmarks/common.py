@@ -0,0 +1,287 @@
+"""Shared setup, data seeding and statistics for the benchmark scripts."""
+
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django(database_url=None):
+    """
+    Configure Django for a benchmark run and migrate the database.
+
+    Without ``database_url`` a temporary SQLite file is used so that
+    seeding never touches a real database.
+    """
+    if str(BASE_DIR) not in sys.path:
+        sys.path.insert(0, str(BASE_DIR))
+    if database_url is None:
+        database_url = 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='bench-'), 'bench.sqlite3')
+    os.environ['DATABASE_URL'] = database_url
+    os.environ.setdefault('SECRET_KEY', 'benchmark-only-secret-key')
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ethiopian_places.settings')
+    # Benchmarks do not run collectstatic, which DEBUG=False servers would need.
+    os.environ.setdefault('STATIC_STORAGE', 'plain')
+
+    import django
+    from django.core.management import call_command
+
+    django.setup()
+    call_command('migrate', verbosity=0, interactive=False)
+    return database_url
+
+
+def vocabulary():
+    """Words drawn from the real destination descriptions."""
+    with open(BASE_DIR / 'destinations.json', encoding='utf-8') as handle:
+        fixture = json.load(handle)
+    words = set()
+    for entry in fixture:
+        for word in entry['fields']['desc'].split():
+            word = word.strip('.,;:"\'()').lower()
+            if word.isalpha() and len(word) > 3:
+                words.add(word)
+    return sorted(words)
+
+
+def seed_destinations(count, seed=42, batch_size=5000):
+    """Replace all destinations with ``count`` synthetic rows."""
+    from frtuna.cache import bump_catalog_version
+    from frtuna.models import Destinations
+
+    rng = random.Random(seed)
+    words = vocabulary()
+    Destinations.objects.all().delete()
+    for start in range(0, count, batch_size):
+        Destinations.objects.bulk_create([
+            Destinations(
+                name=f'{rng.choice(words).title()} {i}',
+                slug=f'destination-{i}',
+                desc=' '.join(rng.choices(words, k=30)),
+                price=rng.randrange(100, 5000),
+                offer=rng.random() < 0.3,
+                img='pics/placeholder.jpg',
+            )
+            for i in range(start, min(start + batch_size, count))
+        ])
+    bump_catalog_version()
+    return words
+
+
+def summarize(samples):
+    """Latency statistics, in milliseconds, for a list of durations in seconds."""
+    ordered = sorted(samples)
+
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))] * 1000
+
+    return {
+        'count': len(ordered),
+        'mean_ms': statistics.fmean(ordered) * 1000,
+        'p50_ms': percentile(50),
+        'p95_ms': percentile(95),
+        'p99_ms': percentile(99),
+    }
+
+
+def timed(func, *args, **kwargs):
+    """Return ``(result, seconds)`` for one call."""
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def wsgi_get(app, path, query_string='', headers=None):
+    """
+    Send one GET straight to the WSGI ``app`` and return ``(status, body)``.
+
+    Unlike the test client this goes through the real request_started /
+    request_finished cycle, so connection handling (``CONN_MAX_AGE``,
+    health checks) behaves as it does under a WSGI server.
+    """
+    environ = {'PATH_INFO': path, 'QUERY_STRING': query_string, 'REQUEST_METHOD': 'GET'}
+    environ.update(headers or {})
+    return _wsgi_call(app, environ)
+
+
+def wsgi_post(app, path, body, headers=None):
+    """Like ``wsgi_get``, but POST the form-encoded ``body``."""
+    from io import BytesIO
+
+    environ = {
+        'PATH_INFO': path, 'QUERY_STRING': '', 'REQUEST_METHOD': 'POST',
+        'CONTENT_TYPE': 'application/x-www-form-urlencoded', 'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': BytesIO(body),
+    }
+    environ.update(headers or {})
+    return _wsgi_call(app, environ)
+
+
+def _wsgi_call(app, environ):
+    from wsgiref.util import setup_testing_defaults
+
+    setup_testing_defaults(environ)
+    status = []
+
+    def start_response(value, response_headers, exc_info=None):
+        status.append(value)
+
+    result = app(environ, start_response)
+    try:
+        body = b''.join(result)
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return int(status[0].split()[0]), body
+
+
+async def asgi_get(app, path, query_string=''):
+    """Send one GET straight to the ASGI ``app`` and return ``(status, body)``."""
+    return await _asgi_call(app, 'GET', path, query_string)
+
+
+async def asgi_post(app, path, body, headers=()):
+    """Like ``asgi_get``, but POST the form-encoded ``body`` with extra ``(name, value)`` byte ``headers``."""
+    headers = [(b'content-type', b'application/x-www-form-urlencoded'), *headers]
+    return await _asgi_call(app, 'POST', path, body=body, headers=headers)
+
+
+async def _asgi_call(app, method, path, query_string='', body=b'', headers=()):
+    import asyncio
+
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query_string.encode(),
+        'root_path': '',
+        'headers': [(b'host', b'127.0.0.1'), *headers],
+        'client': ('127.0.0.1', 50000),
+        'server': ('127.0.0.1', 80),
+    }
+    requested = False
+    status = []
+    chunks = []
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+        # The client never disconnects; Django cancels this once it responds.
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+        elif message['type'] == 'http.response.body':
+            chunks.append(message.get('body', b''))
+
+    await app(scope, receive, send)
+    return status[0], b''.join(chunks)
+
+
+def free_port():
+    """Return a TCP port that is currently free on localhost."""
+    import socket
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(command, port, env=None, timeout=30):
+    """
+    Start ``command`` from the project root and wait until it accepts HTTP
+    on ``port``. Returns the ``subprocess.Popen``; stop it with ``stop_server``.
+    """
+    import http.client
+    import subprocess
+
+    process = subprocess.Popen(
+        command, cwd=BASE_DIR, env={**os.environ, **(env or {})},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'{command[0]} exited with status {process.returncode}')
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('HEAD', '/')
+            connection.getresponse().read()
+            connection.close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    stop_server(process)
+    raise RuntimeError(f'{command[0]} did not start listening on port {port}')
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except Exception:
+        process.kill()
+        process.wait()
+
+
+def http_load(port, path, threads, requests, headers=None, request=None):
+    """
+    GET ``path`` ``requests`` times from each of ``threads`` threads, each
+    over its own keep-alive connection. Returns ``(samples, seconds, errors)``.
+
+    ``request()``, if given, returns ``(method, path, body, headers)`` for
+    each request instead.
+    """
+    import http.client
+    import threading
+
+    samples = []
+    errors = []
+    lock = threading.Lock()
+
+    def worker():
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        local = []
+        failed = 0
+        for _ in range(requests):
+            started = time.perf_counter()
+            try:
+                if request:
+                    connection.request(*request())
+                else:
+                    connection.request('GET', path, headers=headers or {})
+                response = connection.getresponse()
+                response.read()
+                if response.status >= 400:
+                    failed += 1
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            local.append(time.perf_counter() - started)
+        connection.close()
+        with lock:
+            samples.extend(local)
+            errors.append(failed)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return samples, time.perf_counter() - started, sum(errors)
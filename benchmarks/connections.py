@@ -0,0 +1,126 @@
+"""
+Request latency with per-request versus persistent database connections.
+
+    python -m benchmarks.connections --threads 8 --requests 200
+    python -m benchmarks.connections --database-url postgres://localhost/bench
+
+Requests go through the real WSGI handler from several threads, once with
+``CONN_MAX_AGE=0`` (a new connection per request, Django's default) and
+once with persistent, health-checked connections. Opening an SQLite file
+costs almost nothing, so against SQLite ``--connect-latency`` adds a fixed
+delay to every new connection to stand in for a PostgreSQL handshake.
+"""
+
+import argparse
+import json
+import threading
+import time
+
+from benchmarks.common import seed_destinations, setup_django, summarize, wsgi_get
+
+
+MODES = {
+    'per-request': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False},
+    'persistent': {'CONN_MAX_AGE': 60, 'CONN_HEALTH_CHECKS': True},
+}
+
+
+def count_connections(connect_latency):
+    """Count (and optionally slow down) every new database connection."""
+    from django.db import connections
+
+    wrapper = type(connections['default'])
+    original = wrapper.get_new_connection
+    counter = {'opened': 0}
+    lock = threading.Lock()
+
+    def get_new_connection(self, conn_params):
+        if connect_latency:
+            time.sleep(connect_latency)
+        with lock:
+            counter['opened'] += 1
+        return original(self, conn_params)
+
+    wrapper.get_new_connection = get_new_connection
+    return counter
+
+
+def run(app, path, threads, requests):
+    """Send ``requests`` GETs from each of ``threads`` threads."""
+    from django.db import connections
+
+    samples = []
+    lock = threading.Lock()
+
+    def worker():
+        local = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            status, _ = wsgi_get(app, path)
+            local.append(time.perf_counter() - started)
+            assert status == 200, status
+        connections.close_all()
+        with lock:
+            samples.extend(local)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return samples, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200, help='Requests per thread.')
+    parser.add_argument('--path', default='/api/destinations')
+    parser.add_argument('--connect-latency', type=float, default=0.0,
+                        help='Extra seconds per new connection (SQLite stand-in).')
+    parser.add_argument('--database-url')
+    parser.add_argument('--json', help='Write results to this file.')
+    args = parser.parse_args()
+
+    setup_django(args.database_url)
+    from django.core.wsgi import get_wsgi_application
+    from django.db import connection, connections
+
+    seed_destinations(args.rows)
+    connections.close_all()
+    app = get_wsgi_application()
+    counter = count_connections(args.connect_latency)
+
+    results = []
+    for mode, options in MODES.items():
+        connections.settings['default'].update(options)
+        wsgi_get(app, args.path)  # warm up imports and the template/URL caches
+        connections.close_all()
+        counter['opened'] = 0
+
+        samples, elapsed = run(app, args.path, args.threads, args.requests)
+        result = {
+            'backend': connection.vendor,
+            'mode': mode,
+            'threads': args.threads,
+            'connect_latency_ms': args.connect_latency * 1000,
+            'throughput_rps': len(samples) / elapsed,
+            'connections_opened': counter['opened'],
+            **summarize(samples),
+        }
+        results.append(result)
+        print(
+            f'{mode:>12}  {result["throughput_rps"]:8.1f} req/s  '
+            f'p50 {result["p50_ms"]:7.2f} ms  p95 {result["p95_ms"]:7.2f} ms  '
+            f'p99 {result["p99_ms"]:7.2f} ms  {result["connections_opened"]} connections'
+        )
+
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
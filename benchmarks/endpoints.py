@@ -0,0 +1,295 @@
+"""
+Throughput, latency and query counts of the main pages.
+
+    python -m benchmarks.endpoints --rows 1000 10000 100000 --json bench.json
+    python -m benchmarks.endpoints --via server --server runserver
+    python -m benchmarks.endpoints --compare bench.json
+
+For each catalog size the endpoints are loaded concurrently through the
+WSGI handler and the ASGI handler in this process, and over HTTP against
+a local gunicorn (or runserver) started on the same database. Query
+counts are measured in-process for the first request after the catalog
+changes (``cold``) and for a repeat request (``warm``).
+
+The ``POST`` endpoints submit the login and registration forms: a right
+and a wrong password for a seeded account, a new signup, and one whose
+username is taken. Only the successful ones and the wrong password are
+hashed, so they run ``--post-requests`` per thread. The login throttle's
+limits are lifted unless ``--throttle`` is given, which measures the
+rejected attempts instead.
+
+``--json`` saves the results with the current git commit; ``--compare``
+prints the change relative to such a file, so a regression shows up as a
+drop in throughput or a jump in latency or queries for the same row.
+"""
+
+import argparse
+import asyncio
+import datetime
+import itertools
+import json
+import os
+import subprocess
+import threading
+import time
+from urllib.parse import urlencode
+
+from benchmarks.appserver import SERVERS
+from benchmarks.common import (
+    BASE_DIR, asgi_get, asgi_post, free_port, http_load, seed_destinations, setup_django,
+    start_server, stop_server, summarize, wsgi_get, wsgi_post,
+)
+
+
+USERNAME = 'bench'
+PASSWORD = 'correct horse battery staple'
+# An unmasked secret is a valid token too, so no page has to be fetched first.
+CSRF_SECRET = 'benchmarkcsrfsecret0123456789abc'
+CSRF_COOKIE = f'csrftoken={CSRF_SECRET}'
+_signups = itertools.count()
+
+
+def _signup(username):
+    return {
+        'first_name': 'Bench', 'last_name': 'Mark', 'username': username, 'email': f'{username}@example.com',
+        'password': PASSWORD, 'confirm-password': PASSWORD,
+    }
+
+
+# endpoint -> (path, form of its next request)
+POSTS = {
+    'POST /accounts/login': ('/accounts/login', lambda: {'username': USERNAME, 'password': PASSWORD}),
+    'POST /accounts/login wrong': ('/accounts/login', lambda: {'username': USERNAME, 'password': 'wrong'}),
+    'POST /accounts/register': ('/accounts/register', lambda: _signup(f'signup{next(_signups)}')),
+    'POST /accounts/register taken': ('/accounts/register', lambda: _signup(USERNAME)),
+}
+ENDPOINTS = ['/', '/accounts/login', '/accounts/register', *POSTS]
+VIAS = ['wsgi', 'asgi', 'server']
+
+
+def seed_user():
+    """Create the account the login scenarios use, with a freshly hashed password."""
+    from django.contrib.auth.models import User
+
+    user, _ = User.objects.get_or_create(username=USERNAME, defaults={'email': f'{USERNAME}@example.com'})
+    user.set_password(PASSWORD)
+    user.save()
+
+
+def post_body(endpoint):
+    """``(path, body)`` of the next request to a ``POSTS`` endpoint."""
+    path, form = POSTS[endpoint]
+    return path, urlencode({**form(), 'csrfmiddlewaretoken': CSRF_SECRET}).encode()
+
+
+def wsgi_send(app, endpoint):
+    if endpoint in POSTS:
+        return wsgi_post(app, *post_body(endpoint), headers={'HTTP_COOKIE': CSRF_COOKIE})
+    return wsgi_get(app, endpoint)
+
+
+async def asgi_send(app, endpoint):
+    if endpoint in POSTS:
+        return await asgi_post(app, *post_body(endpoint), headers=[(b'cookie', CSRF_COOKIE.encode())])
+    return await asgi_get(app, endpoint)
+
+
+def http_request(endpoint):
+    """A ``request`` function for ``http_load``, or ``None`` for a plain GET."""
+    if endpoint not in POSTS:
+        return None
+
+    def request():
+        path, body = post_body(endpoint)
+        return 'POST', path, body, {
+            'Content-Type': 'application/x-www-form-urlencoded', 'Cookie': CSRF_COOKIE,
+        }
+
+    return request
+
+
+def wsgi_load(app, path, threads, requests):
+    """Load ``path`` from ``threads`` threads calling the WSGI app directly."""
+    from django.db import connections
+
+    samples = []
+    errors = []
+    lock = threading.Lock()
+
+    def worker():
+        local = []
+        failed = 0
+        for _ in range(requests):
+            started = time.perf_counter()
+            status, _ = wsgi_send(app, path)
+            local.append(time.perf_counter() - started)
+            failed += status >= 400
+        connections.close_all()
+        with lock:
+            samples.extend(local)
+            errors.append(failed)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return samples, time.perf_counter() - started, sum(errors)
+
+
+def asgi_load(app, path, threads, requests):
+    """Load ``path`` with ``threads`` concurrent tasks on one event loop."""
+
+    async def client():
+        local = []
+        failed = 0
+        for _ in range(requests):
+            started = time.perf_counter()
+            status, _ = await asgi_send(app, path)
+            local.append(time.perf_counter() - started)
+            failed += status >= 400
+        return local, failed
+
+    async def run():
+        started = time.perf_counter()
+        done = await asyncio.gather(*(client() for _ in range(threads)))
+        return done, time.perf_counter() - started
+
+    done, elapsed = asyncio.run(run())
+    return [s for local, _ in done for s in local], elapsed, sum(failed for _, failed in done)
+
+
+def count_queries(app, path):
+    """Queries run by a request right after a catalog change, then by a repeat."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from frtuna.cache import bump_catalog_version
+
+    bump_catalog_version()
+    counts = []
+    for _ in range(2):
+        with CaptureQueriesContext(connection) as queries:
+            wsgi_send(app, path)
+        counts.append(len(queries))
+    return {'queries_cold': counts[0], 'queries_warm': counts[1]}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, path):
+    """Print each result's change relative to the same row in a saved file."""
+    with open(path) as handle:
+        saved = json.load(handle)
+    baseline = {(r['rows'], r['via'], r['endpoint']): r for r in saved['results']}
+    print(f'\nCompared with {saved.get("commit") or path}:')
+    for result in results:
+        before = baseline.get((result['rows'], result['via'], result['endpoint']))
+        if before is None:
+            continue
+        change = {
+            key: (result[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+            for key in ('throughput_rps', 'p50_ms', 'p99_ms')
+        }
+        print(
+            f'{result["rows"]:>8} {result["via"]:>6} {result["endpoint"]:<30} '
+            f'throughput {change["throughput_rps"]:+6.1f}%  p50 {change["p50_ms"]:+6.1f}%  '
+            f'p99 {change["p99_ms"]:+6.1f}%  queries {before["queries_warm"]} -> {result["queries_warm"]}'
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--endpoints', nargs='+', default=ENDPOINTS)
+    parser.add_argument('--via', nargs='+', choices=VIAS, default=VIAS)
+    parser.add_argument('--server', choices=SERVERS, default='gunicorn')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=100, help='Requests per thread.')
+    parser.add_argument('--post-requests', type=int, default=10,
+                        help='Requests per thread to the POST endpoints, most of which hash a password.')
+    parser.add_argument('--throttle', action='store_true',
+                        help='Keep the configured login throttle limits.')
+    parser.add_argument('--database-url')
+    parser.add_argument('--json', help='Write results to this file.')
+    parser.add_argument('--compare', help='Compare with results saved by --json.')
+    args = parser.parse_args()
+
+    if not args.throttle:
+        # Inherited by the server processes too.
+        os.environ['LOGIN_THROTTLE_IP_LIMIT'] = os.environ['LOGIN_THROTTLE_USERNAME_LIMIT'] = str(10**9)
+    setup_django(args.database_url)
+    seed_user()
+    from django.core.asgi import get_asgi_application
+    from django.core.wsgi import get_wsgi_application
+
+    wsgi_app = get_wsgi_application()
+    asgi_app = get_asgi_application()
+
+    results = []
+    for rows in args.rows:
+        seed_destinations(rows)
+        queries = {path: count_queries(wsgi_app, path) for path in args.endpoints}
+
+        for via in args.via:
+            process = None
+            if via == 'server':
+                port = free_port()
+                process = start_server(SERVERS[args.server](port), port,
+                                       {'DEBUG': 'False', 'SECURE_SSL_REDIRECT': 'False'})
+            try:
+                for path in args.endpoints:
+                    requests = args.post_requests if path in POSTS else args.requests
+                    if via == 'wsgi':
+                        wsgi_load(wsgi_app, path, 1, 3)  # warm up
+                        samples, elapsed, errors = wsgi_load(wsgi_app, path, args.threads, requests)
+                    elif via == 'asgi':
+                        asgi_load(asgi_app, path, 1, 3)
+                        samples, elapsed, errors = asgi_load(asgi_app, path, args.threads, requests)
+                    else:
+                        request = http_request(path)
+                        http_load(port, path, 1, 3, request=request)
+                        samples, elapsed, errors = http_load(port, path, args.threads, requests, request=request)
+
+                    result = {
+                        'rows': rows,
+                        'via': args.server if via == 'server' else via,
+                        'endpoint': path,
+                        'threads': args.threads,
+                        'throughput_rps': len(samples) / elapsed,
+                        'errors': errors,
+                        **summarize(samples),
+                        **queries[path],
+                    }
+                    results.append(result)
+                    print(
+                        f'{rows:>8} {result["via"]:>9} {path:<30} {result["throughput_rps"]:8.1f} req/s  '
+                        f'p50 {result["p50_ms"]:7.2f} ms  p95 {result["p95_ms"]:7.2f} ms  '
+                        f'p99 {result["p99_ms"]:7.2f} ms  queries {result["queries_cold"]}/'
+                        f'{result["queries_warm"]}  {errors} errors'
+                    )
+            finally:
+                if process is not None:
+                    stop_server(process)
+
+    if args.compare:
+        compare(results, args.compare)
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump({
+                'commit': git_commit(),
+                'created': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                'results': results,
+            }, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+k-nearest destination latency: the k-d tree against a brute-force scan.
+
+    python -m benchmarks.nearby --points 100000 --queries 500
+    python -m benchmarks.nearby --rows 20000 --requests 300
+
+``--points`` random locations (uniform over Ethiopia's bounding box, where
+the catalog's destinations are, so leaves are dense) are indexed with
+``frtuna.geo.NearbyIndex``. Each k is queried ``--queries`` times, half
+from inside the box and half from anywhere on Earth, and compared with a
+NumPy scan of every point. Build time and the cost of one incremental
+move are reported too.
+
+``--rows`` destinations are then seeded with coordinates and
+``/destinations/near`` is timed through the WSGI handler, including the
+row lookup and JSON rendering.
+"""
+
+import argparse
+import json
+
+import numpy as np
+
+from benchmarks.common import seed_destinations, setup_django, summarize, timed, wsgi_get
+
+
+BOX = {'lat': (3.4, 14.9), 'lon': (33.0, 48.0)}
+
+
+def random_points(rng, count):
+    return rng.uniform(*BOX['lat'], count), rng.uniform(*BOX['lon'], count)
+
+
+def query_points(rng, count):
+    lat, lon = random_points(rng, count - count // 2)
+    anywhere_lat = np.degrees(np.arcsin(rng.uniform(-1, 1, count // 2)))
+    anywhere_lon = rng.uniform(-180, 180, count // 2)
+    return list(zip(np.concatenate([lat, anywhere_lat]), np.concatenate([lon, anywhere_lon])))
+
+
+def brute_force(points, ids, lat, lon, k):
+    from frtuna.geo import to_unit_vectors
+
+    gaps = points - to_unit_vectors([lat], [lon])[0]
+    distances = (gaps * gaps).sum(axis=1)
+    nearest = np.argpartition(distances, k - 1)[:k] if k < len(distances) else np.arange(len(distances))
+    return ids[nearest[np.lexsort((ids[nearest], distances[nearest]))]]
+
+
+def bench_index(count, queries, ks, seed=42):
+    from frtuna.geo import NearbyIndex, to_unit_vectors
+
+    rng = np.random.default_rng(seed)
+    ids = np.arange(1, count + 1)
+    lat, lon = random_points(rng, count)
+    index, build_seconds = timed(NearbyIndex, ids, lat, lon)
+    points = to_unit_vectors(lat, lon)
+    print(f'build {count} points in {build_seconds * 1000:.1f} ms')
+    results = {'points': count, 'build_ms': build_seconds * 1000, 'queries': []}
+
+    for k in ks:
+        for method in ('kd-tree', 'brute force'):
+            samples, mismatches = [], 0
+            for point in query_points(rng, queries):
+                if method == 'kd-tree':
+                    found, seconds = timed(index.query, *point, k)
+                    mismatches += [pk for pk, _ in found] != brute_force(points, ids, *point, k).tolist()
+                else:
+                    _, seconds = timed(brute_force, points, ids, *point, k)
+                samples.append(seconds)
+            result = {'k': k, 'method': method, 'mismatches': mismatches, **summarize(samples)}
+            results['queries'].append(result)
+            print(f'k={k:<3} {method:>11}  p50 {result["p50_ms"]:7.3f} ms  p95 {result["p95_ms"]:7.3f} ms'
+                  + (f'  {mismatches} mismatches' if method == 'kd-tree' else ''))
+
+    moves = rng.integers(1, count + 1, queries)
+    new_lat, new_lon = random_points(rng, queries)
+    samples = [timed(index.upsert, int(pk), float(a), float(b))[1] for pk, a, b in zip(moves, new_lat, new_lon)]
+    results['upsert'] = summarize(samples)
+    print(f'upsert            p50 {results["upsert"]["p50_ms"]:7.3f} ms  '
+          f'p95 {results["upsert"]["p95_ms"]:7.3f} ms  (the tree is rebuilt after {index.rebuild_threshold:.0f} changes)')
+    return results
+
+
+def seed_coordinates(rows, seed=42, batch_size=2000):
+    from frtuna.models import Destinations
+
+    rng = np.random.default_rng(seed)
+    dests = list(Destinations.objects.only('id').order_by('id')[:rows])
+    lat, lon = random_points(rng, len(dests))
+    for dest, a, b in zip(dests, lat.tolist(), lon.tolist()):
+        dest.latitude, dest.longitude = a, b
+    Destinations.objects.bulk_update(dests, ['latitude', 'longitude'], batch_size=batch_size)
+
+
+def bench_endpoint(rows, requests, ks, seed=42):
+    from django.core.handlers.wsgi import WSGIHandler
+    from frtuna import geo
+
+    seed_destinations(rows)
+    seed_coordinates(rows)
+    geo.reset()
+    app = WSGIHandler()
+    rng = np.random.default_rng(seed)
+    results = []
+    _, first = timed(wsgi_get, app, '/destinations/near', 'lat=9&lon=38.7')
+    print(f'first request (loads the index of {rows} rows) {first * 1000:.1f} ms')
+    for k in ks:
+        samples = []
+        for lat, lon in query_points(rng, requests):
+            (status, _), seconds = timed(wsgi_get, app, '/destinations/near', f'lat={lat}&lon={lon}&k={k}')
+            if status != 200:
+                raise RuntimeError(f'/destinations/near answered {status}')
+            samples.append(seconds)
+        result = {'rows': rows, 'k': k, **summarize(samples)}
+        results.append(result)
+        print(f'/destinations/near k={k:<3} p50 {result["p50_ms"]:7.3f} ms  p95 {result["p95_ms"]:7.3f} ms')
+    return {'first_request_ms': first * 1000, 'requests': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--points', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=300)
+    parser.add_argument('--k', type=int, nargs='+', default=[1, 10, 48])
+    parser.add_argument('--rows', type=int, default=10000, help='Destinations to seed; 0 skips the endpoint.')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--database-url')
+    parser.add_argument('--json', help='Write results to this file.')
+    args = parser.parse_args()
+
+    setup_django(args.database_url)
+    results = {'index': bench_index(args.points, args.queries, args.k)}
+    if args.rows:
+        results['endpoint'] = bench_endpoint(args.rows, args.requests, args.k)
+
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Destination grid render time as the number of cards per page grows.
+
+    python -m benchmarks.render --page-sizes 12 24 48 --url-latency 0.0002
+
+Every card gets a distinct image with six cached renditions, so a card
+needs seven storage URLs. ``--url-latency`` adds a delay to each
+``storage.url()`` call to stand in for a slow backend such as Cloudinary's
+SDK. Each page size is rendered with a cold URL cache (every URL built)
+and a warm one (the steady state of a running worker).
+"""
+
+import argparse
+import json
+import time
+
+from benchmarks.common import seed_destinations, setup_django, summarize
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--page-sizes', type=int, nargs='+', default=[12, 24, 48])
+    parser.add_argument('--renders', type=int, default=50)
+    parser.add_argument('--url-latency', type=float, default=0.0002,
+                        help='Seconds added to every storage.url() call.')
+    parser.add_argument('--json', help='Write results to this file.')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.cache import cache
+    from django.core.files.storage import storages
+    from django.db.models import CharField, Value
+    from django.db.models.functions import Cast, Concat
+    from django.template.loader import render_to_string
+    from frtuna.models import Destinations
+    from frtuna.pagination import MAX_PAGE_SIZE, paginate
+    from frtuna.storage_urls import url_cache
+    from frtuna.thumbnails import FORMATS, WIDTHS, _cache_key, prefetch_images
+
+    seed_destinations(max(args.page_sizes))
+    Destinations.objects.update(img=Concat(Value('pics/bench_'), Cast('id', CharField()), Value('.jpg')))
+    field_storage = Destinations._meta.get_field('img').storage
+    for pk in Destinations.objects.values_list('id', flat=True):
+        cache.set(_cache_key(field_storage, f'pics/bench_{pk}.jpg'), {
+            'width': 1200,
+            **{fmt: [(w, f'thumbs/bench_{pk}_{w}.{ext}') for w in WIDTHS] for fmt, (_, ext, _, _) in FORMATS.items()},
+        }, None)
+
+    storage = storages['default']
+    original_url = storage.url
+    counter = {'calls': 0}
+
+    def slow_url(name):
+        counter['calls'] += 1
+        time.sleep(args.url_latency)
+        return original_url(name)
+
+    storage.url = slow_url
+
+    results = []
+    for page_size in sorted(args.page_sizes):
+        if page_size > MAX_PAGE_SIZE:
+            parser.error(f'page sizes above {MAX_PAGE_SIZE} are clamped by the site')
+        for state in ('cold', 'warm'):
+            samples = []
+            counter['calls'] = 0
+            for _ in range(args.renders):
+                if state == 'cold':
+                    url_cache.clear()
+                started = time.perf_counter()
+                page = paginate(Destinations.objects.defer('search_vector'), page_size=page_size)
+                prefetch_images(dest.img for dest in page.items)
+                render_to_string('destinations_grid.html', {'dests': page.items, 'page': page})
+                samples.append(time.perf_counter() - started)
+
+            result = {
+                'cards': page_size,
+                'url_cache': state,
+                'url_calls_per_render': counter['calls'] / args.renders,
+                **summarize(samples),
+            }
+            results.append(result)
+            print(
+                f'{page_size:>3} cards  {state:>4} URL cache  p50 {result["p50_ms"]:7.2f} ms  '
+                f'p99 {result["p99_ms"]:7.2f} ms  '
+                f'{result["p50_ms"] / page_size:6.3f} ms/card  '
+                f'{result["url_calls_per_render"]:.0f} url() calls'
+            )
+
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
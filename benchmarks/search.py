@@ -0,0 +1,70 @@
+"""
+Search latency at different catalog sizes.
+
+    python -m benchmarks.search --rows 10000 100000
+    python -m benchmarks.search --database-url postgres://localhost/bench
+
+On SQLite this measures the in-process inverted index (including the
+one-off build after the catalog changes); on PostgreSQL it measures the
+trigger-maintained ``search_vector`` column and its GIN index.
+"""
+
+import argparse
+import json
+import random
+
+from benchmarks.common import seed_destinations, setup_django, summarize, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--database-url')
+    parser.add_argument('--json', help='Write results to this file.')
+    args = parser.parse_args()
+
+    setup_django(args.database_url)
+    from django.db import connection
+    from frtuna.search import index, search_destinations
+
+    results = []
+    for rows in args.rows:
+        words = seed_destinations(rows)
+        rng = random.Random(rows)
+        queries = [
+            rng.choice([
+                rng.choice(words),
+                rng.choice(words)[:4],
+                f'{rng.choice(words)} {rng.choice(words)[:3]}',
+            ])
+            for _ in range(args.queries)
+        ]
+
+        build = None
+        if connection.vendor != 'postgresql':
+            _, build = timed(index.ensure_current)
+
+        samples = []
+        for query in queries:
+            _, elapsed = timed(search_destinations, query)
+            samples.append(elapsed)
+
+        result = {'backend': connection.vendor, 'rows': rows, **summarize(samples)}
+        if build is not None:
+            result['index_build_ms'] = build * 1000
+        results.append(result)
+        print(
+            f'{connection.vendor:>10} {rows:>8} rows  '
+            f'p50 {result["p50_ms"]:7.2f} ms  p95 {result["p95_ms"]:7.2f} ms  '
+            f'p99 {result["p99_ms"]:7.2f} ms'
+            + (f'  (index build {result["index_build_ms"]:.0f} ms)' if build is not None else '')
+        )
+
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Database queries and latency per request for anonymous and signed-in visitors.
+
+    python -m benchmarks.sessions --requests 500
+    python -m benchmarks.sessions --path /destinations/destination-1/
+
+Requests go straight to the WSGI handler, once with ``AUTH_CACHE`` off
+(database sessions, a ``User`` query per request) and once with it on
+(``cached_db`` sessions and the cached user from ``accounts.backends``).
+The first request of each visitor warms the caches and is not counted.
+"""
+
+import argparse
+import json
+
+from benchmarks.common import seed_destinations, setup_django, summarize, timed, wsgi_get
+
+
+def signed_in_cookie():
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.test import Client
+
+    user = User.objects.filter(username='bench').first()
+    if user is None:
+        user = User.objects.create_user(username='bench', first_name='Bench', password='bench-password')
+    client = Client()
+    client.force_login(user)
+    return f'{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}'
+
+
+def measure(path, cookie, count):
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connection
+
+    app = WSGIHandler()
+    headers = {'HTTP_COOKIE': cookie} if cookie else {}
+    queries = []
+
+    def count_queries(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    wsgi_get(app, path, headers=headers)  # warm up
+    samples = []
+    with connection.execute_wrapper(count_queries):
+        for _ in range(count):
+            (status, _), seconds = timed(wsgi_get, app, path, headers=headers)
+            if status != 200:
+                raise RuntimeError(f'{path} answered {status}')
+            samples.append(seconds)
+    sessions = sum('django_session' in sql for sql in queries)
+    return {'queries_per_request': len(queries) / count, 'session_queries_per_request': sessions / count,
+            **summarize(samples)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--path', default='/')
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--database-url')
+    parser.add_argument('--json', help='Write results to this file.')
+    args = parser.parse_args()
+
+    setup_django(args.database_url)
+    from django.core.cache import cache
+    from django.test import override_settings
+
+    seed_destinations(args.rows)
+    results = []
+    for auth_cache in (False, True):
+        engine = 'cached_db' if auth_cache else 'db'
+        with override_settings(AUTH_CACHE=auth_cache, SESSION_ENGINE=f'django.contrib.sessions.backends.{engine}'):
+            cache.clear()
+            for visitor, cookie in (('anonymous', None), ('signed-in', signed_in_cookie())):
+                result = {'auth_cache': auth_cache, 'visitor': visitor, 'path': args.path,
+                          **measure(args.path, cookie, args.requests)}
+                results.append(result)
+                print(
+                    f'AUTH_CACHE={str(auth_cache):<5} {visitor:>9} {args.path:<20} '
+                    f'{result["queries_per_request"]:5.2f} queries/req '
+                    f'({result["session_queries_per_request"]:.2f} session)  '
+                    f'p50 {result["p50_ms"]:7.2f} ms  p95 {result["p95_ms"]:7.2f} ms'
+                )
+
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
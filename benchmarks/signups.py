@@ -0,0 +1,160 @@
+"""
+Signups per second through the registration views.
+
+    python -m benchmarks.signups --signups 200 --concurrency 8
+    python -m benchmarks.signups --users 100000 --duplicates 0.5
+
+``--users`` existing accounts are seeded first. Each mode then registers
+``--signups`` new ones, ``--concurrency`` at a time: ``sync`` calls
+``register`` from a thread pool, as threaded WSGI workers would, and
+``async`` runs ``aregister`` on one event loop, which hands password
+hashing to a thread pool. ``--duplicates`` is the fraction of signups that
+reuse an existing email; they are rejected before any hashing.
+
+The uniqueness check is also timed on its own, against the two
+``exists()`` queries it replaced.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import setup_django, summarize, timed
+
+
+def seed_users(count, batch_size=5000):
+    from django.contrib.auth.models import User
+
+    User.objects.all().delete()
+    # Hashing every seeded password would dominate the run; they never log in.
+    for start in range(0, count, batch_size):
+        User.objects.bulk_create([
+            User(username=f'user{i}', email=f'User{i}@Example.com', password='!')
+            for i in range(start, min(start + batch_size, count))
+        ])
+
+
+def forms(mode, count, users, duplicates):
+    reused = int(count * duplicates)
+    for i in range(count):
+        email = f'user{i % max(users, 1)}@example.com' if i < reused and users else f'{mode}{i}@example.com'
+        yield {
+            'first_name': 'Bench', 'last_name': 'Mark', 'username': f'{mode}{i}', 'email': email,
+            'password': 'correct horse battery staple', 'confirm-password': 'correct horse battery staple',
+        }
+
+
+def build_request(factory, form):
+    from django.contrib.messages.storage.fallback import FallbackStorage
+    from django.contrib.sessions.backends.cache import SessionStore
+
+    request = factory.post('/accounts/register', form)
+    request.session = SessionStore()
+    request._messages = FallbackStorage(request)
+    return request
+
+
+def run_sync(requests, concurrency):
+    from accounts.views import register
+
+    def signup(request):
+        return timed(register, request)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(signup, requests))
+    return results, time.perf_counter() - started
+
+
+async def run_async(requests, concurrency):
+    from accounts.views import aregister
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def signup(request):
+        async with semaphore:
+            started = time.perf_counter()
+            response = await aregister(request)
+            return response, time.perf_counter() - started
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(signup(request) for request in requests))
+    return results, time.perf_counter() - started
+
+
+def time_checks(users, repeat=200):
+    from django.contrib.auth.models import User
+    from accounts.views import _conflicts
+
+    def two_queries(username, email):
+        return User.objects.filter(username=username).exists() or User.objects.filter(email=email).exists()
+
+    def one_query(username, email):
+        return list(_conflicts(username, email))
+
+    results = {}
+    for name, check in (('two exists() queries', two_queries), ('one indexed query', one_query)):
+        samples = [timed(check, f'new{i}', f'user{i % max(users, 1)}@example.com')[1] for i in range(repeat)]
+        results[name] = summarize(samples)
+        print(f'{name:<22} p50 {results[name]["p50_ms"]:7.3f} ms  p95 {results[name]["p95_ms"]:7.3f} ms')
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--modes', nargs='+', choices=['sync', 'async'], default=['sync', 'async'])
+    parser.add_argument('--users', type=int, default=10000, help='Existing accounts to seed.')
+    parser.add_argument('--signups', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duplicates', type=float, default=0.0,
+                        help='Fraction of signups that reuse an existing email.')
+    parser.add_argument('--database-url')
+    parser.add_argument('--json', help='Write results to this file.')
+    args = parser.parse_args()
+
+    setup_django(args.database_url)
+    from django.contrib.auth.models import User
+    from django.test import AsyncRequestFactory, RequestFactory
+
+    seed_users(args.users)
+    results = {'checks': time_checks(args.users), 'signups': []}
+
+    for mode in args.modes:
+        before = User.objects.count()
+        if mode == 'sync':
+            factory = RequestFactory()
+            requests = [build_request(factory, form)
+                        for form in forms(mode, args.signups, args.users, args.duplicates)]
+            responses, elapsed = run_sync(requests, args.concurrency)
+        else:
+            factory = AsyncRequestFactory()
+            requests = [build_request(factory, form)
+                        for form in forms(mode, args.signups, args.users, args.duplicates)]
+            responses, elapsed = asyncio.run(run_async(requests, args.concurrency))
+        created = User.objects.count() - before
+
+        result = {
+            'mode': mode,
+            'concurrency': args.concurrency,
+            'signups': args.signups,
+            'created': created,
+            'rejected': args.signups - created,
+            'signups_per_s': args.signups / elapsed,
+            **summarize([seconds for _, seconds in responses]),
+        }
+        results['signups'].append(result)
+        print(
+            f'{mode:>6} {result["signups_per_s"]:8.1f} signups/s  '
+            f'p50 {result["p50_ms"]:8.2f} ms  p95 {result["p95_ms"]:8.2f} ms  '
+            f'{created} created, {result["rejected"]} rejected'
+        )
+
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
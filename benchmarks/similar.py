@@ -0,0 +1,102 @@
+"""
+Build time of the "similar destinations" lists, full and incremental.
+
+    python -m benchmarks.similar --rows 1000 10000
+    python -m benchmarks.similar --rows 20000 --changed 0.001 0.01 --k 8
+
+For each catalog size the lists are built from scratch, then
+``--changed`` fractions of the descriptions are rewritten and the lists
+brought up to date incrementally (the previous run is backdated so that
+only the rewritten rows count as changed). The detail page's lookup of a
+destination's list is timed too, against scoring one description against
+the whole catalog on request.
+"""
+
+import argparse
+import json
+import random
+
+from benchmarks.common import seed_destinations, setup_django, summarize, timed
+
+
+def backdate():
+    from datetime import timedelta
+    from django.utils import timezone
+    from frtuna.models import Destinations, SimilarityRun
+
+    Destinations.objects.update(updated_at=timezone.now() - timedelta(days=1))
+    SimilarityRun.objects.update(started_at=timezone.now() - timedelta(hours=1))
+
+
+def rewrite(fraction, words, rng):
+    from django.utils import timezone
+    from frtuna.models import Destinations
+
+    ids = list(Destinations.objects.values_list('id', flat=True))
+    dests = list(Destinations.objects.filter(id__in=rng.sample(ids, max(1, int(len(ids) * fraction)))))
+    for dest in dests:
+        dest.desc = ' '.join(rng.choices(words, k=30))
+        dest.updated_at = timezone.now()  # bulk_update skips auto_now
+    Destinations.objects.bulk_update(dests, ['desc', 'updated_at'])
+    return len(dests)
+
+
+def time_lookups(count, repeat=200):
+    import numpy as np
+    from frtuna.models import Destinations, SimilarDestination
+    from frtuna.similarity import tfidf, top_neighbours
+
+    ids = list(Destinations.objects.values_list('id', flat=True)[:repeat])
+
+    def lookup(pk):
+        return list(SimilarDestination.objects.filter(source_id=pk).order_by('rank').select_related('target')
+                    .defer('target__search_vector'))
+
+    def on_request(pk):
+        texts = list(Destinations.objects.order_by('id').values_list('id', 'desc'))
+        row = next(i for i, (other, _) in enumerate(texts) if other == pk)
+        return next(top_neighbours(tfidf(text for _, text in texts), np.array([row]), 6))
+
+    results = {}
+    for name, func, times in (('stored lookup', lookup, repeat), ('scored on request', on_request, 5)):
+        results[name] = summarize([timed(func, pk)[1] for pk in ids[:times]])
+        print(f'  {name:<18} p50 {results[name]["p50_ms"]:9.3f} ms  p95 {results[name]["p95_ms"]:9.3f} ms')
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--changed', type=float, nargs='+', default=[0.001, 0.01, 0.1])
+    parser.add_argument('--k', type=int, default=6)
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--database-url')
+    parser.add_argument('--json', help='Write results to this file.')
+    args = parser.parse_args()
+
+    setup_django(args.database_url)
+    from frtuna.similarity import update_neighbours
+
+    rng = random.Random(42)
+    results = []
+    for count in args.rows:
+        words = seed_destinations(count)
+        (recomputed, _), seconds = timed(update_neighbours, args.k, args.batch_size, True)
+        result = {'rows': count, 'full_s': seconds, 'incremental': []}
+        print(f'{count} rows: full build {seconds:.2f} s')
+        for fraction in args.changed:
+            backdate()
+            changed = rewrite(fraction, words, rng)
+            (recomputed, _), seconds = timed(update_neighbours, args.k, args.batch_size)
+            result['incremental'].append({'changed': changed, 'recomputed': recomputed, 'seconds': seconds})
+            print(f'  {changed:>6} changed -> {recomputed:>6} recomputed in {seconds:.2f} s')
+        result['lookups'] = time_lookups(count)
+        results.append(result)
+
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
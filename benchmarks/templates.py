@@ -0,0 +1,113 @@
+"""
+Render time per template with and without the cached loaders and memoised static URLs.
+
+    python -m benchmarks.templates --renders 200
+    python -m benchmarks.templates --manifest
+
+``reparse`` loads every template through the filesystem and app-directory
+loaders without the cached loader, so each render reads and parses the
+file again, and clears the ``{% static %}`` memo first. ``cached`` uses the
+configured engine after ``warm_templates``. ``--manifest`` runs
+``collectstatic`` into a temporary directory and serves from the bundled,
+fingerprinted storage, where each static lookup goes through the manifest.
+"""
+
+import argparse
+import json
+import tempfile
+from contextlib import ExitStack
+
+from benchmarks.common import seed_destinations, setup_django, summarize, timed
+
+
+TEMPLATES = ('index.html', 'destinations_grid.html', 'destination.html', 'login.html', 'register.html')
+
+
+def contexts():
+    from frtuna.models import Destinations
+    from frtuna.pagination import paginate
+
+    page = paginate(Destinations.objects.defer('search_vector'), page_size=12)
+    grid = {'dests': page.items, 'page': page, 'listing_query': 'sort=id&page_size=12'}
+    return {
+        'index.html': {**grid, 'destinations_grid': '', 'sort': 'id', 'page_size': 12},
+        'destinations_grid.html': grid,
+        'destination.html': {'dest': page.items[0]},
+        'login.html': {},
+        'register.html': {},
+    }
+
+
+def reparsing_backend():
+    from django.conf import settings
+    from django.template.backends.django import DjangoTemplates
+
+    config = settings.TEMPLATES[0]
+    options = {**config['OPTIONS'], 'loaders': [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]}
+    return DjangoTemplates({'NAME': 'reparse', 'DIRS': config['DIRS'], 'APP_DIRS': False, 'OPTIONS': options})
+
+
+def use_manifest_storage(stack):
+    from django.core.management import call_command
+    from django.test import override_settings
+
+    root = stack.enter_context(tempfile.TemporaryDirectory(prefix='bench-static-'))
+    stack.enter_context(override_settings(
+        DEBUG=False, STATIC_ROOT=root,
+        STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+        STORAGES={
+            'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+            'staticfiles': {'BACKEND': 'frtuna.staticfiles.BundledStaticFilesStorage'},
+        },
+    ))
+    call_command('collectstatic', interactive=False, verbosity=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--templates', nargs='+', choices=TEMPLATES, default=list(TEMPLATES))
+    parser.add_argument('--renders', type=int, default=100)
+    parser.add_argument('--manifest', action='store_true',
+                        help='Serve static files from a collected, fingerprinted manifest.')
+    parser.add_argument('--json', help='Write results to this file.')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.template import engines
+    from django.test import RequestFactory
+    from frtuna.staticfiles import static_url
+    from frtuna.template_cache import warm_templates
+
+    seed_destinations(12)
+    results = []
+    with ExitStack() as stack:
+        if args.manifest:
+            use_manifest_storage(stack)
+        request = RequestFactory().get('/')
+        warm_templates()
+        modes = {'reparse': reparsing_backend(), 'cached': engines['django']}
+        context_for = contexts()
+
+        for name in args.templates:
+            for mode, backend in modes.items():
+                def render():
+                    if mode == 'reparse':
+                        static_url.cache_clear()
+                    return backend.get_template(name).render(context_for[name], request)
+
+                render()  # warm up
+                samples = [timed(render)[1] for _ in range(args.renders)]
+                result = {'template': name, 'mode': mode, 'manifest': args.manifest, **summarize(samples)}
+                results.append(result)
+                print(f'{name:<24} {mode:>8}  p50 {result["p50_ms"]:7.3f} ms  p95 {result["p95_ms"]:7.3f} ms')
+
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Image import throughput against a simulated Cloudinary.
+
+    python -m benchmarks.uploads --images 200 --workers 1 4 16 --latency 0.05 --failure-rate 0.02
+
+Runs ``ImagePipeline`` against ``LocalCloudinaryStorage`` so uploads pay a
+round trip (``--latency`` +/- ``--jitter``), transfer time (``--bandwidth``)
+and occasional injected failures, without any network access. ``--seed``
+makes the delays and failures repeatable between runs.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.common import setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--images', type=int, default=200)
+    parser.add_argument('--image-size', type=int, default=200_000, help='Bytes per image.')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--jitter', type=float, default=0.01)
+    parser.add_argument('--failure-rate', type=float, default=0.02)
+    parser.add_argument('--bandwidth', type=float, default=None, help='Bytes per second per upload.')
+    parser.add_argument('--max-concurrency', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', help='Write results to this file.')
+    args = parser.parse_args()
+
+    setup_django()
+    from frtuna.images import ImagePipeline, ImageUploadError
+    from frtuna.storage import LocalCloudinaryStorage
+
+    images = [(os.urandom(args.image_size), f'{i}.jpg') for i in range(args.images)]
+
+    results = []
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory(prefix='bench-cloudinary-') as location:
+            storage = LocalCloudinaryStorage(
+                location=location, latency=args.latency, jitter=args.jitter,
+                failure_rate=args.failure_rate, bandwidth=args.bandwidth,
+                max_concurrency=args.max_concurrency, seed=args.seed,
+            )
+            pipeline = ImagePipeline(storage=storage, max_workers=workers, backoff=0.05)
+            started = time.perf_counter()
+            try:
+                pipeline.ingest(images)
+                failed = 0
+            except ImageUploadError:
+                failed = 1
+            elapsed = time.perf_counter() - started
+
+        result = {
+            'workers': workers,
+            'images': args.images,
+            'seconds': elapsed,
+            'images_per_second': args.images / elapsed,
+            'network_calls': storage.network.calls,
+            'retries': pipeline.stats.retries,
+            'failed': failed,
+        }
+        results.append(result)
+        print(
+            f'{workers:>3} workers  {elapsed:7.2f} s  {result["images_per_second"]:7.1f} images/s  '
+            f'{result["network_calls"]} calls  {result["retries"]} retries'
+            + ('  GAVE UP' if failed else '')
+        )
+
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -14,14 +14,16 @@ from pathlib import Path
 import os
 import dj_database_url
 import sys
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Load environment variables from a .env file during local development.
+# Deployed processes get real environment variables and skip the import.
+if os.path.exists(BASE_DIR / '.env'):
+    from dotenv import load_dotenv
+    load_dotenv(BASE_DIR / '.env')
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -60,19 +62,19 @@ CSRF_COOKIE_SAMESITE = 'Lax'  # Re-enabled for security
 
 INSTALLED_APPS = [
     'frtuna.apps.FrtunaConfig',
+    'accounts.apps.AccountsConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-    'cloudinary',
-    'cloudinary_storage',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',  # Add whitenoise for static files
+    'frtuna.middleware.AsyncWhiteNoiseMiddleware',  # whitenoise for static files, ASGI-friendly
+    'frtuna.middleware.RequestMetricsMiddleware',  # Server-Timing and /metrics
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',  # Re-enabled CSRF middleware
@@ -87,27 +89,151 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [os.path.join(BASE_DIR,'templates')],
-        'APP_DIRS': True,
+        # APP_DIRS cannot be combined with 'loaders'; app_directories.Loader
+        # below does the same. Templates are parsed once per process and kept,
+        # and gunicorn.conf.py warms them before forking (see frtuna.template_cache).
+        'APP_DIRS': False,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
 
 WSGI_APPLICATION = 'ethiopian_places.wsgi.application'
 
+# Route the home page and destination APIs to their async views. Only worth
+# it under an ASGI server (gunicorn.conf.py turns it on for uvicorn workers).
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', 'False') == 'True'
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Connections are kept open for DB_CONN_MAX_AGE seconds (0 closes them after
+# every request, None keeps them forever) instead of paying a new TCP/TLS
+# handshake and backend start-up per request. Health checks make Django ping
+# a reused connection once per request, so one dropped by the server or a
+# proxy is replaced instead of failing the request. Under ASGI they are not
+# reused, as each request's queries run on new threads: gunicorn.conf.py
+# defaults it to 0 for uvicorn workers.
+
+DB_CONN_MAX_AGE = os.environ.get('DB_CONN_MAX_AGE', '60')
+DB_CONN_MAX_AGE = None if DB_CONN_MAX_AGE.lower() == 'none' else int(DB_CONN_MAX_AGE)
+
 DATABASES = {
-    'default': dj_database_url.config(default=os.environ.get('DATABASE_URL'))
+    'default': dj_database_url.config(
+        default=os.environ.get('DATABASE_URL'),
+        conn_max_age=DB_CONN_MAX_AGE,
+        conn_health_checks=os.environ.get('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
+    )
+}
+
+# DB_POOL=True switches PostgreSQL to a psycopg 3 connection pool shared by
+# all threads of a worker (requires `pip install "psycopg[binary,pool]"`;
+# psycopg2 does not support it). The pool manages connection lifetime itself,
+# so persistent connections are turned off.
+if (os.environ.get('DB_POOL', 'False') == 'True'
+        and DATABASES['default'].get('ENGINE') == 'django.db.backends.postgresql'):
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+        'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+        'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+        'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+    }
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# CACHE_BACKEND=locmem keeps entries per process (LRU eviction once
+# MAX_ENTRIES is reached); CACHE_BACKEND=file shares them between workers on
+# one host (culls CACHE_MAX_ENTRIES // CACHE_CULL_FREQUENCY entries when full).
+# gunicorn.conf.py defaults to file whenever it starts more than one worker.
+
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    # Shared between hosts too; create the table with "manage.py createcachetable".
+    'db': 'django.core.cache.backends.db.DatabaseCache',
+}
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+CACHE_LOCATIONS = {
+    'locmem': 'ethiopian-places',
+    'file': os.path.join(BASE_DIR, '.cache'),
+    'db': 'ethiopian_places_cache',
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': os.environ.get('CACHE_LOCATION', CACHE_LOCATIONS[CACHE_BACKEND]),
+        'TIMEOUT': int(os.environ.get('CACHE_TIMEOUT', 300)),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', 1000)),
+            'CULL_FREQUENCY': int(os.environ.get('CACHE_CULL_FREQUENCY', 3)),
+        },
+    }
 }
 
+# Lifetime of catalog-versioned home page entries (see frtuna.cache).
+CATALOG_CACHE_TIMEOUT = int(os.environ.get('CATALOG_CACHE_TIMEOUT', 3600))
+
+
+# In-process cache of built image URLs (see frtuna.storage_urls): entries
+# kept per worker, and seconds before another worker's change is picked up.
+STORAGE_URL_CACHE_SIZE = int(os.environ.get('STORAGE_URL_CACHE_SIZE', 4096))
+STORAGE_URL_CACHE_TIMEOUT = int(os.environ.get('STORAGE_URL_CACHE_TIMEOUT', 300))
+
+# Sessions and signed-in users read through the cache (see
+# accounts.backends). Every worker must see the others' writes, or a logout
+# in one would not end the session in the rest; gunicorn.conf.py switches
+# several workers to the file cache for this.
+AUTH_CACHE = os.environ.get('AUTH_CACHE', 'True') == 'True'
+SESSION_ENGINE = (
+    'django.contrib.sessions.backends.cached_db' if AUTH_CACHE
+    else 'django.contrib.sessions.backends.db'
+)
+AUTHENTICATION_BACKENDS = ['accounts.backends.CachedModelBackend']
+USER_CACHE_TIMEOUT = int(os.environ.get('USER_CACHE_TIMEOUT', 300))
+
+# Login throttling (see accounts.throttling): attempts allowed per client IP
+# and per username in a sliding window of WINDOW seconds, and how many
+# trusted proxies add themselves to X-Forwarded-For. Railway, which sets
+# RAILWAY_ENVIRONMENT_ID in every deployment, runs one edge proxy; without
+# counting it every client would share the edge's address.
+# Counts are kept per worker with locmem; use file or db to share them.
+LOGIN_THROTTLE = {
+    'IP_LIMIT': int(os.environ.get('LOGIN_THROTTLE_IP_LIMIT', 20)),
+    'USERNAME_LIMIT': int(os.environ.get('LOGIN_THROTTLE_USERNAME_LIMIT', 5)),
+    'WINDOW': int(os.environ.get('LOGIN_THROTTLE_WINDOW', 300)),
+    'PROXY_COUNT': int(os.environ.get('LOGIN_THROTTLE_PROXY_COUNT',
+                                      1 if os.environ.get('RAILWAY_ENVIRONMENT_ID') else 0)),
+}
+LOGIN_THROTTLE_CACHE = os.environ.get('LOGIN_THROTTLE_CACHE', CACHE_BACKEND)
+CACHES['login-throttle'] = {
+    'BACKEND': CACHE_BACKENDS[LOGIN_THROTTLE_CACHE],
+    'LOCATION': {
+        'locmem': 'login-throttle',
+        'file': os.path.join(BASE_DIR, '.cache', 'login-throttle'),
+        'db': 'login_throttle_cache',
+    }[LOGIN_THROTTLE_CACHE],
+}
+
+# Request metrics (see frtuna.metrics): the fraction of requests whose query,
+# template and storage URL costs are recorded, and the bearer token required
+# to read /metrics. Without a token /metrics is only served with DEBUG on.
+METRICS_SAMPLE_RATE = float(os.environ.get('METRICS_SAMPLE_RATE', 1.0 if DEBUG else 0.1))
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -142,7 +268,6 @@ USE_TZ = True
 
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
-print("DATABASE_URL in use:", os.environ.get('DATABASE_URL'))
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [
@@ -150,8 +275,39 @@ STATICFILES_DIRS = [
 ]
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
-# Enable WhiteNoise's GZip compression
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# STATIC_STORAGE=bundled (the default) makes collectstatic build the
+# STATIC_BUNDLES below, fingerprint every file and write Brotli and gzip
+# variants for WhiteNoise to serve (see frtuna.staticfiles). With DEBUG off it
+# needs collectstatic to have run; plain serves the files as they are.
+STATIC_STORAGE_BACKENDS = {
+    'bundled': 'frtuna.staticfiles.BundledStaticFilesStorage',
+    'plain': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+}
+STATIC_STORAGE = 'plain' if 'test' in sys.argv else os.environ.get('STATIC_STORAGE', 'bundled')
+
+# Per-page CSS/JS bundles, loaded with {% bundle %} from frtuna_static.
+STATIC_BUNDLES = {
+    'bundles/index.css': [
+        'styles/bootstrap4/bootstrap.min.css',
+        'plugins/font-awesome-4.7.0/css/font-awesome.min.css',
+        'plugins/OwlCarousel2-2.2.1/owl.carousel.css',
+        'plugins/OwlCarousel2-2.2.1/owl.theme.default.css',
+        'plugins/OwlCarousel2-2.2.1/animate.css',
+        'styles/main_styles.css',
+        'styles/responsive.css',
+    ],
+    'bundles/index.js': [
+        'js/jquery-3.2.1.min.js',
+        'styles/bootstrap4/popper.js',
+        'styles/bootstrap4/bootstrap.min.js',
+        'plugins/OwlCarousel2-2.2.1/owl.carousel.js',
+        'plugins/Isotope/isotope.pkgd.min.js',
+        'plugins/scrollTo/jquery.scrollTo.min.js',
+        'plugins/easing/easing.js',
+        'plugins/parallax-js-master/parallax.min.js',
+        'js/custom.js',
+    ],
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -186,18 +342,46 @@ if 'test' in sys.argv:
     SECURE_SSL_REDIRECT = False
     APPEND_SLASH = False  # Disable trailing slash redirects during testing
 
-# Comment out Cloudinary storage for local uploads
-# DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
-
 CLOUDINARY_STORAGE = {
     'CLOUD_NAME': os.environ.get('CLOUDINARY_CLOUD_NAME'),
     'API_KEY': os.environ.get('CLOUDINARY_API_KEY'),
     'API_SECRET': os.environ.get('CLOUDINARY_API_SECRET'),
 }
 
-if len(sys.argv) > 1 and sys.argv[1] == 'test':
-    DEFAULT_FILE_STORAGE = 'django.core.files.storage.FileSystemStorage'
-else:
-    DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
+# Django 5.1 reads media storage from STORAGES only. MEDIA_STORAGE picks
+# the backend: filesystem (MEDIA_ROOT), cloudinary, or local-cloudinary, an
+# offline Cloudinary stand-in with simulated latency and failures
+# (frtuna.storage).
+MEDIA_STORAGE_BACKENDS = {
+    'filesystem': 'django.core.files.storage.FileSystemStorage',
+    'cloudinary': 'cloudinary_storage.storage.MediaCloudinaryStorage',
+    'local-cloudinary': 'frtuna.storage.LocalCloudinaryStorage',
+}
+# Tests always use local files.
+MEDIA_STORAGE = 'filesystem' if 'test' in sys.argv else os.environ.get('MEDIA_STORAGE', 'filesystem')
+
+# Threads per process that build image renditions (see frtuna.thumbnails)
+# away from the request that found them missing. Tests build them inline.
+THUMBNAIL_WORKERS = 0 if 'test' in sys.argv else int(os.environ.get('THUMBNAIL_WORKERS', 1))
 
-print("DEFAULT_FILE_STORAGE in use:", DEFAULT_FILE_STORAGE)
\ No newline at end of file
+STORAGES = {
+    'default': {'BACKEND': MEDIA_STORAGE_BACKENDS[MEDIA_STORAGE]},
+    'staticfiles': {'BACKEND': STATIC_STORAGE_BACKENDS[STATIC_STORAGE]},
+}
+
+# The Cloudinary SDK takes tens of milliseconds to import, so its apps are
+# only installed in processes that store media there.
+if MEDIA_STORAGE == 'cloudinary':
+    INSTALLED_APPS += ['cloudinary', 'cloudinary_storage']
+
+# Network profile of the local-cloudinary stand-in: seconds of latency and
+# jitter per call, fraction of calls that fail, bytes/second for transfers,
+# concurrent request cap, and a seed for reproducible runs.
+LOCAL_CLOUDINARY = {
+    'LATENCY': float(os.environ.get('LOCAL_CLOUDINARY_LATENCY', 0.05)),
+    'JITTER': float(os.environ.get('LOCAL_CLOUDINARY_JITTER', 0.01)),
+    'FAILURE_RATE': float(os.environ.get('LOCAL_CLOUDINARY_FAILURE_RATE', 0)),
+    'BANDWIDTH': int(os.environ['LOCAL_CLOUDINARY_BANDWIDTH']) if os.environ.get('LOCAL_CLOUDINARY_BANDWIDTH') else None,
+    'MAX_CONCURRENCY': int(os.environ.get('LOCAL_CLOUDINARY_MAX_CONCURRENCY', 10)),
+    'SEED': os.environ.get('LOCAL_CLOUDINARY_SEED'),
+}
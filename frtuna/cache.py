@@ -0,0 +1,323 @@
+"""
+Catalog-versioned caching for the destinations home page.
+
+Every cache key embeds the current catalog version, an opaque token that
+``frtuna.signals`` replaces whenever a ``Destinations`` row is saved or
+deleted. Changing the catalog therefore never requires finding and
+deleting stale entries: readers simply stop asking for the old keys and
+the backend's own eviction (``MAX_ENTRIES``/``CULL_FREQUENCY``) reclaims
+them.
+
+Several layers share that version:
+
+* ``cached_fragment`` (``acached_fragment`` in async views) caches a rendered chunk of HTML, used for the
+  destinations grid so the per-user header can still render fresh.
+* ``cache_anonymous_page`` caches the whole response for anonymous GETs.
+  The CSRF token in the page is swapped for a placeholder before storing
+  and a fresh token is put back on every hit, so cached pages are never
+  shared with a token that belongs to someone else.
+* ``catalog_etag`` derives HTTP ETags, so polling clients get
+  ``304 Not Modified`` until the catalog changes. Async views use
+  ``acatalog_etag`` through ``aetag``.
+
+Destination detail pages are cached per object instead
+(``cached_destination``): one entry per slug, deleted by
+``frtuna.signals`` when that row is saved or deleted, so editing one
+destination leaves every other detail page cached.
+
+Cached HTML also embeds a renditions version (``get_html_version``), which
+``frtuna.thumbnails`` bumps when a background build gives an image its
+renditions: that changes pages, not the catalog, so the ETags of the JSON
+endpoints and the search and nearby indexes are left alone.
+
+The versions live in the configured cache, so processes only agree on them
+when they share a backend (``CACHE_BACKEND=file`` on a single host).
+
+Async views never call the cache synchronously: the ``db`` backend queries
+the database, which Django refuses to do on the event loop.
+"""
+
+import hashlib
+import re
+import threading
+import uuid
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.utils.safestring import mark_safe
+
+
+CATALOG_VERSION_KEY = 'frtuna:catalog-version'
+RENDITIONS_VERSION_KEY = 'frtuna:renditions-version'
+CSRF_PLACEHOLDER = '__frtuna_csrf_token__'
+_CSRF_INPUT = re.compile(r'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+
+
+def cache_timeout():
+    """Seconds a versioned entry may live; stale versions are never read anyway."""
+    return getattr(settings, 'CATALOG_CACHE_TIMEOUT', 60 * 60)
+
+
+class CacheStats:
+    """Thread-safe, per-process hit/miss counters keyed by cache layer name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def _record(self, name, outcome):
+        with self._lock:
+            counts = self._counts.setdefault(name, {'hits': 0, 'misses': 0})
+            counts[outcome] += 1
+
+    def hit(self, name):
+        self._record(name, 'hits')
+
+    def miss(self, name):
+        self._record(name, 'misses')
+
+    def snapshot(self):
+        """Return a copy of the counters, e.g. ``{'page': {'hits': 3, 'misses': 1}}``."""
+        with self._lock:
+            return {name: dict(counts) for name, counts in self._counts.items()}
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+stats = CacheStats()
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    # A dummy backend stores nothing; a throwaway version just disables caching.
+    return version or uuid.uuid4().hex
+
+
+async def _aget_version(key):
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, uuid.uuid4().hex, None)
+        version = await cache.aget(key)
+    return version or uuid.uuid4().hex
+
+
+def get_catalog_version():
+    """Return the current catalog version, creating one if the cache lost it."""
+    return _get_version(CATALOG_VERSION_KEY)
+
+
+async def aget_catalog_version():
+    """Async ``get_catalog_version``."""
+    return await _aget_version(CATALOG_VERSION_KEY)
+
+
+def bump_catalog_version():
+    """Invalidate every catalog-derived cache entry at once."""
+    cache.set(CATALOG_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def get_html_version():
+    """
+    The catalog version combined with the renditions version, for cached
+    HTML that embeds ``srcset`` attributes.
+    """
+    return f'{_get_version(CATALOG_VERSION_KEY)}.{_get_version(RENDITIONS_VERSION_KEY)}'
+
+
+async def aget_html_version():
+    """Async ``get_html_version``."""
+    return f'{await _aget_version(CATALOG_VERSION_KEY)}.{await _aget_version(RENDITIONS_VERSION_KEY)}'
+
+
+def bump_renditions_version():
+    """
+    Invalidate cached pages and grid fragments, which may have been
+    rendered before an image had renditions, leaving ETags of the JSON
+    endpoints and the search and nearby indexes alone.
+    """
+    cache.set(RENDITIONS_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def catalog_key(layer, version, *parts):
+    """Build a bounded-length cache key for ``layer`` under ``version``."""
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return f'frtuna:{layer}:{version}:{digest}'
+
+
+def catalog_etag(request, *args, **kwargs):
+    """
+    Strong ETag for a catalog-derived response: the same catalog version and
+    URL always produce the same bytes. For ``django.views.decorators.http.etag``.
+    """
+    return _etag(get_catalog_version(), request)
+
+
+async def acatalog_etag(request, *args, **kwargs):
+    """Async ``catalog_etag``, for ``aetag``."""
+    return _etag(await aget_catalog_version(), request)
+
+
+def _etag(version, request):
+    return hashlib.sha256(f'{version}:{request.get_full_path()}'.encode()).hexdigest()
+
+
+def aetag(etag_func):
+    """
+    ``django.views.decorators.http.etag`` for async views, awaiting a
+    coroutine ``etag_func``; Django's own calls it synchronously.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            res_etag = quote_etag(await etag_func(request, *args, **kwargs))
+            response = get_conditional_response(request, etag=res_etag)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            if request.method in ('GET', 'HEAD'):
+                response.headers.setdefault('ETag', res_etag)
+            return response
+
+        return inner
+
+    return decorator
+
+
+def cached_fragment(name, parts, render, images=False):
+    """
+    Return the HTML for fragment ``name``, calling ``render()`` on a miss.
+
+    ``parts`` must capture everything the fragment depends on besides the
+    catalog itself (sort order, cursor, page size, ...). Fragments that show
+    ``images`` are also dropped when renditions are built.
+    """
+    version = get_html_version() if images else get_catalog_version()
+    key = catalog_key(name, version, *parts)
+    html = cache.get(key)
+    if html is not None:
+        stats.hit(name)
+        return mark_safe(html)
+
+    stats.miss(name)
+    html = render()
+    cache.set(key, str(html), cache_timeout())
+    return mark_safe(html)
+
+
+async def acached_fragment(name, parts, render, images=False):
+    """Like ``cached_fragment``, but ``render`` is a coroutine function."""
+    version = await aget_html_version() if images else await aget_catalog_version()
+    key = catalog_key(name, version, *parts)
+    html = await cache.aget(key)
+    if html is not None:
+        stats.hit(name)
+        return mark_safe(html)
+
+    stats.miss(name)
+    html = await render()
+    await cache.aset(key, str(html), cache_timeout())
+    return mark_safe(html)
+
+
+def _page_key(request):
+    # Read the version before rendering: if the catalog changes while the
+    # view runs, the result lands under the old key and is never served.
+    return catalog_key('page', get_html_version(), request.get_full_path())
+
+
+def _lookup_page(request):
+    key = _page_key(request)
+    return key, _cached_page(request, key)
+
+
+def _cached_page(request, key):
+    cached = cache.get(key)
+    if cached is None:
+        stats.miss('page')
+        return None
+    stats.hit('page')
+    content, content_type = cached
+    response = HttpResponse(
+        content.replace(CSRF_PLACEHOLDER, get_token(request)),
+        content_type=content_type,
+    )
+    response['X-Cache'] = 'HIT'
+    return response
+
+
+def _store_page(key, response):
+    if response.status_code == 200 and not response.streaming:
+        content = _CSRF_INPUT.sub(
+            r'\g<1>' + CSRF_PLACEHOLDER + r'\g<2>',
+            response.content.decode(response.charset),
+        )
+        cache.set(key, (content, response['Content-Type']), cache_timeout())
+    response['X-Cache'] = 'MISS'
+    return response
+
+
+def cache_anonymous_page(view):
+    """
+    Serve anonymous GETs of ``view`` from a catalog-versioned page cache.
+    Works with sync and async views; an async view's lookup and store each
+    take one thread hop, as the cache may be the database.
+    """
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            if request.method != 'GET' or (await request.auser()).is_authenticated:
+                return await view(request, *args, **kwargs)
+            key, response = await sync_to_async(_lookup_page)(request)
+            if response is None:
+                response = await sync_to_async(_store_page)(key, await view(request, *args, **kwargs))
+            return response
+
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method != 'GET' or request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+        key = _page_key(request)
+        response = _cached_page(request, key)
+        if response is None:
+            response = _store_page(key, view(request, *args, **kwargs))
+        return response
+
+    return wrapper
+
+
+def destination_key(slug):
+    return f'frtuna:destination:{slug}'
+
+
+def cached_destination(slug, build):
+    """
+    Return the cached detail entry for ``slug``, calling ``build()`` on a
+    miss. ``build`` returns a dict, or ``{}`` for an unknown slug; both are
+    cached, so crawlers following dead links do not reach the database.
+    """
+    key = destination_key(slug)
+    entry = cache.get(key)
+    if entry is not None:
+        stats.hit('destination')
+        return entry
+
+    stats.miss('destination')
+    entry = build()
+    cache.set(key, entry, cache_timeout())
+    return entry
+
+
+def invalidate_destination(*slugs):
+    cache.delete_many([destination_key(slug) for slug in slugs if slug])
@@ -0,0 +1,137 @@
+"""
+Price/offer filtering and facet counts for destination listings.
+
+``DestinationFilter.facets`` computes every price-bucket and offer count
+with conditional ``COUNT(... FILTER (WHERE ...))`` aggregates in a single
+query, instead of one ``count()`` per bucket. Each facet ignores its own
+filter (the price buckets respect ``offer`` but not the price range, and
+vice versa) so clients can show how many results a different choice would
+give.
+"""
+
+from django.db.models import Count, Q
+
+from .models import Destinations
+
+
+# Half-open [low, high) price bands; ``None`` means unbounded.
+PRICE_BUCKETS = (
+    (0, 1000),
+    (1000, 2000),
+    (2000, 3000),
+    (3000, None),
+)
+
+TRUE_VALUES = {'1', 'true', 'yes'}
+FALSE_VALUES = {'0', 'false', 'no'}
+
+
+class InvalidFilter(ValueError):
+    """Raised for a filter parameter that cannot be parsed."""
+
+
+def _parse_price(params, name):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        price = int(value)
+    except ValueError:
+        raise InvalidFilter(f'{name} must be an integer')
+    if price < 0:
+        raise InvalidFilter(f'{name} must not be negative')
+    return price
+
+
+def _bucket_q(low, high):
+    q = Q(price__gte=low)
+    if high is not None:
+        q &= Q(price__lt=high)
+    return q
+
+
+class DestinationFilter:
+    """A validated ``min_price``/``max_price``/``offer`` filter."""
+
+    def __init__(self, min_price=None, max_price=None, offer=None):
+        self.min_price = min_price
+        self.max_price = max_price
+        self.offer = offer
+
+    @classmethod
+    def from_query(cls, params):
+        """Build a filter from request query parameters."""
+        min_price = _parse_price(params, 'min_price')
+        max_price = _parse_price(params, 'max_price')
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise InvalidFilter('min_price must not exceed max_price')
+
+        offer = params.get('offer', '').lower()
+        if offer in TRUE_VALUES:
+            offer = True
+        elif offer in FALSE_VALUES:
+            offer = False
+        elif offer == '':
+            offer = None
+        else:
+            raise InvalidFilter('offer must be 1 or 0')
+        return cls(min_price, max_price, offer)
+
+    def price_q(self):
+        q = Q()
+        if self.min_price is not None:
+            q &= Q(price__gte=self.min_price)
+        if self.max_price is not None:
+            q &= Q(price__lte=self.max_price)
+        return q
+
+    def offer_q(self):
+        return Q() if self.offer is None else Q(offer=self.offer)
+
+    def apply(self, queryset):
+        return queryset.filter(self.price_q() & self.offer_q())
+
+    def as_params(self):
+        """The active filters as query parameters, for building links."""
+        params = {}
+        if self.min_price is not None:
+            params['min_price'] = self.min_price
+        if self.max_price is not None:
+            params['max_price'] = self.max_price
+        if self.offer is not None:
+            params['offer'] = int(self.offer)
+        return params
+
+    def cache_parts(self):
+        return (self.min_price, self.max_price, self.offer)
+
+    def _facet_aggregates(self):
+        aggregates = {
+            f'bucket_{i}': Count('id', filter=_bucket_q(low, high) & self.offer_q())
+            for i, (low, high) in enumerate(PRICE_BUCKETS)
+        }
+        aggregates['offer_true'] = Count('id', filter=self.price_q() & Q(offer=True))
+        aggregates['offer_false'] = Count('id', filter=self.price_q() & Q(offer=False))
+        return aggregates
+
+    @staticmethod
+    def _facet_result(counts):
+        return {
+            'price': [
+                {'min': low, 'max': high, 'count': counts[f'bucket_{i}']}
+                for i, (low, high) in enumerate(PRICE_BUCKETS)
+            ],
+            'offer': {'true': counts['offer_true'], 'false': counts['offer_false']},
+        }
+
+    def facets(self, queryset=None):
+        """Price-bucket and offer counts, computed in one aggregate query."""
+        if queryset is None:
+            queryset = Destinations.objects.all()
+        return self._facet_result(queryset.aggregate(**self._facet_aggregates()))
+
+    async def afacets(self, queryset=None):
+        """Async version of ``facets``."""
+        if queryset is None:
+            queryset = Destinations.objects.all()
+        return self._facet_result(await queryset.aaggregate(**self._facet_aggregates()))
@@ -0,0 +1,292 @@
+"""
+Nearest-destination search without PostGIS.
+
+Coordinates are turned into points on the unit sphere. There, straight-line
+(chord) distance orders points exactly as great-circle distance does, so
+the antimeridian and the poles need no special cases. ``KDTree`` indexes
+those points in NumPy arrays: splits are made with ``argpartition`` on the
+widest dimension, leaves hold up to ``leaf_size`` contiguous points that a
+query scans in one vectorised step, and nodes are visited nearest box
+first, stopping once no box can hold a closer point.
+
+``NearbyIndex`` adds changes on top of a built tree. A saved destination's
+old entry is masked out and its new point goes to a small pending set,
+scanned alongside the tree; once changes reach ``rebuild_fraction`` of the
+tree it is rebuilt from the surviving points.
+
+``nearest_destinations`` serves queries from a per-process index.
+``frtuna.signals`` applies this process's saves and deletes to it once they
+commit. Other processes' writes show up as a new catalog version; the
+index then catches up from rows whose ``updated_at`` is recent, and is
+rebuilt from scratch if its size no longer matches the number of located
+rows (deletes and bulk changes leave no ``updated_at`` trail). Processes
+only share the catalog version through a shared cache, so every
+``CHECK_INTERVAL`` seconds the index also compares the table's newest
+``updated_at`` and located row count with the last check's, and catches
+up if they moved.
+"""
+
+import heapq
+import threading
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from .cache import get_catalog_version
+from .models import Destinations
+
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def to_unit_vectors(lat, lon):
+    """``(n, 3)`` points on the unit sphere for latitudes and longitudes in degrees."""
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def chord_to_km(chord):
+    """Great-circle distance in km for a chord length on the unit sphere."""
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.asarray(chord) / 2, 0, 1))
+
+
+class KDTree:
+    """
+    A static k-d tree over ``points``. ``order[i]`` is the row of
+    ``points`` stored at tree position ``i``; queries return positions.
+    """
+
+    def __init__(self, points, leaf_size=32):
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        order = np.arange(len(points))
+        starts, ends, lefts, rights, lows, highs = [], [], [], [], [], []
+
+        def add(start, end):
+            block = points[order[start:end]]
+            starts.append(start)
+            ends.append(end)
+            lefts.append(-1)
+            rights.append(-1)
+            lows.append(block.min(axis=0))
+            highs.append(block.max(axis=0))
+            return len(starts) - 1
+
+        stack = [add(0, len(points))] if len(points) else []
+        while stack:
+            node = stack.pop()
+            start, end = starts[node], ends[node]
+            if end - start <= leaf_size:
+                continue
+            rows = order[start:end]
+            dim = int(np.argmax(highs[node] - lows[node]))
+            middle = (end - start) // 2
+            order[start:end] = rows[np.argpartition(points[rows, dim], middle)]
+            lefts[node] = add(start, start + middle)
+            rights[node] = add(start + middle, end)
+            stack += [lefts[node], rights[node]]
+
+        self.order = order
+        self.points = points[order]
+        self.starts, self.ends = starts, ends
+        self.lefts, self.rights = lefts, rights
+        self.lows = np.array(lows).reshape(-1, 3)
+        self.highs = np.array(highs).reshape(-1, 3)
+
+    def __len__(self):
+        return len(self.points)
+
+    def _box_distances(self, nodes, point):
+        gaps = np.maximum(np.maximum(self.lows[nodes] - point, point - self.highs[nodes]), 0)
+        return (gaps * gaps).sum(axis=1)
+
+    def query(self, point, k, alive=None):
+        """
+        Positions and squared chord distances of the ``k`` nearest points to
+        ``point`` (unsorted), skipping positions where ``alive`` is false.
+        """
+        best_positions = np.empty(0, dtype=np.int64)
+        best_distances = np.empty(0)
+        if not len(self.points) or k < 1:
+            return best_positions, best_distances
+        worst = np.inf
+        heap = [(0.0, 0)]
+        while heap:
+            bound, node = heapq.heappop(heap)
+            if bound > worst:
+                break
+            if self.lefts[node] != -1:
+                children = [self.lefts[node], self.rights[node]]
+                for child, distance in zip(children, self._box_distances(children, point)):
+                    if distance <= worst:
+                        heapq.heappush(heap, (float(distance), child))
+                continue
+
+            start, end = self.starts[node], self.ends[node]
+            block = self.points[start:end] - point
+            distances = (block * block).sum(axis=1)
+            positions = np.arange(start, end)
+            if alive is not None:
+                keep = alive[start:end]
+                distances, positions = distances[keep], positions[keep]
+            best_distances = np.concatenate([best_distances, distances])
+            best_positions = np.concatenate([best_positions, positions])
+            if len(best_distances) >= k:
+                if len(best_distances) > k:
+                    nearest = np.argpartition(best_distances, k - 1)[:k]
+                    best_distances, best_positions = best_distances[nearest], best_positions[nearest]
+                worst = best_distances.max()
+        return best_positions, best_distances
+
+
+class NearbyIndex:
+    """k-nearest search over destination ids, kept current with ``upsert``/``remove``."""
+
+    def __init__(self, ids=(), lat=(), lon=(), leaf_size=32, rebuild_fraction=0.05, min_rebuild=64):
+        self.leaf_size = leaf_size
+        self.rebuild_fraction = rebuild_fraction
+        self.min_rebuild = min_rebuild
+        self._build(np.asarray(ids, dtype=np.int64), to_unit_vectors(lat, lon).reshape(-1, 3))
+
+    def _build(self, ids, points):
+        self.tree = KDTree(points, self.leaf_size)
+        self.tree_ids = ids[self.tree.order]
+        self.alive = np.ones(len(self.tree), dtype=bool)
+        self.position = dict(zip(self.tree_ids.tolist(), range(len(self.tree))))
+        self.dead = 0
+        self.pending = {}
+
+    def __len__(self):
+        return len(self.tree) - self.dead + len(self.pending)
+
+    def __contains__(self, pk):
+        return pk in self.position or pk in self.pending
+
+    def _discard(self, pk):
+        position = self.position.pop(pk, None)
+        if position is not None:
+            self.alive[position] = False
+            self.dead += 1
+        self.pending.pop(pk, None)
+
+    def upsert(self, pk, lat, lon):
+        """Add or move destination ``pk``; ``None`` coordinates remove it."""
+        point = None if lat is None or lon is None else to_unit_vectors([lat], [lon])[0]
+        position = self.position.get(pk)
+        if point is not None and position is not None and np.array_equal(point, self.tree.points[position]):
+            return  # unchanged; catching up sees rows again
+        self._discard(pk)
+        if point is not None:
+            self.pending[pk] = point
+        self._maybe_rebuild()
+
+    @property
+    def rebuild_threshold(self):
+        return max(self.min_rebuild, self.rebuild_fraction * len(self.tree))
+
+    def remove(self, pk):
+        self._discard(pk)
+        self._maybe_rebuild()
+
+    def _maybe_rebuild(self):
+        if self.dead + len(self.pending) > self.rebuild_threshold:
+            ids = np.concatenate([self.tree_ids[self.alive], np.fromiter(self.pending, dtype=np.int64)])
+            points = np.concatenate([self.tree.points[self.alive],
+                                     np.array(list(self.pending.values())).reshape(-1, 3)])
+            self._build(ids, points)
+
+    def query(self, lat, lon, k):
+        """``[(id, distance_km), ...]`` for the ``k`` nearest destinations, nearest first."""
+        point = to_unit_vectors([lat], [lon])[0]
+        positions, distances = self.tree.query(point, k, self.alive if self.dead else None)
+        ids = self.tree_ids[positions]
+        if self.pending:
+            pending = np.array(list(self.pending.values())) - point
+            ids = np.concatenate([ids, np.fromiter(self.pending, dtype=np.int64)])
+            distances = np.concatenate([distances, (pending * pending).sum(axis=1)])
+        nearest = np.lexsort((ids, distances))[:k]
+        return list(zip(ids[nearest].tolist(), chord_to_km(np.sqrt(distances[nearest])).tolist()))
+
+
+# Rows saved this long before the last catch-up are fetched again, for
+# clock differences between servers and transactions still in flight.
+SYNC_OVERLAP = timedelta(minutes=5)
+CHECK_INTERVAL = 30
+
+_lock = threading.Lock()
+_state = {'index': None, 'version': None, 'synced_at': None, 'fingerprint': None, 'checked_at': None}
+
+
+def _located():
+    return Destinations.objects.filter(latitude__isnull=False, longitude__isnull=False)
+
+
+def _fingerprint():
+    """The newest ``updated_at`` and the number of located rows, in one query."""
+    located = Q(latitude__isnull=False, longitude__isnull=False)
+    totals = Destinations.objects.aggregate(latest=Max('updated_at'), located=Count('pk', filter=located))
+    return totals['latest'], totals['located']
+
+
+def _full_build():
+    started = timezone.now()
+    _state['fingerprint'], _state['checked_at'] = _fingerprint(), time.monotonic()
+    rows = list(_located().values_list('id', 'latitude', 'longitude'))
+    ids, lat, lon = zip(*rows) if rows else ((), (), ())
+    _state['index'] = NearbyIndex(ids, lat, lon)
+    _state['synced_at'] = started
+
+
+def _catch_up():
+    started = timezone.now()
+    index = _state['index']
+    limit = int(index.rebuild_threshold) + 1
+    changed = list(Destinations.objects.filter(updated_at__gte=_state['synced_at'] - SYNC_OVERLAP)
+                   .values_list('id', 'latitude', 'longitude')[:limit])
+    if len(changed) == limit:
+        return _full_build()  # a bulk import: cheaper to start over
+    for pk, lat, lon in changed:
+        index.upsert(pk, lat, lon)
+    if _located().count() != len(index):
+        return _full_build()
+    _state['synced_at'] = started
+
+
+def nearest_destinations(lat, lon, k):
+    """``[(id, distance_km), ...]`` for the ``k`` destinations nearest to ``lat``/``lon``."""
+    version = get_catalog_version()
+    with _lock:
+        if _state['index'] is None:
+            _full_build()
+        elif version != _state['version']:
+            _catch_up()
+        elif time.monotonic() - _state['checked_at'] >= CHECK_INTERVAL:
+            fingerprint = _fingerprint()
+            _state['checked_at'] = time.monotonic()
+            if fingerprint != _state['fingerprint']:
+                _state['fingerprint'] = fingerprint
+                _catch_up()
+        _state['version'] = version
+        return _state['index'].query(lat, lon, k)
+
+
+def apply_change(pk, lat=None, lon=None, deleted=False):
+    """Bring this process's index up to date with a committed save or delete."""
+    with _lock:
+        index = _state['index']
+        if index is None:
+            return
+        if deleted:
+            index.remove(pk)
+        else:
+            index.upsert(pk, lat, lon)
+
+
+def reset():
+    """Forget the index; the next query rebuilds it."""
+    with _lock:
+        _state.update(index=None, version=None, synced_at=None, fingerprint=None, checked_at=None)
@@ -0,0 +1,239 @@
+"""
+Smaller encodings of the photos under ``static/``.
+
+The home page loads full-size JPEG/PNG backgrounds on every visit.
+``ImageOptimizer`` (run with ``manage.py optimize_images``) walks a static
+directory and, for each JPEG or PNG:
+
+* recompresses it in place: PNGs losslessly, JPEGs at a bounded quality,
+  keeping the result only if it is at least ``min_saving`` smaller,
+* writes WebP and, where Pillow supports it, AVIF versions next to it
+  (``images/news.jpg`` gets ``images/news.webp``), unless they come out no
+  smaller than the (recompressed) original,
+* records the file's content hash, sizes and variants in
+  ``image-variants.json`` at the root of the directory.
+
+A file whose hash and options match its manifest entry, and whose variants
+still exist, is skipped, so reruns only touch new or changed images.
+
+Templates use the manifest through ``{% picture %}`` and
+``{% background_image %}`` (``frtuna_static``). These offer each variant
+smaller than the original, with the original as the fallback.
+"""
+
+import functools
+import hashlib
+import json
+import os
+from io import BytesIO
+
+from django.conf import settings
+
+
+MANIFEST_NAME = 'image-variants.json'
+SOURCE_EXTENSIONS = {'.jpg': 'JPEG', '.jpeg': 'JPEG', '.png': 'PNG'}
+
+# format -> (Pillow format, MIME type, save options); best first.
+VARIANT_FORMATS = {
+    'avif': ('AVIF', 'image/avif', {'speed': 6}),
+    'webp': ('WEBP', 'image/webp', {'method': 6}),
+}
+
+
+def available_formats():
+    """The variant formats this Pillow build can write."""
+    from PIL import features
+
+    return [fmt for fmt in VARIANT_FORMATS if features.check(fmt)]
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ImageOptimizer:
+    """Recompress the images under ``root`` and keep its manifest current."""
+
+    def __init__(self, root, quality=82, formats=None, lossless_only=False,
+                 min_saving=0.1, dry_run=False):
+        self.root = str(root)
+        self.quality = quality
+        self.formats = available_formats() if formats is None else list(formats)
+        self.lossless_only = lossless_only
+        self.min_saving = min_saving
+        self.dry_run = dry_run
+        self.manifest_path = os.path.join(self.root, MANIFEST_NAME)
+        self.manifest = self.load_manifest()
+
+    @property
+    def options(self):
+        """What an entry was built with; changing any of it rebuilds the entry."""
+        return {'quality': self.quality, 'formats': self.formats, 'lossless_only': self.lossless_only}
+
+    def load_manifest(self):
+        try:
+            with open(self.manifest_path, encoding='utf-8') as handle:
+                return json.load(handle)
+        except FileNotFoundError:
+            return {}
+
+    def save_manifest(self):
+        with open(self.manifest_path, 'w', encoding='utf-8') as handle:
+            json.dump(self.manifest, handle, indent=2, sort_keys=True)
+            handle.write('\n')
+
+    def sources(self):
+        """Relative paths of the images to process, in a stable order."""
+        for directory, _, files in sorted(os.walk(self.root)):
+            for filename in sorted(files):
+                if os.path.splitext(filename)[1].lower() in SOURCE_EXTENSIONS:
+                    path = os.path.join(directory, filename)
+                    yield os.path.relpath(path, self.root).replace(os.sep, '/')
+
+    def is_current(self, name, digest):
+        entry = self.manifest.get(name)
+        return (
+            entry is not None
+            and entry['sha256'] == digest
+            and entry['options'] == self.options
+            and all(os.path.exists(os.path.join(self.root, variant['name'])) and variant['bytes'] < entry['bytes']
+                    for variant in entry['variants'].values())
+        )
+
+    def _variant_name(self, name, fmt):
+        variant = f'{os.path.splitext(name)[0]}.{fmt}'
+        # Never overwrite a file that is a source in its own right.
+        owner = next((source for source, entry in self.manifest.items()
+                      if entry['variants'].get(fmt, {}).get('name') == variant), None)
+        if owner not in (None, name) or (owner is None and os.path.exists(os.path.join(self.root, variant))):
+            return None
+        return variant
+
+    def _write(self, name, data):
+        if not self.dry_run:
+            with open(os.path.join(self.root, name), 'wb') as handle:
+                handle.write(data)
+
+    def _remove(self, name):
+        path = os.path.join(self.root, name)
+        if not self.dry_run and os.path.exists(path):
+            os.remove(path)
+
+    def _recompress(self, image, pil_format, original):
+        """Return smaller bytes for the original, or ``None`` to keep it."""
+        buffer = BytesIO()
+        if pil_format == 'PNG':
+            image.save(buffer, 'PNG', optimize=True)
+        elif self.lossless_only:
+            return None
+        else:
+            options = {'quality': self.quality, 'optimize': True, 'progressive': True}
+            if image.info.get('icc_profile'):
+                options['icc_profile'] = image.info['icc_profile']
+            image.save(buffer, 'JPEG', **options)
+        data = buffer.getvalue()
+        return data if len(data) <= len(original) * (1 - self.min_saving) else None
+
+    def optimize(self, name):
+        """
+        Bring ``name``'s manifest entry up to date. Returns the entry and
+        whether anything was done.
+        """
+        from PIL import Image, ImageOps
+
+        path = os.path.join(self.root, name)
+        digest = file_digest(path)
+        if self.is_current(name, digest):
+            return self.manifest[name], False
+
+        with open(path, 'rb') as handle:
+            original = handle.read()
+        pil_format = SOURCE_EXTENSIONS[os.path.splitext(name)[1].lower()]
+        image = Image.open(BytesIO(original))
+        image.load()
+        image = ImageOps.exif_transpose(image)
+        if pil_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+
+        current = original
+        recompressed = self._recompress(image, pil_format, original)
+        if recompressed is not None:
+            self._write(name, recompressed)
+            current = recompressed
+
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+        variants = {}
+        for fmt in self.formats:
+            variant = self._variant_name(name, fmt)
+            if variant is None:
+                continue
+            pil_variant, _, options = VARIANT_FORMATS[fmt]
+            buffer = BytesIO()
+            image.save(buffer, pil_variant, quality=self.quality, **options)
+            if len(buffer.getvalue()) >= len(current):
+                # Small or already well-compressed originals: serving the
+                # variant would cost bytes. Drop one an earlier run wrote.
+                self._remove(variant)
+                continue
+            self._write(variant, buffer.getvalue())
+            variants[fmt] = {'name': variant, 'bytes': len(buffer.getvalue())}
+
+        entry = {
+            'sha256': hashlib.sha256(current).hexdigest(),
+            'options': self.options,
+            'original_bytes': self.manifest.get(name, {}).get('original_bytes', len(original)),
+            'bytes': len(current),
+            'width': image.width,
+            'height': image.height,
+            'variants': variants,
+        }
+        self.manifest[name] = entry
+        return entry, True
+
+    def run(self):
+        """Optimize every source, yielding ``(name, entry, changed)``."""
+        seen = set()
+        for name in self.sources():
+            seen.add(name)
+            entry, changed = self.optimize(name)
+            yield name, entry, changed
+        # Forget images that were deleted, along with their variants.
+        for name in set(self.manifest) - seen:
+            for variant in self.manifest.pop(name)['variants'].values():
+                self._remove(variant['name'])
+        if not self.dry_run:
+            self.save_manifest()
+
+
+@functools.lru_cache(maxsize=None)
+def load_variants():
+    """The merged manifests of every ``STATICFILES_DIRS`` entry."""
+    manifest = {}
+    for directory in getattr(settings, 'STATICFILES_DIRS', []):
+        if isinstance(directory, (list, tuple)):
+            continue  # prefixed directories are not used by this project
+        path = os.path.join(directory, MANIFEST_NAME)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as handle:
+                manifest.update(json.load(handle))
+    return manifest
+
+
+def image_variants(name):
+    """
+    ``[(mime_type, static path), ...]`` for the variants of static image
+    ``name`` that are smaller than it, best format first.
+    """
+    entry = load_variants().get(name)
+    if entry is None:
+        return []
+    return [
+        (VARIANT_FORMATS[fmt][1], entry['variants'][fmt]['name'])
+        for fmt in VARIANT_FORMATS
+        if fmt in entry['variants'] and entry['variants'][fmt]['bytes'] < entry['bytes']
+    ]
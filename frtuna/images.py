@@ -0,0 +1,197 @@
+"""
+Concurrent, deduplicating upload pipeline for destination images.
+
+Uploading one image at a time makes an import wait on the storage backend's
+round-trip latency once per row. ``ImagePipeline`` instead:
+
+1. hashes every source on a bounded thread pool,
+2. names each image after its content hash, so identical bytes (a shared
+   placeholder, say) map to one stored file that is uploaded only once, and
+   files already in storage from a previous run are not sent again. The
+   name the storage returned is recorded in ``StoredFile``, because
+   Cloudinary suffixes every upload and never has a file under the
+   content-addressed name itself,
+3. uploads the remaining unique images on the same pool, retrying failed
+   saves with exponential backoff.
+
+Storage is any Django ``Storage``; it defaults to the one configured for
+``Destinations.img``.
+"""
+
+import hashlib
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.base import ContentFile, File
+
+from .models import Destinations, StoredFile
+
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+LOOKUP_BATCH_SIZE = 1000
+
+
+class ImageUploadError(Exception):
+    """Raised when an image could not be stored after all retries."""
+
+
+def content_name(digest, filename, upload_to='pics'):
+    """Return the content-addressed storage name for an image."""
+    ext = os.path.splitext(filename)[1].lower() or '.bin'
+    return f'{upload_to}/{digest[:32]}{ext}'
+
+
+def storage_label(storage):
+    """Identify ``storage`` in ``StoredFile`` rows."""
+    return f'{type(storage).__module__}.{type(storage).__qualname__}'
+
+
+def stored_names(storage, keys):
+    """Map each of ``keys`` saved to ``storage`` before to the name it was stored as."""
+    keys, label, names = list(keys), storage_label(storage), {}
+    for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+        rows = StoredFile.objects.filter(storage=label, key__in=keys[start:start + LOOKUP_BATCH_SIZE])
+        names.update(rows.values_list('key', 'name'))
+    return names
+
+
+def record_stored(storage, names):
+    """Remember the names ``storage`` gave newly saved files, ``{key: name}``."""
+    label = storage_label(storage)
+    StoredFile.objects.bulk_create(
+        [StoredFile(storage=label, key=key, name=name) for key, name in names.items()],
+        update_conflicts=True, unique_fields=['storage', 'key'], update_fields=['name'],
+        batch_size=LOOKUP_BATCH_SIZE,
+    )
+
+
+def _open(source):
+    if isinstance(source, (bytes, bytearray)):
+        return ContentFile(bytes(source))
+    return File(open(source, 'rb'))
+
+
+def hash_source(source):
+    """Return the SHA-256 hex digest of a path or bytes, reading in chunks."""
+    digest = hashlib.sha256()
+    with _open(source) as handle:
+        for chunk in handle.chunks(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PipelineStats:
+    """Counts of what a pipeline has done, safe to update from workers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.uploaded = 0
+        self.existing = 0
+        self.deduplicated = 0
+        self.retries = 0
+
+    def add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+
+class ImagePipeline:
+    """Upload many images concurrently; see the module docstring."""
+
+    def __init__(self, storage=None, max_workers=8, retries=3, backoff=0.5,
+                 upload_to=None, sleep=time.sleep):
+        field = Destinations._meta.get_field('img')
+        self.storage = storage or field.storage
+        self.upload_to = upload_to or field.upload_to
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.sleep = sleep
+        self.stats = PipelineStats()
+
+    def _save(self, name, source, recorded=None):
+        """
+        Store ``source`` under ``name`` unless it is already there, as
+        ``recorded`` if an earlier run stored it under that name.
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                existing = recorded or name
+                if self.storage.exists(existing):
+                    self.stats.add(existing=1)
+                    return existing
+                with _open(source) as content:
+                    stored = self.storage.save(name, content)
+                self.stats.add(uploaded=1)
+                return stored
+            except Exception as exc:
+                if attempt == self.retries:
+                    raise ImageUploadError(f'could not store {name}: {exc}') from exc
+                self.stats.add(retries=1)
+                delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+                logger.warning('Retrying %s in %.2fs after: %s', name, delay, exc)
+                self.sleep(delay)
+
+    def ingest(self, items):
+        """
+        Store every ``(source, filename)`` pair and return the storage names
+        in the same order. ``source`` is a filesystem path or raw bytes;
+        ``filename`` only supplies the extension.
+        """
+        items = list(items)
+        if not items:
+            return []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            digests = list(pool.map(hash_source, [source for source, _ in items]))
+
+            names = [content_name(digest, filename, self.upload_to)
+                     for digest, (_, filename) in zip(digests, items)]
+            unique = {}
+            for name, (source, _) in zip(names, items):
+                unique.setdefault(name, source)
+            self.stats.add(deduplicated=len(items) - len(unique))
+
+            # StoredFile is read and written here, not on the workers, which
+            # would each open a database connection.
+            recorded = stored_names(self.storage, unique)
+            futures = {name: pool.submit(self._save, name, source, recorded.get(name))
+                       for name, source in unique.items()}
+            stored, error = {}, None
+            for name, future in futures.items():
+                try:
+                    stored[name] = future.result()
+                except ImageUploadError as exc:
+                    error = error or exc
+
+        # Record what did upload even if something failed, so a rerun skips it.
+        record_stored(self.storage, {name: stored[name] for name in stored if stored[name] != recorded.get(name)})
+        if error is not None:
+            raise error
+        return [stored[name] for name in names]
+
+
+def upload_row_images(rows, root, pipeline):
+    """
+    Replace each row's ``img`` that names a file under ``root`` with the
+    name the pipeline stored it as. Rows whose image is not a local file
+    are assumed to reference storage already and are left alone.
+    """
+    root = os.path.realpath(root)
+    pending = []
+    for row in rows:
+        if row['img']:
+            path = os.path.realpath(os.path.join(root, row['img']))
+            if os.path.commonpath([root, path]) == root and os.path.isfile(path):
+                pending.append((row, path))
+
+    names = pipeline.ingest((path, path) for _, path in pending)
+    for (row, _), name in zip(pending, names):
+        row['img'] = name
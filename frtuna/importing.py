@@ -0,0 +1,255 @@
+"""
+Streaming readers and batched upserts for bulk destination imports.
+
+Readers yield one record at a time so memory use stays flat regardless of
+input size. ``upsert_batch`` turns a batch of records into one lookup of
+existing names plus one ``bulk_create(update_conflicts=True)``, instead of
+an ``exists()`` query and an ``INSERT`` per row.
+"""
+
+import csv
+import json
+import time
+
+from django.db import transaction
+
+from .cache import bump_catalog_version, invalidate_destination
+from .models import Destinations, SimilarDestination, assign_slugs
+
+
+CHUNK_SIZE = 64 * 1024
+UPDATE_FIELDS = ['desc', 'price', 'offer', 'img', 'latitude', 'longitude', 'updated_at']
+TRUE_VALUES = {'1', 'true', 't', 'yes', 'y', 'on'}
+FALSE_VALUES = {'', '0', 'false', 'f', 'no', 'n', 'off'}
+
+
+class InvalidRecord(ValueError):
+    """Raised for an input record that cannot become a destination."""
+
+
+def iter_json(stream, chunk_size=CHUNK_SIZE):
+    """
+    Yield the objects of a JSON array (or of concatenated JSON objects)
+    from ``stream`` without loading the whole document.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    started = False
+    while True:
+        buffer = buffer.lstrip()
+        if not started and buffer:
+            started = True
+            if buffer[0] == '[':
+                buffer = buffer[1:]
+        buffer = buffer.lstrip(' \t\r\n,')
+        if buffer.startswith(']'):
+            return
+
+        if buffer:
+            try:
+                obj, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError as exc:
+                error = exc  # most likely the object continues in the next chunk
+            else:
+                yield obj
+                buffer = buffer[end:]
+                continue
+
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            if buffer:
+                raise InvalidRecord(f'truncated or malformed JSON: {error}')
+            return
+        buffer += chunk
+
+
+def iter_jsonl(stream):
+    """Yield one object per non-blank line of ``stream``."""
+    for lineno, line in enumerate(stream, 1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise InvalidRecord(f'line {lineno}: {exc}')
+
+
+def iter_csv(stream):
+    """Yield a dict per CSV row, keyed by the header row."""
+    yield from csv.DictReader(stream)
+
+
+READERS = {
+    'json': iter_json,
+    'jsonl': iter_jsonl,
+    'csv': iter_csv,
+}
+
+
+def _parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise InvalidRecord(f'offer must be a boolean, got {value!r}')
+
+
+def _parse_coordinate(name, record, field, limit):
+    value = record.get(field)
+    if value is None or value == '':
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise InvalidRecord(f'{name}: {field} must be a number')
+    if not -limit <= value <= limit:
+        raise InvalidRecord(f'{name}: {field} must be within [-{limit}, {limit}]')
+    return value
+
+
+def normalize(record):
+    """
+    Turn a raw record into keyword arguments for ``Destinations``.
+
+    Django fixture entries (``{"model": ..., "fields": {...}}``) are unwrapped
+    so ``destinations.json`` can be imported as-is. Fixture primary keys are
+    ignored: rows are matched on ``name``.
+    """
+    if not isinstance(record, dict):
+        raise InvalidRecord(f'expected an object, got {type(record).__name__}')
+    if isinstance(record.get('fields'), dict):
+        record = record['fields']
+
+    name = str(record.get('name') or '').strip()
+    if not name:
+        raise InvalidRecord('name is required')
+    if len(name) > Destinations._meta.get_field('name').max_length:
+        raise InvalidRecord(f'name too long: {name!r}')
+    try:
+        price = int(record.get('price'))
+    except (TypeError, ValueError):
+        raise InvalidRecord(f'{name}: price must be an integer')
+    latitude = _parse_coordinate(name, record, 'latitude', 90)
+    longitude = _parse_coordinate(name, record, 'longitude', 180)
+    if (latitude is None) != (longitude is None):
+        raise InvalidRecord(f'{name}: latitude and longitude go together')
+
+    return {
+        'name': name,
+        'desc': str(record.get('desc') or ''),
+        'price': price,
+        'offer': _parse_bool(record.get('offer', False)),
+        'img': str(record.get('img') or ''),
+        'latitude': latitude,
+        'longitude': longitude,
+    }
+
+
+def upsert_batch(rows):
+    """
+    Insert or update ``rows`` (normalized dicts) in three queries.
+
+    Existing rows are found with a single ``name__in`` lookup and given their
+    primary key and slug, new rows get slugs in one more query, and
+    ``bulk_create`` updates on the primary-key conflict and inserts the
+    rest. Re-imported rows cost one more query, for the pages that list
+    them. Returns ``(created, updated)``.
+
+    The cached detail pages of the batch, and of the pages whose "similar
+    destinations" strip lists an updated row, are dropped like
+    ``frtuna.signals`` does for a single save: ``bulk_create`` sends no
+    ``post_save``.
+    """
+    by_name = {row['name']: row for row in rows}  # last occurrence wins
+    existing = {
+        name: (pk, slug)
+        for name, pk, slug in Destinations.objects.filter(name__in=list(by_name)).values_list('name', 'id', 'slug')
+    }
+    objs = []
+    for name, row in by_name.items():
+        pk, slug = existing.get(name, (None, ''))
+        objs.append(Destinations(id=pk, slug=slug, **row))
+    assign_slugs(objs)  # bulk_create skips the pre_save signal that does this
+    Destinations.objects.bulk_create(
+        objs,
+        update_conflicts=True,
+        unique_fields=['id'],
+        update_fields=UPDATE_FIELDS,
+    )
+    slugs = [obj.slug for obj in objs]
+    if existing:
+        pks = [pk for pk, _ in existing.values()]
+        slugs += SimilarDestination.objects.filter(target_id__in=pks).values_list('source__slug', flat=True)
+    invalidate_destination(*slugs)
+    # Again on commit: a request may cache the old row before this batch commits.
+    transaction.on_commit(lambda: invalidate_destination(*slugs))
+    updated = len(existing)
+    return len(objs) - updated, updated
+
+
+class ImportStats:
+    """Running totals for an import, with a rows/sec rate."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.created = 0
+        self.updated = 0
+        self.skipped = 0
+
+    @property
+    def rows(self):
+        return self.created + self.updated
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rate(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+def import_records(records, batch_size=1000, on_batch=None, on_skip=None, prepare=None):
+    """
+    Upsert an iterable of raw ``records`` in batches of ``batch_size``.
+
+    ``prepare(rows)`` may rewrite a batch of normalized rows before it is
+    written (e.g. to upload their images), ``on_batch(stats)`` runs after
+    each committed batch and ``on_skip(error)`` for each record that fails
+    validation. The catalog
+    version is bumped once at the end, since ``bulk_create`` does not
+    send ``post_save``; detail pages are dropped per batch by ``upsert_batch``.
+    """
+    stats = ImportStats()
+    batch = []
+
+    def flush():
+        if prepare:
+            prepare(batch)
+        with transaction.atomic():
+            created, updated = upsert_batch(batch)
+        stats.created += created
+        stats.updated += updated
+        batch.clear()
+        if on_batch:
+            on_batch(stats)
+
+    try:
+        for record in records:
+            try:
+                batch.append(normalize(record))
+            except InvalidRecord as exc:
+                stats.skipped += 1
+                if on_skip:
+                    on_skip(exc)
+                continue
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+    finally:
+        if stats.rows:
+            bump_catalog_version()
+    return stats
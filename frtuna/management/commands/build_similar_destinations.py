@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from frtuna.similarity import BATCH_SIZE, DEFAULT_K, update_neighbours
+
+
+class Command(BaseCommand):
+    help = (
+        'Store each destination\'s most similar destinations by description '
+        '(TF-IDF cosine similarity) for the "You might also like" strip. Only '
+        'destinations changed since the last run, and lists they affect, are '
+        'recomputed; run it after imports or from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--k', type=int, default=DEFAULT_K,
+            help=f'Neighbours per destination (default: {DEFAULT_K}). Changing it needs --full.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help=f'Destinations scored against the catalog at once (default: {BATCH_SIZE}).',
+        )
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Recompute every destination, not just the changed ones.',
+        )
+
+    def handle(self, *args, **options):
+        if options['k'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--k and --batch-size must be positive.')
+        started = time.perf_counter()
+        recomputed, total = update_neighbours(options['k'], options['batch_size'], options['full'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Recomputed similar destinations for {recomputed} of {total} destinations in {elapsed:.2f} s.'
+        ))
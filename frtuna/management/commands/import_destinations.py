@@ -0,0 +1,98 @@
+import os
+import sys
+from functools import partial
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from frtuna.images import ImagePipeline, ImageUploadError, upload_row_images
+from frtuna.importing import READERS, InvalidRecord, import_records
+
+
+SUFFIX_FORMATS = {
+    '.json': 'json',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.csv': 'csv',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Stream destinations from a JSON, JSONL or CSV file (or "-" for stdin) '
+        'and upsert them by name in batches. Accepts the destinations.json '
+        'fixture format.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Input file, or "-" to read from stdin.')
+        parser.add_argument(
+            '--format', choices=sorted(READERS),
+            help='Input format. Defaults to the file extension.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Rows per lookup/upsert round trip (default: 1000).',
+        )
+        parser.add_argument(
+            '--images',
+            help='Directory holding image files. A record whose "img" names a '
+                 'file in it has that file uploaded, deduplicated by content.',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=8,
+            help='Concurrent image uploads (default: 8).',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or SUFFIX_FORMATS.get(Path(path).suffix.lower())
+        if fmt is None:
+            raise CommandError('Cannot tell the input format; pass --format.')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+        if options['workers'] < 1:
+            raise CommandError('--workers must be positive.')
+
+        pipeline = prepare = None
+        if options['images']:
+            if not os.path.isdir(options['images']):
+                raise CommandError(f'{options["images"]} is not a directory.')
+            pipeline = ImagePipeline(max_workers=options['workers'])
+            prepare = partial(upload_row_images, root=options['images'], pipeline=pipeline)
+
+        def on_batch(stats):
+            if options['verbosity'] >= 2:
+                self.stdout.write(f'{stats.rows} rows ({stats.rate:,.0f} rows/sec)')
+
+        def on_skip(error):
+            self.stderr.write(f'Skipped record: {error}')
+
+        try:
+            if path == '-':
+                stats = self._import(sys.stdin, fmt, options['batch_size'], on_batch, on_skip, prepare)
+            else:
+                with open(path, newline='', encoding='utf-8') as stream:
+                    stats = self._import(stream, fmt, options['batch_size'], on_batch, on_skip, prepare)
+        except OSError as exc:
+            raise CommandError(exc)
+        except (InvalidRecord, ImageUploadError) as exc:
+            raise CommandError(f'Import aborted: {exc}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {stats.rows} destinations ({stats.created} created, '
+            f'{stats.updated} updated, {stats.skipped} skipped) in '
+            f'{stats.elapsed:.2f}s, {stats.rate:,.0f} rows/sec.'
+        ))
+        if pipeline:
+            images = pipeline.stats
+            self.stdout.write(
+                f'Images: {images.uploaded} uploaded, {images.existing} already stored, '
+                f'{images.deduplicated} duplicates skipped, {images.retries} retries.'
+            )
+
+    def _import(self, stream, fmt, batch_size, on_batch, on_skip, prepare):
+        return import_records(
+            READERS[fmt](stream), batch_size=batch_size,
+            on_batch=on_batch, on_skip=on_skip, prepare=prepare,
+        )
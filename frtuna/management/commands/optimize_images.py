@@ -0,0 +1,89 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from frtuna.image_variants import VARIANT_FORMATS, ImageOptimizer, available_formats, load_variants
+
+
+def _kb(size):
+    return f'{size / 1024:8.1f} KB'
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompress the JPEG/PNG images in static directories, write WebP '
+        '(and AVIF, where Pillow supports it) variants next to them, and '
+        'record them in image-variants.json for {% picture %} and '
+        '{% background_image %}. Unchanged images are skipped.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'directories', nargs='*',
+            help='Static roots to process (default: STATICFILES_DIRS).',
+        )
+        parser.add_argument(
+            '--quality', type=int, default=82,
+            help='Quality for recompressed JPEGs and for variants (default: 82).',
+        )
+        parser.add_argument(
+            '--formats', nargs='+', choices=sorted(VARIANT_FORMATS),
+            help='Variant formats to write (default: every one Pillow supports).',
+        )
+        parser.add_argument(
+            '--lossless-only', action='store_true',
+            help='Leave JPEGs as they are; only PNGs are recompressed.',
+        )
+        parser.add_argument(
+            '--min-saving', type=float, default=0.1,
+            help='Keep a recompressed original only if it is this fraction smaller (default: 0.1).',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Report what would be saved without writing anything.',
+        )
+
+    def handle(self, *args, **options):
+        if not 1 <= options['quality'] <= 100:
+            raise CommandError('--quality must be between 1 and 100.')
+        formats = options['formats']
+        if formats is not None:
+            missing = set(formats) - set(available_formats())
+            if missing:
+                raise CommandError(f'This Pillow build cannot write {", ".join(sorted(missing))}.')
+
+        directories = options['directories'] or [d for d in settings.STATICFILES_DIRS if isinstance(d, str)]
+        for directory in directories:
+            if not os.path.isdir(directory):
+                raise CommandError(f'{directory} is not a directory.')
+
+        for directory in directories:
+            optimizer = ImageOptimizer(
+                directory, quality=options['quality'], formats=formats,
+                lossless_only=options['lossless_only'], min_saving=options['min_saving'],
+                dry_run=options['dry_run'],
+            )
+            self.stdout.write(f'{directory} ({", ".join(optimizer.formats) or "no variant formats"})')
+            before = after = best = processed = skipped = 0
+            for name, entry, changed in optimizer.run():
+                smallest = min([entry['bytes']] + [v['bytes'] for v in entry['variants'].values()])
+                before += entry['original_bytes']
+                after += entry['bytes']
+                best += smallest
+                if not changed:
+                    skipped += 1
+                    continue
+                processed += 1
+                variants = '  '.join(f'{fmt} {_kb(v["bytes"])}' for fmt, v in entry['variants'].items())
+                self.stdout.write(
+                    f'  {name:<40} {_kb(entry["original_bytes"])} -> {_kb(entry["bytes"])}  {variants}  '
+                    f'saves {1 - smallest / entry["original_bytes"]:4.0%}'
+                )
+
+            if before:
+                self.stdout.write(self.style.SUCCESS(
+                    f'  {processed} optimized, {skipped} unchanged. Originals {_kb(before)} -> {_kb(after)}, '
+                    f'smallest formats {_kb(best)} ({1 - best / before:.0%} saved).'
+                ))
+        load_variants.cache_clear()
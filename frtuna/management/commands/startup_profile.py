@@ -0,0 +1,89 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def parse_importtime(output):
+    """
+    Parse ``python -X importtime`` output into ``(module, self_us,
+    cumulative_us)`` tuples, in the order the imports finished.
+    """
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        imports.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return imports
+
+
+class Command(BaseCommand):
+    help = (
+        'Run another management command in a fresh interpreter with '
+        '"python -X importtime" and report its start-up time and what its '
+        'imports cost, grouped by top-level package.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'target', nargs='*', default=['check'],
+            help='The command to profile, with its arguments (default: check). '
+                 'Put "--" before it if it has options of its own.',
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=3,
+            help='Runs to time; the median wall time is reported (default: 3).',
+        )
+        parser.add_argument(
+            '--limit', type=int, default=15,
+            help='Rows in each table (default: 15).',
+        )
+
+    def run_target(self, target):
+        manage = os.path.join(settings.BASE_DIR, 'manage.py')
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', manage, *target],
+            capture_output=True, text=True, cwd=settings.BASE_DIR,
+        )
+        elapsed = time.perf_counter() - started
+        if result.returncode:
+            raise CommandError(
+                f'"manage.py {" ".join(target)}" exited with status {result.returncode}:\n'
+                + '\n'.join(line for line in result.stderr.splitlines()
+                            if not line.startswith('import time:'))
+            )
+        return elapsed, parse_importtime(result.stderr)
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat must be positive.')
+        target = options['target']
+        runs = [self.run_target(target) for _ in range(options['repeat'])]
+        wall = statistics.median(elapsed for elapsed, _ in runs)
+        imports = runs[-1][1]
+
+        packages = defaultdict(int)
+        for module, self_us, _ in imports:
+            packages[module.split('.')[0]] += self_us
+        total_us = sum(packages.values())
+        limit = options['limit']
+
+        self.stdout.write(f'manage.py {" ".join(target)}: {wall * 1000:.0f} ms wall (median of {len(runs)}), '
+                          f'{total_us / 1000:.0f} ms in {len(imports)} imports\n')
+
+        self.stdout.write('Top-level packages by import time:')
+        for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:limit]:
+            self.stdout.write(f'  {self_us / 1000:8.1f} ms  {self_us / total_us:6.1%}  {package}')
+
+        self.stdout.write('\nSlowest imports, including what they import:')
+        for module, _, cumulative_us in sorted(imports, key=lambda item: -item[2])[:limit]:
+            self.stdout.write(f'  {cumulative_us / 1000:8.1f} ms  {module}')
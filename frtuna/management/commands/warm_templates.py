@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from frtuna.template_cache import warm_templates
+
+
+class Command(BaseCommand):
+    help = (
+        'Parse and compile every template the configured loaders can find, '
+        'failing if any does not compile. gunicorn.conf.py does the same in '
+        'the master process so workers start with compiled templates.'
+    )
+
+    def handle(self, *args, **options):
+        count, seconds, errors = warm_templates()
+        for name, exc in errors.items():
+            self.stderr.write(f'{name}: {exc}')
+        if errors:
+            raise CommandError(f'{len(errors)} template(s) failed to compile.')
+        self.stdout.write(self.style.SUCCESS(f'Compiled {count} templates in {seconds * 1000:.0f} ms.'))
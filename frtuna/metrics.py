@@ -0,0 +1,244 @@
+"""
+Per-request cost breakdown: database queries, template rendering and
+storage URL resolution.
+
+``frtuna.middleware.RequestMetricsMiddleware`` samples a fraction of
+requests (``METRICS_SAMPLE_RATE``). For a sampled request it opens a
+``RequestTimings`` in a context variable; three hooks add to it while the
+request runs:
+
+* ``CursorWrapper`` counts and times every query. It is hooked at the
+  class rather than per connection because, under ASGI, the async ORM runs
+  queries on ``sync_to_async`` threads with their own connections; the
+  context variable follows the request there,
+* the Django template backend's ``Template.render`` times each top-level
+  render (nested ``{% include %}`` renders are part of their parent),
+* the default storage's ``url()`` times image URL building, which is
+  not free for Cloudinary.
+
+Unsampled requests leave the context variable empty, so the hooks cost
+one lookup. Totals are kept per view in ``registry`` and exposed in the
+Prometheus text format by ``frtuna.views.metrics``.
+"""
+
+import contextvars
+import random
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.files.storage import storages
+from django.db.backends.utils import CursorWrapper
+from django.template.backends.django import Template
+
+from accounts.throttling import stats as login_stats
+
+from .cache import stats as cache_stats
+
+
+# Buckets of the request duration histogram, in seconds.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_current = contextvars.ContextVar('frtuna_request_timings', default=None)
+
+
+class RequestTimings:
+    """Costs accumulated by one sampled request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.template_seconds = 0.0
+        self.storage_url_calls = 0
+        self.storage_url_seconds = 0.0
+        self._template_depth = 0
+
+    def server_timing(self, total):
+        """The ``Server-Timing`` header value for these timings."""
+        return ', '.join([
+            f'db;dur={self.db_seconds * 1000:.2f};desc="{self.db_queries} queries"',
+            f'tpl;dur={self.template_seconds * 1000:.2f}',
+            f'url;dur={self.storage_url_seconds * 1000:.2f};desc="{self.storage_url_calls} urls"',
+            f'total;dur={total * 1000:.2f}',
+        ])
+
+
+class MetricsRegistry:
+    """Thread-safe, per-process totals of sampled requests, keyed by view."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def record(self, view, timings, total):
+        with self._lock:
+            totals = self._views.get(view)
+            if totals is None:
+                totals = self._views[view] = {
+                    'requests': 0, 'seconds': 0.0, 'db_queries': 0, 'db_seconds': 0.0,
+                    'template_seconds': 0.0, 'storage_url_calls': 0, 'storage_url_seconds': 0.0,
+                    'buckets': [0] * len(DURATION_BUCKETS),
+                }
+            totals['requests'] += 1
+            totals['seconds'] += total
+            totals['db_queries'] += timings.db_queries
+            totals['db_seconds'] += timings.db_seconds
+            totals['template_seconds'] += timings.template_seconds
+            totals['storage_url_calls'] += timings.storage_url_calls
+            totals['storage_url_seconds'] += timings.storage_url_seconds
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if total <= bound:
+                    totals['buckets'][i] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {view: {k: list(v) if isinstance(v, list) else v for k, v in totals.items()}
+                    for view, totals in self._views.items()}
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+registry = MetricsRegistry()
+
+
+def sample_rate():
+    return getattr(settings, 'METRICS_SAMPLE_RATE', 1.0)
+
+
+def should_sample():
+    rate = sample_rate()
+    return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+def start():
+    """Begin collecting timings for the current request."""
+    _instrument_storage(storages['default'])
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def finish(token):
+    _current.reset(token)
+
+
+def current():
+    """The timings of the request being sampled in this context, if any."""
+    return _current.get()
+
+
+def _timed_execute(execute):
+    @wraps(execute)
+    def wrapper(self, sql, params, many, executor):
+        timings = _current.get()
+        if timings is None:
+            return execute(self, sql, params, many, executor)
+        started = time.perf_counter()
+        try:
+            return execute(self, sql, params, many, executor)
+        finally:
+            timings.db_seconds += time.perf_counter() - started
+            timings.db_queries += 1
+
+    wrapper._frtuna_timed = True
+    return wrapper
+
+
+def _timed_render(render):
+    @wraps(render)
+    def wrapper(self, *args, **kwargs):
+        timings = _current.get()
+        if timings is None:
+            return render(self, *args, **kwargs)
+        timings._template_depth += 1
+        started = time.perf_counter()
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            timings._template_depth -= 1
+            if not timings._template_depth:
+                timings.template_seconds += time.perf_counter() - started
+
+    wrapper._frtuna_timed = True
+    return wrapper
+
+
+def _instrument_storage(storage):
+    url = storage.url
+    if getattr(url, '_frtuna_timed', False):
+        return
+
+    @wraps(url)
+    def timed_url(name):
+        timings = _current.get()
+        if timings is None:
+            return url(name)
+        started = time.perf_counter()
+        try:
+            return url(name)
+        finally:
+            timings.storage_url_seconds += time.perf_counter() - started
+            timings.storage_url_calls += 1
+
+    timed_url._frtuna_timed = True
+    storage.url = timed_url
+
+
+def install():
+    """Hook template rendering and query execution; safe to call more than once."""
+    if not getattr(Template.render, '_frtuna_timed', False):
+        Template.render = _timed_render(Template.render)
+    if not getattr(CursorWrapper._execute_with_wrappers, '_frtuna_timed', False):
+        CursorWrapper._execute_with_wrappers = _timed_execute(CursorWrapper._execute_with_wrappers)
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{k}="{v}"' for k, v in labels.items()) + '}'
+
+
+def prometheus_text():
+    """All metrics in the Prometheus text exposition format."""
+    views = registry.snapshot()
+    lines = []
+
+    def family(name, kind, help_text, samples):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        lines.extend(f'{name}{labels} {value}' for labels, value in samples)
+
+    def per_view(key):
+        return [(_labels(view=view), totals[key]) for view, totals in sorted(views.items())]
+
+    family('frtuna_sampled_requests_total', 'counter', 'Requests sampled for metrics.', per_view('requests'))
+    family('frtuna_db_queries_total', 'counter', 'SQL queries run by sampled requests.', per_view('db_queries'))
+    family('frtuna_db_seconds_total', 'counter', 'Time spent in SQL by sampled requests.', per_view('db_seconds'))
+    family('frtuna_template_seconds_total', 'counter', 'Time spent rendering templates.',
+           per_view('template_seconds'))
+    family('frtuna_storage_url_calls_total', 'counter', 'Storage URLs built by sampled requests.',
+           per_view('storage_url_calls'))
+    family('frtuna_storage_url_seconds_total', 'counter', 'Time spent building storage URLs.',
+           per_view('storage_url_seconds'))
+
+    lines.append('# HELP frtuna_request_duration_seconds Duration of sampled requests.')
+    lines.append('# TYPE frtuna_request_duration_seconds histogram')
+    for view, totals in sorted(views.items()):
+        for bound, count in zip(DURATION_BUCKETS, totals['buckets']):
+            lines.append(f'frtuna_request_duration_seconds_bucket{_labels(view=view, le=bound)} {count}')
+        lines.append(f'frtuna_request_duration_seconds_bucket{_labels(view=view, le="+Inf")} '
+                     f'{totals["requests"]}')
+        lines.append(f'frtuna_request_duration_seconds_sum{_labels(view=view)} {totals["seconds"]}')
+        lines.append(f'frtuna_request_duration_seconds_count{_labels(view=view)} {totals["requests"]}')
+
+    layers = sorted(cache_stats.snapshot().items())
+    family('frtuna_cache_hits_total', 'counter', 'Catalog cache hits.',
+           [(_labels(layer=layer), counts['hits']) for layer, counts in layers])
+    family('frtuna_cache_misses_total', 'counter', 'Catalog cache misses.',
+           [(_labels(layer=layer), counts['misses']) for layer, counts in layers])
+    family('frtuna_login_attempts_total', 'counter', 'Login attempts by throttling outcome.',
+           [(_labels(outcome=outcome), count) for outcome, count in login_stats.snapshot().items()])
+    family('frtuna_metrics_sample_rate', 'gauge', 'Fraction of requests sampled.',
+           [('', sample_rate())])
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,89 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from . import metrics
+
+
+class RequestMetricsMiddleware:
+    """
+    Record query, template and storage URL costs for a sample of requests
+    and report them in a ``Server-Timing`` header (see ``frtuna.metrics``).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        metrics.install()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not metrics.should_sample():
+            return self.get_response(request)
+
+        timings, token = metrics.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.finish(token)
+        return self._report(request, response, timings)
+
+    async def __acall__(self, request):
+        if not metrics.should_sample():
+            return await self.get_response(request)
+
+        timings, token = metrics.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.finish(token)
+        return self._report(request, response, timings)
+
+    @staticmethod
+    def _report(request, response, timings):
+        total = time.perf_counter() - timings.started
+        match = request.resolver_match
+        metrics.registry.record(match.view_name if match else 'unresolved', timings, total)
+        response['Server-Timing'] = timings.server_timing(total)
+        return response
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise that can also run in an async middleware chain.
+
+    A sync-only middleware makes Django run it, and everything below it
+    that it waits on, in one shared thread under ASGI, which would
+    serialise every request. Only actual static files take a thread hop
+    here.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.2 on 2026-10-18 08:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frtuna', '0002_destinations_price'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='destinations',
+            index=models.Index(fields=['price', 'id'], name='frtuna_dest_price_id_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.1.2 on 2026-10-18 08:41
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# PostgreSQL only: keep search_vector in sync with a trigger (which also
+# covers bulk_create and raw SQL writes) and index it with GIN. Other
+# databases keep the column empty and use frtuna.search.InvertedIndex.
+POSTGRES_FORWARD = [
+    """
+    CREATE OR REPLACE FUNCTION frtuna_destinations_search_vector() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('pg_catalog.english', coalesce(NEW.name, '')), 'A') ||
+            setweight(to_tsvector('pg_catalog.english', coalesce(NEW."desc", '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER frtuna_destinations_search_vector_update
+    BEFORE INSERT OR UPDATE ON frtuna_destinations
+    FOR EACH ROW EXECUTE FUNCTION frtuna_destinations_search_vector();
+    """,
+    'UPDATE frtuna_destinations SET name = name;',
+    'CREATE INDEX frtuna_dest_search_gin ON frtuna_destinations USING gin (search_vector);',
+]
+
+POSTGRES_BACKWARD = [
+    'DROP INDEX IF EXISTS frtuna_dest_search_gin;',
+    'DROP TRIGGER IF EXISTS frtuna_destinations_search_vector_update ON frtuna_destinations;',
+    'DROP FUNCTION IF EXISTS frtuna_destinations_search_vector();',
+]
+
+
+def _run_on_postgres(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            for statement in statements:
+                schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frtuna', '0003_destinations_price_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='destinations',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(
+            _run_on_postgres(POSTGRES_FORWARD),
+            _run_on_postgres(POSTGRES_BACKWARD),
+        ),
+    ]
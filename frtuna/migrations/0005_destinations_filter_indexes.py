@@ -0,0 +1,21 @@
+# Generated by Django 5.1.2 on 2026-10-18 08:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frtuna', '0004_destinations_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='destinations',
+            index=models.Index(condition=models.Q(('offer', True)), fields=['price', 'id'], name='frtuna_dest_offer_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='destinations',
+            index=models.Index(condition=models.Q(('offer', True)), fields=['id'], name='frtuna_dest_offers_idx'),
+        ),
+    ]
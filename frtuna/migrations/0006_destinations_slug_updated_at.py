@@ -0,0 +1,50 @@
+from django.db import migrations, models
+from django.utils import timezone
+from django.utils.text import slugify
+
+
+def fill_slugs(apps, schema_editor):
+    """Slug every existing row from its name, numbering duplicates in id order."""
+    Destinations = apps.get_model('frtuna', 'Destinations')
+    taken = set()
+    batch = []
+    for dest in Destinations.objects.only('id', 'name').order_by('id').iterator(chunk_size=2000):
+        base = slugify(dest.name)[:52].strip('-') or 'destination'
+        slug, n = base, 1
+        while slug in taken:
+            n += 1
+            slug = f'{base}-{n}'
+        taken.add(slug)
+        dest.slug = slug
+        batch.append(dest)
+        if len(batch) >= 2000:
+            Destinations.objects.bulk_update(batch, ['slug'])
+            batch.clear()
+    Destinations.objects.bulk_update(batch, ['slug'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frtuna', '0005_destinations_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='destinations',
+            name='slug',
+            field=models.SlugField(db_index=False, max_length=60, null=True),
+        ),
+        migrations.AddField(
+            model_name='destinations',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='destinations',
+            name='slug',
+            field=models.SlugField(max_length=60, unique=True),
+        ),
+    ]
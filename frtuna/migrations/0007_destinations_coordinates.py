@@ -0,0 +1,28 @@
+# Generated by Django 5.1.2 on 2026-10-18 09:02
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frtuna', '0006_destinations_slug_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='destinations',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-90), django.core.validators.MaxValueValidator(90)]),
+        ),
+        migrations.AddField(
+            model_name='destinations',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-180), django.core.validators.MaxValueValidator(180)]),
+        ),
+        migrations.AddIndex(
+            model_name='destinations',
+            index=models.Index(fields=['updated_at'], name='frtuna_dest_updated_at_idx'),
+        ),
+    ]
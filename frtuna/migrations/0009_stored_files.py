@@ -0,0 +1,25 @@
+# Generated by Django 5.1.2 on 2026-10-18 09:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frtuna', '0008_similar_destinations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('storage', models.CharField(max_length=200)),
+                ('key', models.CharField(max_length=255)),
+                ('name', models.CharField(max_length=255)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('storage', 'key'), name='frtuna_storedfile_storage_key_uniq')],
+            },
+        ),
+    ]
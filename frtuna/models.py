@@ -1,4 +1,10 @@
+from collections import Counter
+
+from django.contrib.postgres.search import SearchVectorField
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.urls import reverse
+from django.utils.text import slugify
 
 # Create your models here.
 
@@ -10,6 +16,106 @@ class Destinations(models.Model):
     desc = models.TextField(blank=False, null=False)
     price = models.IntegerField()
     offer = models.BooleanField(default=False)
+    # URL of the detail page; assigned from the name on first save (see
+    # frtuna.signals) and kept when the name changes, so links stay valid.
+    slug = models.SlugField(max_length=60, unique=True)
+    # Last-Modified of the detail page.
+    updated_at = models.DateTimeField(auto_now=True)
+    # WGS84 degrees, for /destinations/near (see frtuna.geo); optional.
+    latitude = models.FloatField(null=True, blank=True,
+                                 validators=[MinValueValidator(-90), MaxValueValidator(90)])
+    longitude = models.FloatField(null=True, blank=True,
+                                  validators=[MinValueValidator(-180), MaxValueValidator(180)])
+    # Filled in by a database trigger on PostgreSQL; unused elsewhere. See frtuna.search.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination seeks on (price, id); see frtuna.pagination.
+            models.Index(fields=['price', 'id'], name='frtuna_dest_price_id_idx'),
+            # Special offers filtered by price range or ordered by price, and in
+            # default (id) order; see frtuna.filters. Partial rather than
+            # leading with ``offer`` because SQLite only matches a bare
+            # ``WHERE offer`` against an index condition, not an index column.
+            models.Index(fields=['price', 'id'], condition=models.Q(offer=True), name='frtuna_dest_offer_price_idx'),
+            models.Index(fields=['id'], condition=models.Q(offer=True), name='frtuna_dest_offers_idx'),
+            # Rows changed since a process last synced its nearby index; see frtuna.geo.
+            models.Index(fields=['updated_at'], name='frtuna_dest_updated_at_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    def get_absolute_url(self):
+        return reverse('destination_detail', args=[self.slug])
+
+
+def assign_slugs(destinations):
+    """
+    Give each destination without a slug a unique one derived from its name,
+    appending ``-2``, ``-3``, ... on collisions. Costs one query, plus one
+    per name whose plain slug is taken or repeated in ``destinations``.
+    """
+    max_length = Destinations._meta.get_field('slug').max_length - 8  # room for a suffix
+    pending = [dest for dest in destinations if not dest.slug]
+    if not pending:
+        return
+    bases = [slugify(dest.name)[:max_length].strip('-') or 'destination' for dest in pending]
+    taken = set(Destinations.objects.filter(slug__in=set(bases)).values_list('slug', flat=True))
+    counts = Counter(bases)
+    for base in {base for base in bases if base in taken or counts[base] > 1}:
+        taken.update(Destinations.objects.filter(slug__startswith=f'{base}-').values_list('slug', flat=True))
+
+    for dest, base in zip(pending, bases):
+        slug, n = base, 1
+        while slug in taken:
+            n += 1
+            slug = f'{base}-{n}'
+        dest.slug = slug
+        taken.add(slug)
+
+
+class SimilarDestination(models.Model):
+    """
+    One of a destination's most similar destinations by description,
+    written by the ``build_similar_destinations`` command (frtuna.similarity).
+    """
+    # The (source, rank) constraint's index serves lookups by source.
+    source = models.ForeignKey(Destinations, on_delete=models.CASCADE, related_name='similar', db_index=False)
+    target = models.ForeignKey(Destinations, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'rank'], name='frtuna_similar_source_rank_uniq'),
+        ]
+
+    def __str__(self):
+        return f'{self.source_id} -> {self.target_id} ({self.score:.3f})'
+
+
+class SimilarityRun(models.Model):
+    """The last ``build_similar_destinations`` run; rows changed since are recomputed."""
+    started_at = models.DateTimeField()
+    full = models.BooleanField(default=False)
+    sources = models.PositiveIntegerField(default=0)
+
+
+class StoredFile(models.Model):
+    """
+    The name a storage backend gave a content-addressed file (frtuna.images).
+    Cloudinary adds a random suffix to every upload, so asking the storage
+    whether ``pics/<digest>.jpg`` exists never finds an earlier upload.
+    """
+    storage = models.CharField(max_length=200)
+    key = models.CharField(max_length=255)
+    name = models.CharField(max_length=255)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['storage', 'key'], name='frtuna_storedfile_storage_key_uniq'),
+        ]
 
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return f'{self.key} -> {self.name}'
@@ -0,0 +1,138 @@
+"""
+Keyset (seek) pagination for destination listings.
+
+OFFSET paging makes the database walk and discard every row before the
+requested page, so deep pages get slower as the catalog grows. Keyset
+paging instead remembers the sort key of the last row on the page and
+asks for rows strictly after it, which an index on the sort columns can
+answer directly no matter how deep the page is.
+"""
+
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+
+
+DEFAULT_PAGE_SIZE = 12
+MAX_PAGE_SIZE = 48
+
+# Supported orderings, mapped to the columns that make up the keyset.
+# Every ordering ends with ``id`` so the key is unique and stable.
+ORDERINGS = {
+    'id': ('id',),
+    'price': ('price', 'id'),
+}
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded or does not match the sort."""
+
+
+def encode_cursor(sort, values):
+    """Return an opaque, URL-safe token for the given sort key values."""
+    payload = json.dumps({'s': sort, 'k': list(values)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, sort):
+    """Decode a token produced by ``encode_cursor`` for ``sort``."""
+    padded = token + '=' * (-len(token) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor('malformed cursor')
+
+    if not isinstance(payload, dict) or payload.get('s') != sort:
+        raise InvalidCursor('cursor does not match the requested sort')
+    values = payload.get('k')
+    if (not isinstance(values, list)
+            or len(values) != len(ORDERINGS[sort])
+            or not all(isinstance(v, int) and not isinstance(v, bool) for v in values)):
+        raise InvalidCursor('cursor has an invalid key')
+    return values
+
+
+def clamp_page_size(value, default=DEFAULT_PAGE_SIZE):
+    """Parse a requested page size, falling back to ``default`` and capping it."""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def _after(columns, values):
+    """Build the row-value comparison ``(columns) > (values)`` as a Q object."""
+    condition = Q()
+    for i in range(len(columns)):
+        step = Q(**{f'{columns[i]}__gt': values[i]})
+        for column, value in zip(columns[:i], values[:i]):
+            step &= Q(**{column: value})
+        condition |= step
+    return condition
+
+
+class KeysetPage:
+    """One page of results plus the cursor needed to fetch the next one."""
+
+    def __init__(self, items, next_cursor):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def _seek(queryset, sort, cursor):
+    """Order ``queryset`` by ``sort`` and skip to just after ``cursor``."""
+    if sort not in ORDERINGS:
+        raise InvalidCursor(f'unsupported sort {sort!r}')
+    columns = ORDERINGS[sort]
+
+    queryset = queryset.order_by(*columns)
+    if cursor:
+        queryset = queryset.filter(_after(columns, decode_cursor(cursor, sort)))
+    return queryset, columns
+
+
+def _page(rows, columns, sort, page_size):
+    items = rows[:page_size]
+    next_cursor = None
+    if len(rows) > page_size:
+        last = items[-1]
+        if isinstance(last, dict):  # a .values() queryset
+            key = [last[c] for c in columns]
+        else:
+            key = [getattr(last, c) for c in columns]
+        next_cursor = encode_cursor(sort, key)
+    return KeysetPage(items, next_cursor)
+
+
+def paginate(queryset, sort='id', cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Return a ``KeysetPage`` of ``queryset`` ordered by ``sort``.
+
+    ``queryset`` may yield model instances or ``.values()`` dicts, as long
+    as the sort columns are included. ``cursor`` is the token from a
+    previous page's ``next_cursor``. One extra row is fetched to find out
+    whether a further page exists, so a page costs a single indexed range
+    scan.
+    """
+    queryset, columns = _seek(queryset, sort, cursor)
+    return _page(list(queryset[:page_size + 1]), columns, sort, page_size)
+
+
+async def apaginate(queryset, sort='id', cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """Async version of ``paginate``, for async views."""
+    queryset, columns = _seek(queryset, sort, cursor)
+    rows = [row async for row in queryset[:page_size + 1].aiterator()]
+    return _page(rows, columns, sort, page_size)
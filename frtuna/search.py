@@ -0,0 +1,178 @@
+"""
+Ranked full-text search over destination names and descriptions.
+
+On PostgreSQL the ``search_vector`` column is maintained by a trigger
+(see migration ``0004``) and searched through a GIN index, so a query
+never scans the table. Other databases have no such index, so they use
+``InvertedIndex``, an in-process BM25 index built from the table and
+rebuilt lazily whenever the catalog version changes.
+
+Both backends treat the last query term as a prefix, so results can be
+fetched as the user types.
+"""
+
+import bisect
+import math
+import re
+import threading
+from collections import defaultdict
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F
+
+from .cache import get_catalog_version
+from .models import Destinations
+
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+STOP_WORDS = frozenset(
+    'a an and are as at be by for from has in is it its of on or that the to was with'.split()
+)
+MAX_QUERY_TERMS = 8
+
+# Field weights, mirroring setweight('A')/('B') in the PostgreSQL trigger.
+NAME_WEIGHT = 2.0
+DESC_WEIGHT = 1.0
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text):
+    """Lowercase word tokens of ``text`` without stop words."""
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOP_WORDS]
+
+
+class SearchPage:
+    """A page of ``(destination, rank)`` pairs."""
+
+    def __init__(self, results, has_next):
+        self.results = results
+        self.has_next = has_next
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def __len__(self):
+        return len(self.results)
+
+
+class InvertedIndex:
+    """
+    Term -> postings index over ``Destinations`` ranked with BM25.
+
+    The vocabulary is kept sorted so a prefix term is a ``bisect`` range
+    rather than a scan over every term.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = None
+        self.postings = {}
+        self.vocabulary = []
+        self.norms = {}
+
+    def build(self, rows):
+        """Replace the index contents with ``(id, name, desc)`` rows."""
+        postings = defaultdict(dict)
+        lengths = {}
+        for pk, name, desc in rows:
+            weights = defaultdict(float)
+            for token in tokenize(name):
+                weights[token] += NAME_WEIGHT
+            for token in tokenize(desc):
+                weights[token] += DESC_WEIGHT
+            for token, weight in weights.items():
+                postings[token][pk] = weight
+            lengths[pk] = sum(weights.values())
+
+        average = (sum(lengths.values()) / len(lengths)) if lengths else 0.0
+        self.postings = dict(postings)
+        self.vocabulary = sorted(postings)
+        # BM25 length normalisation only depends on the document, so it is
+        # folded into one factor per document at build time.
+        self.norms = {pk: BM25_K1 * (1 - BM25_B + BM25_B * length / average)
+                      for pk, length in lengths.items()}
+
+    def ensure_current(self):
+        """Rebuild from the database if the catalog changed since the last build."""
+        version = get_catalog_version()
+        if self.version == version:
+            return
+        with self._lock:
+            if self.version != version:
+                self.build(Destinations.objects.values_list('id', 'name', 'desc').iterator())
+                self.version = version
+
+    def _expand(self, term, prefix):
+        if not prefix:
+            return [term] if term in self.postings else []
+        start = bisect.bisect_left(self.vocabulary, term)
+        end = bisect.bisect_left(self.vocabulary, term + '\U0010ffff')
+        return self.vocabulary[start:end]
+
+    def _score_terms(self, terms):
+        """BM25 score of each document matching any of ``terms``."""
+        scores = defaultdict(float)
+        total = len(self.norms)
+        norms = self.norms
+        for term in terms:
+            postings = self.postings[term]
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            boost = idf * (BM25_K1 + 1)
+            for pk, tf in postings.items():
+                scores[pk] += boost * tf / (tf + norms[pk])
+        return scores
+
+    def search(self, query):
+        """Return ``[(id, score), ...]`` matching every query term, best first."""
+        terms = tokenize(query)[:MAX_QUERY_TERMS]
+        if not terms:
+            return []
+        combined = None
+        for i, term in enumerate(terms):
+            scores = self._score_terms(self._expand(term, prefix=i == len(terms) - 1))
+            if combined is None:
+                combined = scores
+            else:
+                combined = {pk: s + scores[pk] for pk, s in combined.items() if pk in scores}
+            if not combined:
+                return []
+        return sorted(combined.items(), key=lambda item: (-item[1], item[0]))
+
+
+index = InvertedIndex()
+
+
+def _postgres_query(query):
+    terms = [re.sub(r'\W', '', t) for t in tokenize(query)[:MAX_QUERY_TERMS]]
+    terms = [t for t in terms if t]
+    if not terms:
+        return None
+    terms[-1] += ':*'
+    return SearchQuery(' & '.join(terms), search_type='raw', config='english')
+
+
+def search_destinations(query, page=1, page_size=10):
+    """Return one ``SearchPage`` of destinations matching ``query``."""
+    offset = (page - 1) * page_size
+
+    if connection.vendor == 'postgresql':
+        search_query = _postgres_query(query)
+        if search_query is None:
+            return SearchPage([], False)
+        rows = list(
+            Destinations.objects
+            .filter(search_vector=search_query)
+            .annotate(rank=SearchRank(F('search_vector'), search_query))
+            .order_by('-rank', 'id')
+            .defer('search_vector')[offset:offset + page_size + 1]
+        )
+        return SearchPage([(d, d.rank) for d in rows[:page_size]], len(rows) > page_size)
+
+    index.ensure_current()
+    ranked = index.search(query)
+    window = ranked[offset:offset + page_size]
+    by_id = Destinations.objects.defer('search_vector').in_bulk([pk for pk, _ in window])
+    results = [(by_id[pk], score) for pk, score in window if pk in by_id]
+    return SearchPage(results, len(ranked) > offset + page_size)
@@ -0,0 +1,112 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import geo
+from .cache import bump_catalog_version, invalidate_destination
+from .models import Destinations, SimilarDestination, assign_slugs
+from .storage_urls import invalidate
+from .thumbnails import get_derivatives
+
+
+@receiver([post_save, post_delete], sender=Destinations)
+def invalidate_catalog_cache(sender, using, **kwargs):
+    """Bump the catalog version whenever a destination changes."""
+    # Bump right away so this process sees its own write, and again on
+    # commit so a request that read the old rows mid-transaction cannot
+    # leave them cached under the new version.
+    bump_catalog_version()
+    transaction.on_commit(bump_catalog_version, using=using)
+
+
+@receiver(post_save, sender=Destinations)
+def build_image_derivatives(sender, instance, update_fields=None, **kwargs):
+    """Render card-sized copies of a newly uploaded image up front."""
+    if update_fields is None or 'img' in update_fields:
+        get_derivatives(instance.img)
+
+
+@receiver(pre_save, sender=Destinations)
+def assign_slug(sender, instance, raw=False, **kwargs):
+    """Slug new destinations, including ones loaded from fixtures."""
+    if not instance.slug:
+        assign_slugs([instance])
+    # Fixture saves are raw, so auto_now does not fill in older fixtures.
+    if raw and instance.updated_at is None:
+        instance.updated_at = timezone.now()
+
+
+@receiver(post_init, sender=Destinations)
+def remember_loaded_values(sender, instance, **kwargs):
+    """
+    Note the image and slug a row was loaded with, to invalidate their
+    cached URL and detail page if they change.
+    """
+    # Read the raw values: touching ``instance.img`` on a deferred field would query.
+    value = instance.__dict__.get('img')
+    instance._loaded_img_name = getattr(value, 'name', value)
+    instance._loaded_slug = instance.__dict__.get('slug')
+
+
+@receiver([post_save, post_delete], sender=Destinations)
+def invalidate_detail_cache(sender, instance, using, **kwargs):
+    """Drop the cached detail page of a changed destination, under its old and new slug."""
+    slugs = {getattr(instance, '_loaded_slug', None), instance.__dict__.get('slug')}
+    invalidate_destination(*slugs)
+    # Again on commit, like the catalog version: a request that read the old
+    # row before this transaction committed may have cached it meanwhile.
+    transaction.on_commit(lambda: invalidate_destination(*slugs), using=using)
+    instance._loaded_slug = instance.__dict__.get('slug')
+
+
+@receiver([post_save, post_delete], sender=Destinations)
+def invalidate_image_urls(sender, instance, update_fields=None, **kwargs):
+    """Drop cached URLs of a replaced or deleted image; the name may be reused."""
+    if update_fields is not None and 'img' not in update_fields:
+        return
+    storage = sender._meta.get_field('img').storage
+    invalidate(storage, getattr(instance, '_loaded_img_name', None))
+    if 'img' in instance.__dict__:
+        invalidate(storage, instance.img.name)
+        instance._loaded_img_name = instance.img.name
+
+
+@receiver([post_save, post_delete], sender=Destinations)
+def update_nearby_index(sender, instance, using, update_fields=None, **kwargs):
+    """Move a saved or deleted destination in this process's nearby index once it commits."""
+    deleted = kwargs['signal'] is post_delete
+    if not deleted and update_fields is not None and not {'latitude', 'longitude'} & set(update_fields):
+        return
+    if not deleted and not {'latitude', 'longitude'} <= instance.__dict__.keys():
+        return  # deferred; the catalog version change makes the index catch up
+    pk, lat, lon = instance.pk, instance.__dict__.get('latitude'), instance.__dict__.get('longitude')
+    transaction.on_commit(lambda: geo.apply_change(pk, lat, lon, deleted), using=using)
+
+
+@receiver(post_save, sender=Destinations)
+def invalidate_similar_strips(sender, instance, using, created=False, **kwargs):
+    """Drop the cached detail pages whose "similar destinations" strip shows a saved destination."""
+    if created:
+        return  # not in any list until build_similar_destinations runs
+    slugs = list(SimilarDestination.objects.using(using).filter(target=instance)
+                 .values_list('source__slug', flat=True))
+    if not slugs:
+        return
+    invalidate_destination(*slugs)
+    transaction.on_commit(lambda: invalidate_destination(*slugs), using=using)
+
+
+@receiver(pre_delete, sender=Destinations)
+def drop_similar_lists(sender, instance, using, **kwargs):
+    """
+    Drop the "similar destinations" lists that include a deleted destination,
+    so build_similar_destinations refills them instead of leaving them short.
+    """
+    holders = SimilarDestination.objects.using(using).filter(target=instance)
+    slugs = list(holders.values_list('source__slug', flat=True))
+    if not slugs:
+        return
+    SimilarDestination.objects.using(using).filter(source__in=holders.values('source')).delete()
+    invalidate_destination(*slugs)
+    transaction.on_commit(lambda: invalidate_destination(*slugs), using=using)
@@ -0,0 +1,220 @@
+"""
+"You might also like" neighbours from destination descriptions.
+
+Comparing descriptions on request would mean a pass over the whole catalog
+per page view. Instead ``build_similar_destinations`` stores each
+destination's ``k`` most similar destinations in ``SimilarDestination``,
+and the detail page reads them with one indexed lookup.
+
+Descriptions become TF-IDF vectors (sublinear term frequency, smoothed
+IDF, unit length) held in ``SparseRows``, the CSR layout of
+``scipy.sparse.csr_matrix`` in plain NumPy arrays. The cosine similarities
+of a batch of rows to every row are the sparse matrix times the batch's
+dense columns. ``top_neighbours`` keeps the best ``k`` of each row with
+``argpartition``, so only one batch of scores is in memory at a time.
+Terms found in a single description cannot make two descriptions similar,
+so they count towards a vector's length but are left out of the product.
+
+``update_neighbours`` recomputes the destinations changed since the last
+run, plus the unchanged ones a change affects: those whose list holds a
+changed destination, and those a changed destination now beats the last
+entry of. Scores use the current IDF weights, which drift slightly as the
+catalog changes; ``full=True`` recomputes everything, and is needed after
+changing ``k``.
+"""
+
+from collections import Counter
+from datetime import timedelta
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import invalidate_destination
+from .models import Destinations, SimilarDestination, SimilarityRun
+from .search import tokenize
+
+
+DEFAULT_K = 6
+BATCH_SIZE = 256
+# Caps the temporary arrays SparseRows.dot holds at once, in floats.
+MAX_PRODUCT_ENTRIES = 1 << 22
+# SparseRows.dot multiplies dense blocks once at least this share (1/n) of
+# the matrix is filled in; measured with benchmarks/similar.py.
+DENSE_BREAK_EVEN = 16
+# Rows saved this long before the last run started are looked at again,
+# for transactions that were still in flight when it read the table.
+RUN_OVERLAP = timedelta(minutes=5)
+WRITE_BATCH_SIZE = 2000
+
+
+class SparseRows:
+    """
+    A float32 matrix in CSR form: row ``i`` holds ``data[indptr[i]:indptr[i + 1]]``
+    at columns ``indices[indptr[i]:indptr[i + 1]]``.
+    """
+
+    def __init__(self, indptr, indices, data, width):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.width = width
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def columns(self, rows):
+        """``rows`` as a dense ``(width, len(rows))`` array."""
+        dense = np.zeros((self.width, len(rows)), dtype=np.float32)
+        for j, row in enumerate(rows):
+            start, end = self.indptr[row], self.indptr[row + 1]
+            dense[self.indices[start:end], j] = self.data[start:end]
+        return dense
+
+    def dense_rows(self, start, end):
+        """Rows ``start:end`` as a dense ``(end - start, width)`` array."""
+        lo, hi = self.indptr[start], self.indptr[end]
+        dense = np.zeros((end - start, self.width), dtype=np.float32)
+        row_of = np.repeat(np.arange(end - start), np.diff(self.indptr[start:end + 1]))
+        dense[row_of, self.indices[lo:hi]] = self.data[lo:hi]
+        return dense
+
+    def dot(self, dense):
+        """``self @ dense`` for a dense ``(width, b)`` array, a chunk of rows at a time."""
+        count, width = len(self), dense.shape[1]
+        out = np.zeros((count, width), dtype=np.float32)
+        if self.data.size * DENSE_BREAK_EVEN >= count * self.width:
+            # Few terms shared by many rows: a BLAS product of dense blocks
+            # beats gathering a row of ``dense`` per stored entry.
+            step = max(1, MAX_PRODUCT_ENTRIES // max(self.width, 1))
+            for start in range(0, count, step):
+                end = min(start + step, count)
+                out[start:end] = self.dense_rows(start, end) @ dense
+            return out
+        per_chunk = max(1, MAX_PRODUCT_ENTRIES // max(width, 1))
+        start = 0
+        while start < count:
+            end = int(np.searchsorted(self.indptr, self.indptr[start] + per_chunk, side='right')) - 1
+            end = min(max(end, start + 1), count)
+            lo, hi = self.indptr[start], self.indptr[end]
+            if hi > lo:
+                products = self.data[lo:hi, None] * dense[self.indices[lo:hi]]
+                nonempty = np.flatnonzero(self.indptr[start + 1:end + 1] > self.indptr[start:end])
+                out[start + nonempty] = np.add.reduceat(products, self.indptr[start + nonempty] - lo, axis=0)
+            start = end
+        return out
+
+
+def tfidf(texts):
+    """Unit-length TF-IDF rows for ``texts``, without single-document terms."""
+    vocabulary = {}
+    indptr, indices, counts = [0], [], []
+    for text in texts:
+        terms = Counter(vocabulary.setdefault(term, len(vocabulary)) for term in tokenize(text))
+        indices.extend(terms)
+        counts.extend(terms.values())
+        indptr.append(len(indices))
+
+    rows = len(indptr) - 1
+    indices = np.array(indices, dtype=np.int64)
+    row_of = np.repeat(np.arange(rows), np.diff(indptr))
+    df = np.bincount(indices, minlength=len(vocabulary))
+    data = (1 + np.log(np.array(counts, dtype=np.float64))) * (np.log((1 + rows) / (1 + df)) + 1)[indices]
+    norms = np.sqrt(np.bincount(row_of, weights=data * data, minlength=rows))
+    data /= norms[row_of]
+
+    shared = df[indices] > 1
+    column = np.cumsum(df > 1) - 1
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(row_of[shared], minlength=rows))])
+    return SparseRows(indptr, column[indices[shared]], data[shared].astype(np.float32), int((df > 1).sum()))
+
+
+def top_neighbours(matrix, rows, k, batch_size=BATCH_SIZE):
+    """
+    Yield ``(batch, neighbours, scores, best)`` for each batch of ``rows``:
+    the ``k`` rows most similar to each, best first (ties by row), their
+    scores, and the best score of any row in the batch against every row.
+    Scores of 0 mean nothing in common; callers drop them.
+    """
+    k = min(k, len(matrix) - 1)
+    for start in range(0, len(rows), batch_size):
+        batch = np.asarray(rows[start:start + batch_size])
+        scores = matrix.dot(matrix.columns(batch)).T
+        scores[np.arange(len(batch)), batch] = 0
+        best = scores.max(axis=0)
+        if k < 1:
+            yield batch, np.empty((len(batch), 0), dtype=np.int64), np.empty((len(batch), 0)), best
+            continue
+        neighbours = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top = np.take_along_axis(scores, neighbours, axis=1)
+        order = np.lexsort((neighbours, -top), axis=1)
+        yield batch, np.take_along_axis(neighbours, order, 1), np.take_along_axis(top, order, 1), best
+
+
+def _stored_lists(ids, k, changed):
+    """
+    For each row of ``ids``: whether it has a stored list, the score a
+    newcomer must beat to enter it, and whether it holds a ``changed`` row.
+    """
+    stored = np.array(SimilarDestination.objects.values_list('source_id', 'target_id', 'score'),
+                      dtype=np.float64).reshape(-1, 3)
+    sources = np.searchsorted(ids, stored[:, 0].astype(np.int64))
+    targets = np.searchsorted(ids, stored[:, 1].astype(np.int64))
+    lengths = np.bincount(sources, minlength=len(ids))
+    floor = np.full(len(ids), np.inf)
+    np.minimum.at(floor, sources, stored[:, 2])
+    floor[lengths < k] = 0  # a free slot takes anything similar at all
+    holds_changed = np.zeros(len(ids), dtype=bool)
+    holds_changed[sources[changed[targets]]] = True
+    return lengths > 0, floor, holds_changed
+
+
+def update_neighbours(k=DEFAULT_K, batch_size=BATCH_SIZE, full=False):
+    """
+    Bring ``SimilarDestination`` up to date. Returns ``(recomputed, total)``,
+    the number of destinations whose lists were rebuilt and of all destinations.
+    """
+    started = timezone.now()
+    rows = list(Destinations.objects.order_by('id').values_list('id', 'slug', 'desc', 'updated_at'))
+    ids = np.array([row[0] for row in rows], dtype=np.int64)
+    matrix = tfidf(row[2] for row in rows)
+
+    last = SimilarityRun.objects.order_by('-started_at').first()
+    if full or last is None:
+        changed = np.ones(len(rows), dtype=bool)
+    else:
+        since = last.started_at - RUN_OVERLAP
+        changed = np.array([row[3] >= since for row in rows], dtype=bool)
+    listed, floor, holds_changed = _stored_lists(ids, k, changed)
+    changed |= ~listed  # new rows, and lists dropped by a delete
+
+    results = []
+    best = np.zeros(len(rows), dtype=np.float32)
+    for batch, neighbours, scores, batch_best in top_neighbours(matrix, np.flatnonzero(changed), k, batch_size):
+        results.append((batch, neighbours, scores))
+        np.maximum(best, batch_best, out=best)
+    affected = ~changed & (holds_changed | (best > floor))
+    for batch, neighbours, scores, _ in top_neighbours(matrix, np.flatnonzero(affected), k, batch_size):
+        results.append((batch, neighbours, scores))
+
+    recomputed = np.concatenate([batch for batch, _, _ in results]) if results else np.empty(0, dtype=np.int64)
+    pks = ids.tolist()
+    with transaction.atomic():
+        if full:
+            SimilarDestination.objects.all().delete()
+        else:
+            for start in range(0, len(recomputed), WRITE_BATCH_SIZE):
+                chunk = [pks[row] for row in recomputed[start:start + WRITE_BATCH_SIZE]]
+                SimilarDestination.objects.filter(source_id__in=chunk).delete()
+        for batch, neighbours, scores in results:
+            SimilarDestination.objects.bulk_create([
+                SimilarDestination(source_id=pks[row], target_id=pks[target], rank=rank, score=score)
+                for row, row_neighbours, row_scores in zip(batch.tolist(), neighbours.tolist(), scores.tolist())
+                for rank, (target, score) in enumerate(zip(row_neighbours, row_scores))
+                if score > 0
+            ], batch_size=WRITE_BATCH_SIZE)
+        SimilarityRun.objects.all().delete()
+        SimilarityRun.objects.create(started_at=started, full=full or last is None, sources=len(recomputed))
+        slugs = [rows[row][1] for row in recomputed.tolist()]
+        transaction.on_commit(lambda: invalidate_destination(*slugs))
+    return len(recomputed), len(rows)
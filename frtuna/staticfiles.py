@@ -0,0 +1,277 @@
+"""
+Static asset bundles built by ``collectstatic``.
+
+``STATIC_BUNDLES`` maps a bundle name such as ``bundles/index.css`` to the
+static files it is made of, in order. ``BundledStaticFilesStorage`` runs
+after every file has been copied to ``STATIC_ROOT``: it concatenates each
+bundle's sources, minifies them, and hands the result to WhiteNoise's
+``CompressedManifestStaticFilesStorage``. That storage fingerprints every
+file (``index.3f2a9c1b.css``), rewrites CSS ``url()`` references to the
+fingerprinted names, and writes ``.br`` (with the ``Brotli`` package) and
+``.gz`` variants that WhiteNoise serves to clients accepting them.
+
+Templates load a bundle with ``{% bundle 'bundles/index.css' %}`` from the
+``frtuna_static`` library. It renders one tag for the fingerprinted bundle,
+or one tag per source file when ``DEBUG`` is on or the bundles are not
+built (``STATIC_STORAGE=plain``).
+
+``static_url`` memoises ``static()`` per process for the ``{% static %}``
+tag that ``frtuna_static`` provides. With the manifest storage every
+lookup otherwise goes through the manifest and URL joining again, dozens
+of times per home page render, although the answer never changes between
+deploys.
+
+The minifiers are conservative: they only remove comments and whitespace
+that cannot change meaning, and leave ``.min.js``/``.min.css`` sources as
+they are. ``/*! ... */`` license comments are kept.
+"""
+
+import functools
+import posixpath
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.templatetags.static import static
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+_CSS_TOKENS = re.compile(
+    r'(?P<string>"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|(?P<comment>/\*.*?\*/)',
+    re.DOTALL,
+)
+_CSS_URL = re.compile(r'url\(\s*(?P<quote>["\']?)(?P<url>[^"\')]+)(?P=quote)\s*\)')
+_CSS_CHARSET = re.compile(r'@charset\s+["\'][^"\']*["\']\s*;', re.IGNORECASE)
+_CSS_IMPORT = re.compile(r'@import\s+[^;]+;', re.IGNORECASE)
+_SOURCE_MAP = re.compile(r'^\s*(?://|/\*)# sourceMappingURL=.*$', re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=2048)
+def static_url(path):
+    """``django.templatetags.static.static``, memoised."""
+    return static(path)
+
+
+@receiver(setting_changed)
+def clear_static_urls(setting, **kwargs):
+    if setting in ('STATIC_URL', 'STORAGES', 'DEBUG'):
+        static_url.cache_clear()
+
+
+def _is_minified(name):
+    return '.min.' in posixpath.basename(name)
+
+
+def _minify_css_code(code):
+    code = re.sub(r'\s+', ' ', code)
+    code = re.sub(r'\s*([{};,>])\s*', r'\1', code)
+    code = re.sub(r':\s+', ':', code)
+    return code.replace(';}', '}')
+
+
+def minify_css(css):
+    """Drop comments (except ``/*!``) and redundant whitespace outside strings."""
+    parts, code, position, after_comment = [], '', 0, False
+    for match in _CSS_TOKENS.finditer(css):
+        code += css[position:match.start()]
+        position = match.end()
+        comment = match.group('comment')
+        if comment and not comment.startswith('/*!'):
+            code += ' '  # a comment separates tokens the way whitespace does
+            continue
+        # Whitespace next to a kept comment is never significant.
+        code = _minify_css_code(code)
+        code = code.lstrip() if after_comment else code
+        parts += [code.rstrip() if comment else code, match.group()]
+        code, after_comment = '', bool(comment)
+    code = _minify_css_code(code + css[position:])
+    parts.append(code.lstrip() if after_comment else code)
+    return ''.join(parts).strip()
+
+
+# After these, a ``/`` starts a regular expression rather than dividing.
+_JS_REGEX_AFTER = set('(,=:[!&|?{};+-*%<>~^') | {''}
+_JS_REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void',
+                      'throw', 'instanceof', 'yield', 'await'}
+_JS_WORD = re.compile(r'[\w$]+')
+
+
+def _scan_js_line(line, state):
+    """
+    Carry ``state``, ``{'open': [...], 'last': ...}``, across ``line``.
+    ``open`` lists what is open: ``/*``, a template literal (`` ` ``), a
+    ``${`` substitution or ``{`` inside one, or a quote whose string
+    continues with a backslash. ``last`` is the previous token, to tell a
+    regular expression from a division.
+    """
+    stack, i, end = state['open'], 0, len(line)
+    while i < end:
+        top = stack[-1] if stack else None
+        char = line[i]
+        if top == '/*':
+            close = line.find('*/', i)
+            if close < 0:
+                return
+            stack.pop()
+            i = close + 2
+        elif top in ('"', "'", '`'):
+            if char == '\\':
+                i += 2
+                continue
+            if char == top:
+                stack.pop()
+                state['last'] = 'literal'
+            elif top == '`' and line.startswith('${', i):
+                stack.append('${')
+                i += 1
+            i += 1
+        elif char.isspace():
+            i += 1
+        elif char in '"\'`':
+            stack.append(char)
+            i += 1
+        elif line.startswith('//', i):
+            return
+        elif line.startswith('/*', i):
+            stack.append('/*')
+            i += 2
+        elif char == '/' and (state['last'] in _JS_REGEX_AFTER or state['last'] in _JS_REGEX_KEYWORDS):
+            i += 1
+            in_class = False
+            while i < end and (in_class or line[i] != '/'):
+                if line[i] == '\\':
+                    i += 1
+                elif line[i] in '[]':
+                    in_class = line[i] == '['
+                i += 1
+            i += 1
+            state['last'] = 'literal'
+        elif char == '{':
+            stack.append('{')
+            state['last'] = char
+            i += 1
+        elif char == '}' and stack:
+            stack.pop()  # back into the template literal after ``${...}``
+            state['last'] = char
+            i += 1
+        else:
+            word = _JS_WORD.match(line, i)
+            state['last'] = word.group() if word else char
+            i = word.end() if word else i + 1
+    # A string, unlike a template literal, only continues past a backslash.
+    if stack and stack[-1] in ('"', "'") and not line.endswith('\\'):
+        stack.pop()
+
+
+def minify_js(js):
+    """
+    Drop indentation, trailing whitespace, blank lines and whole-line ``//``
+    comments, but not inside template literals or strings continued over
+    several lines. Line breaks are kept, so automatic semicolon insertion
+    is unaffected.
+    """
+    state, kept = {'open': [], 'last': ''}, []
+    for line in js.splitlines():
+        in_literal = bool(state['open']) and state['open'][-1] in ('"', "'", '`')
+        in_comment = bool(state['open']) and state['open'][-1] == '/*'
+        _scan_js_line(line, state)
+        if state['open'] and state['open'][-1] == '`':
+            stripped = line if in_literal else line.lstrip()
+        else:
+            stripped = line.rstrip() if in_literal else line.strip()
+        if in_literal or (stripped and (in_comment or not stripped.startswith('//'))):
+            kept.append(stripped)
+    return '\n'.join(kept)
+
+
+def rebase_css_urls(css, source, bundle):
+    """
+    Rewrite relative ``url()`` references in ``css``, which was written for
+    the static path ``source``, so that they resolve from ``bundle``.
+    """
+    source_dir, bundle_dir = posixpath.dirname(source), posixpath.dirname(bundle)
+
+    def rebase(match):
+        url = match.group('url').strip()
+        if url.startswith(('/', '#', 'data:')) or re.match(r'^[a-z][a-z0-9+.-]*:|^//', url, re.IGNORECASE):
+            return match.group()
+        path, _, suffix = url.partition('?')
+        path, hash_sep, fragment = path.partition('#')
+        target = posixpath.normpath(posixpath.join(source_dir, path))
+        rebased = posixpath.relpath(target, bundle_dir or '.')
+        if hash_sep:
+            rebased += '#' + fragment
+        if suffix:
+            rebased += '?' + suffix
+        return f'url("{rebased}")'
+
+    return _CSS_URL.sub(rebase, css)
+
+
+def build_css_bundle(name, sources):
+    """
+    Join ``{path: text}`` stylesheets into one. ``@charset`` and ``@import``
+    rules are only honoured at the top of a stylesheet, so they are hoisted.
+    """
+    imports, bodies = [], []
+    for path, css in sources.items():
+        css = _CSS_CHARSET.sub('', _SOURCE_MAP.sub('', css))
+        css = rebase_css_urls(css, path, name)
+        imports.extend(match.group() for match in _CSS_IMPORT.finditer(css))
+        css = _CSS_IMPORT.sub('', css)
+        bodies.append(css if _is_minified(path) else minify_css(css))
+    return '\n'.join(['@charset "utf-8";', *dict.fromkeys(imports), *bodies]) + '\n'
+
+
+def build_js_bundle(name, sources):
+    """Join ``{path: text}`` scripts into one, keeping statements apart."""
+    bodies = []
+    for path, js in sources.items():
+        js = _SOURCE_MAP.sub('', js)
+        bodies.append(js if _is_minified(path) else minify_js(js))
+    return '\n;\n'.join(bodies) + '\n'
+
+
+BUILDERS = {
+    '.css': build_css_bundle,
+    '.js': build_js_bundle,
+}
+
+
+def get_bundles():
+    """Return ``STATIC_BUNDLES``, checking that every bundle can be built."""
+    bundles = getattr(settings, 'STATIC_BUNDLES', {})
+    for name, sources in bundles.items():
+        ext = posixpath.splitext(name)[1]
+        if ext not in BUILDERS:
+            raise ImproperlyConfigured(f'STATIC_BUNDLES: cannot bundle {name!r}; use .css or .js.')
+        if any(posixpath.splitext(source)[1] != ext for source in sources):
+            raise ImproperlyConfigured(f'STATIC_BUNDLES: every source of {name!r} must be a {ext} file.')
+    return bundles
+
+
+class BundledStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """Build ``STATIC_BUNDLES``, then fingerprint and precompress everything."""
+
+    def build_bundles(self):
+        built = []
+        for name, sources in get_bundles().items():
+            texts = {}
+            for source in sources:
+                with self.open(source) as handle:
+                    texts[source] = handle.read().decode('utf-8')
+            content = BUILDERS[posixpath.splitext(name)[1]](name, texts)
+            if self.exists(name):
+                self.delete(name)
+            self._save(name, ContentFile(content.encode('utf-8')))
+            built.append(name)
+        return built
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            for name in self.build_bundles():
+                paths[name] = (self, name)
+        yield from super().post_process(paths, dry_run=dry_run, **options)
@@ -0,0 +1,178 @@
+"""
+An offline stand-in for ``cloudinary_storage.storage.MediaCloudinaryStorage``.
+
+``LocalCloudinaryStorage`` keeps files on local disk but behaves like the
+Cloudinary media storage from the application's point of view:
+
+* names get the ``CLOUDINARY_STORAGE['PREFIX']`` (default ``MEDIA_URL``)
+  prefix, and uploads return a public id without the file extension and,
+  like ``use_filename`` uploads, with a random suffix,
+* ``url()`` is computed locally, like the SDK's URL builder,
+* ``_open``/``exists``/``size``/``delete``/``listdir`` are "network" calls,
+  and ``path()`` is unsupported.
+
+Every network call goes through a ``NetworkProfile``, which adds latency
+and jitter, caps concurrent requests, limits bandwidth for transfers and
+fails a fraction of calls with ``TransientStorageError``. With a fixed
+``seed`` the sequence of delays and failures is reproducible, so upload,
+import and render benchmarks can run on a machine with no network.
+"""
+
+import os
+import random
+import string
+import threading
+import time
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, Storage
+from django.utils.deconstruct import deconstructible
+
+
+class TransientStorageError(IOError):
+    """An injected failure, standing in for a timeout or a 5xx from Cloudinary."""
+
+
+class NetworkProfile:
+    """Simulated round trips: latency, jitter, failures, concurrency and bandwidth."""
+
+    def __init__(self, latency=0.0, jitter=0.0, failure_rate=0.0, bandwidth=None,
+                 max_concurrency=None, seed=None, sleep=time.sleep):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.bandwidth = bandwidth  # bytes per second, None for unlimited
+        self.sleep = sleep
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self.calls = 0
+
+    def _draw(self):
+        with self._random_lock:
+            self.calls += 1
+            return self._random.random(), self._random.uniform(-self.jitter, self.jitter)
+
+    def call(self, operation, nbytes=0):
+        """Spend the time one request moving ``nbytes`` would take, or fail."""
+        failure, jitter = self._draw()
+        if self._slots is not None:
+            self._slots.acquire()
+        try:
+            delay = max(0.0, self.latency + jitter)
+            if self.bandwidth:
+                delay += nbytes / self.bandwidth
+            if delay:
+                self.sleep(delay)
+            if failure < self.failure_rate:
+                raise TransientStorageError(f'injected failure during {operation}')
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+
+    def random_suffix(self, length=6):
+        with self._random_lock:
+            return ''.join(self._random.choices(string.ascii_lowercase + string.digits, k=length))
+
+
+@deconstructible
+class LocalCloudinaryStorage(Storage):
+    """
+    Cloudinary-shaped media storage on local disk. Options default to the
+    ``LOCAL_CLOUDINARY`` setting, then to an instant, never-failing network.
+    """
+
+    def __init__(self, location=None, base_url=None, latency=None, jitter=None, failure_rate=None,
+                 bandwidth=None, max_concurrency=None, url_latency=None, unique_filename=None,
+                 seed=None, sleep=time.sleep):
+        options = getattr(settings, 'LOCAL_CLOUDINARY', {})
+
+        def option(value, key, default):
+            return options.get(key, default) if value is None else value
+
+        self.files = FileSystemStorage(
+            location=option(location, 'LOCATION', os.path.join(settings.MEDIA_ROOT, 'cloudinary')))
+        cloud_name = getattr(settings, 'CLOUDINARY_STORAGE', {}).get('CLOUD_NAME') or 'local'
+        self.base_url = option(base_url, 'BASE_URL', f'https://res.cloudinary.com/{cloud_name}/image/upload/')
+        self.url_latency = option(url_latency, 'URL_LATENCY', 0.0)
+        self.unique_filename = option(unique_filename, 'UNIQUE_FILENAME', True)
+        self.network = NetworkProfile(
+            latency=option(latency, 'LATENCY', 0.0),
+            jitter=option(jitter, 'JITTER', 0.0),
+            failure_rate=option(failure_rate, 'FAILURE_RATE', 0.0),
+            bandwidth=option(bandwidth, 'BANDWIDTH', None),
+            max_concurrency=option(max_concurrency, 'MAX_CONCURRENCY', None),
+            seed=option(seed, 'SEED', None),
+            sleep=sleep,
+        )
+        self.sleep = sleep
+
+    def _prepend_prefix(self, name):
+        prefix = getattr(settings, 'CLOUDINARY_STORAGE', {}).get('PREFIX', settings.MEDIA_URL).lstrip('/')
+        if prefix and not prefix.endswith('/'):
+            prefix += '/'
+        return name if name.startswith(prefix) else prefix + name
+
+    def _public_id(self, name):
+        folder, filename = os.path.split(name)
+        stem, _ = os.path.splitext(filename)
+        if self.unique_filename:
+            stem = f'{stem}_{self.network.random_suffix()}'
+        return f'{folder}/{stem}' if folder else stem
+
+    def _open(self, name, mode='rb'):
+        name = self._prepend_prefix(name)
+        if not self.files.exists(name):
+            self.network.call('open')
+            raise IOError(f'{name} not found')
+        size = self.files.size(name)
+        self.network.call('open', nbytes=size)
+        with self.files.open(name, 'rb') as handle:
+            file = ContentFile(handle.read())
+        file.name = name
+        file.mode = mode
+        return file
+
+    def _save(self, name, content):
+        name = self._prepend_prefix(name.replace('\\', '/'))
+        data = content.read()
+        self.network.call('upload', nbytes=len(data))
+        public_id = self._public_id(name)
+        if self.files.exists(public_id):
+            self.files.delete(public_id)
+        self.files.save(public_id, ContentFile(data))
+        return public_id
+
+    def delete(self, name):
+        self.network.call('delete')
+        name = self._prepend_prefix(name)
+        if not self.files.exists(name):
+            return False
+        self.files.delete(name)
+        return True
+
+    def url(self, name):
+        if self.url_latency:
+            self.sleep(self.url_latency)
+        return self.base_url + self._prepend_prefix(name)
+
+    def exists(self, name):
+        self.network.call('head')
+        return self.files.exists(self._prepend_prefix(name))
+
+    def size(self, name):
+        self.network.call('head')
+        name = self._prepend_prefix(name)
+        return self.files.size(name) if self.files.exists(name) else None
+
+    def get_available_name(self, name, max_length=None):
+        # Cloudinary makes names unique itself, so no ``_1`` suffixes here.
+        return name if max_length is None else name[:max_length]
+
+    def listdir(self, path):
+        self.network.call('list')
+        path = self._prepend_prefix(path)
+        if not self.files.exists(path):
+            return [], []
+        return self.files.listdir(path)
@@ -0,0 +1,122 @@
+"""
+Cached storage URL resolution.
+
+A card on the home page needs the URL of the original image and of up to
+six renditions, and ``MediaCloudinaryStorage.url()`` builds each one with
+the Cloudinary SDK. ``storage_url`` remembers the result per
+``(storage, name)`` in an in-process LRU with a TTL, so a render only
+pays for names it has not seen recently, and ``storage_urls`` resolves a
+whole page of names under one lock acquisition.
+
+Storage names do not change their URL while they exist, so entries only
+need dropping when a name is deleted and could be reused; the signals in
+``frtuna.signals`` call ``invalidate`` when ``Destinations.img`` changes.
+Other processes rely on the TTL.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.functional import LazyObject, empty
+
+
+class URLCache:
+    """A thread-safe LRU mapping with per-entry expiry; ``maxsize=0`` disables it."""
+
+    def __init__(self, maxsize, ttl, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def _lookup(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires <= now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def get_many(self, keys):
+        """Return ``{key: value}`` for the keys that are cached and fresh."""
+        now = self.clock()
+        found = {}
+        with self._lock:
+            for key in keys:
+                value = self._lookup(key, now)
+                if value is not None:
+                    found[key] = value
+        return found
+
+    def set_many(self, mapping):
+        if not self.maxsize:
+            return
+        expires = self.clock() + self.ttl
+        with self._lock:
+            for key, value in mapping.items():
+                self._entries[key] = (value, expires)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+url_cache = URLCache(
+    maxsize=getattr(settings, 'STORAGE_URL_CACHE_SIZE', 4096),
+    ttl=getattr(settings, 'STORAGE_URL_CACHE_TIMEOUT', 300),
+)
+
+
+def _storage_key(storage):
+    """Identify a storage by class and base URL, looking through ``default_storage``."""
+    if isinstance(storage, LazyObject):
+        if storage._wrapped is empty:
+            storage._setup()
+        storage = storage._wrapped
+    return (type(storage).__module__, type(storage).__qualname__, getattr(storage, 'base_url', None))
+
+
+def storage_urls(storage, names):
+    """Return ``{name: url}`` for ``names`` in ``storage``, building only the misses."""
+    storage_key = _storage_key(storage)
+    names = [name for name in dict.fromkeys(names) if name]
+    found = url_cache.get_many((storage_key, name) for name in names)
+    urls = {name: found[(storage_key, name)] for name in names if (storage_key, name) in found}
+
+    missing = {name: storage.url(name) for name in names if name not in urls}
+    url_cache.set_many({(storage_key, name): url for name, url in missing.items()})
+    urls.update(missing)
+    return urls
+
+
+def storage_url(storage, name):
+    """Cached ``storage.url(name)``."""
+    return storage_urls(storage, [name]).get(name)
+
+
+def fieldfile_url(fieldfile):
+    """Cached ``fieldfile.url``, or ``None`` for an empty field."""
+    if not fieldfile:
+        return None
+    return storage_url(fieldfile.storage, fieldfile.name)
+
+
+def invalidate(storage, name):
+    if name:
+        url_cache.discard((_storage_key(storage), name))
@@ -0,0 +1,55 @@
+"""
+Warming the template cache.
+
+``TEMPLATES`` wraps the filesystem and app-directory loaders in Django's
+cached loader, so each template is read, parsed and compiled into a node
+tree once per process and reused for every render. ``warm_templates``
+does that work up front for every template the loaders can find. Run in
+the gunicorn master before it forks (``gunicorn.conf.py``), the compiled
+templates are shared by every worker and no request pays for a parse;
+run as ``manage.py warm_templates`` it doubles as a deploy check that
+every template compiles.
+"""
+
+import os
+import time
+
+from django.template import TemplateSyntaxError, engines
+from django.template.loaders.cached import Loader as CachedLoader
+
+
+TEMPLATE_EXTENSIONS = ('.html', '.txt', '.xml')
+
+
+def template_names(engine):
+    """Every template name the engine's loaders can find, each once, sorted."""
+    names = set()
+    for loader in engine.template_loaders:
+        loaders = loader.loaders if isinstance(loader, CachedLoader) else [loader]
+        for inner in loaders:
+            for directory in inner.get_dirs():
+                for root, _, files in os.walk(directory):
+                    for filename in files:
+                        if filename.endswith(TEMPLATE_EXTENSIONS):
+                            path = os.path.join(root, filename)
+                            names.add(os.path.relpath(path, directory).replace(os.sep, '/'))
+    return sorted(names)
+
+
+def warm_templates(using='django'):
+    """
+    Load every template so the cached loader keeps it compiled. Returns
+    ``(count, seconds, errors)`` where ``errors`` maps names to the syntax
+    errors that kept them from compiling.
+    """
+    engine = engines[using].engine
+    started = time.perf_counter()
+    count, errors = 0, {}
+    for name in template_names(engine):
+        try:
+            engine.get_template(name)
+        except TemplateSyntaxError as exc:
+            errors[name] = exc
+        else:
+            count += 1
+    return count, time.perf_counter() - started, errors
@@ -0,0 +1,29 @@
+from django import template
+from django.utils.html import format_html
+
+from frtuna.storage_urls import fieldfile_url
+from frtuna.thumbnails import get_derivatives, srcset
+
+
+register = template.Library()
+
+CARD_SIZES = '(max-width: 575px) 100vw, (max-width: 991px) 50vw, 33vw'
+
+
+@register.simple_tag
+def responsive_image(fieldfile, alt='', sizes=CARD_SIZES):
+    """
+    Render ``fieldfile`` as a ``<picture>`` offering WebP renditions with a
+    JPEG ``srcset`` fallback, or as a plain ``<img>`` if it has none.
+    """
+    derivatives = get_derivatives(fieldfile)
+    webp = srcset(fieldfile, 'webp', derivatives)
+    jpeg = srcset(fieldfile, 'jpeg', derivatives)
+    url = fieldfile_url(fieldfile)
+    if not webp and not jpeg:
+        return format_html('<img src="{}" alt="{}">', url, alt)
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" alt="{}" loading="lazy"></picture>',
+        webp, sizes, url, jpeg, sizes, alt,
+    )
@@ -0,0 +1,250 @@
+"""
+Fixed-width WebP/JPEG renditions of destination images.
+
+Cards on the home page are a few hundred pixels wide, but the originals
+are full-size photos. ``generate_derivatives`` produces smaller renditions
+with Pillow and stores them under names derived from the original's
+content hash, so identical images share renditions and a re-uploaded photo
+never reuses stale ones. The name storage gave each rendition is recorded
+in ``StoredFile`` (see ``frtuna.images``): Cloudinary suffixes uploads, so
+only the record finds them again. The result is cached so later renders
+only build URLs.
+
+Renditions are built on ``THUMBNAIL_WORKERS`` background threads when a
+destination is saved (see ``frtuna.signals``) or, for rows that predate
+this, when a page finds them missing; that page shows the plain original,
+and cached pages are dropped once the renditions exist.
+``prefetch_images`` loads them, and their URLs, for a whole page at once.
+"""
+
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import close_old_connections
+
+from .cache import bump_renditions_version, invalidate_destination
+from .images import record_stored, stored_names
+from .models import Destinations, SimilarDestination
+from .storage_urls import storage_urls
+
+
+logger = logging.getLogger(__name__)
+
+WIDTHS = (320, 640, 960)
+DERIVATIVE_DIR = 'thumbs'
+CACHE_TIMEOUT = 60 * 60 * 24 * 30
+# Storage errors are remembered briefly, so a missing or unreachable
+# original is not fetched again for every page that shows it.
+RETRY_TIMEOUT = 60 * 5
+
+# format -> (Pillow format, file extension, MIME type, save options)
+FORMATS = {
+    'webp': ('WEBP', 'webp', 'image/webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', 'image/jpeg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+_builder = None
+_building = set()
+_building_lock = threading.Lock()
+
+
+def _cache_key(storage, name):
+    digest = hashlib.md5(f'{type(storage).__name__}:{name}'.encode(),
+                         usedforsecurity=False).hexdigest()
+    return f'frtuna:derivatives:{digest}'
+
+
+def _encode(image, width, fmt):
+    from PIL import Image
+
+    pil_format, _, _, options = FORMATS[fmt]
+    height = max(1, round(image.height * width / image.width))
+    rendition = image.resize((width, height), Image.LANCZOS)
+    if pil_format == 'JPEG' and rendition.mode != 'RGB':
+        background = Image.new('RGB', rendition.size, 'white')
+        rgba = rendition.convert('RGBA')
+        background.paste(rgba, mask=rgba.getchannel('A'))
+        rendition = background
+    buffer = BytesIO()
+    rendition.save(buffer, pil_format, **options)
+    return buffer.getvalue()
+
+
+def generate_derivatives(storage, name):
+    """
+    Create any missing renditions of ``name`` in ``storage``.
+
+    Returns ``{'width': original width, 'webp': [(width, name), ...],
+    'jpeg': [...]}``, ``{}`` if the original is not an image Pillow can
+    decode, or ``None`` if storage could not be read or written, which is
+    worth retrying. Renditions are only made for widths smaller than the
+    original.
+    """
+    # Pillow is imported here rather than at module level: this module is
+    # loaded by every process (via frtuna.signals) but only image saves and
+    # cache misses need it.
+    from PIL import Image, ImageOps
+
+    try:
+        with storage.open(name, 'rb') as handle:
+            data = handle.read()
+    except OSError as exc:
+        logger.warning('Cannot read %s to build renditions: %s', name, exc)
+        return None
+    try:
+        image = Image.open(BytesIO(data))
+        image.load()
+    except (OSError, ValueError, Image.DecompressionBombError) as exc:
+        # UnidentifiedImageError and truncated files are OSErrors too, but
+        # these bytes are already in memory: decoding them again fails again.
+        logger.info('Cannot build renditions for %s: %s', name, exc)
+        return {}
+
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+    digest = hashlib.sha256(data).hexdigest()[:32]
+
+    names = {(fmt, width): f'{DERIVATIVE_DIR}/{digest}_{width}.{ext}'
+             for fmt, (_, ext, _, _) in FORMATS.items() for width in WIDTHS if width < image.width}
+    recorded = stored_names(storage, names.values())
+    derivatives = {'width': image.width, **{fmt: [] for fmt in FORMATS}}
+    saved = {}
+    try:
+        for (fmt, width), key in names.items():
+            derivative = recorded.get(key) or key
+            if not storage.exists(derivative):
+                derivative = saved[key] = storage.save(key, ContentFile(_encode(image, width, fmt)))
+            derivatives[fmt].append((width, derivative))
+    except OSError as exc:
+        logger.warning('Cannot store renditions of %s: %s', name, exc)
+        return None
+    finally:
+        record_stored(storage, saved)
+    return derivatives
+
+
+def build_derivatives(storage, name):
+    """
+    Generate the renditions of ``name`` and cache them. Failures to reach
+    storage are only cached, as no renditions, for ``RETRY_TIMEOUT``.
+    """
+    derivatives = generate_derivatives(storage, name)
+    if derivatives is None:
+        cache.set(_cache_key(storage, name), {}, RETRY_TIMEOUT)
+        return {}
+    cache.set(_cache_key(storage, name), derivatives, CACHE_TIMEOUT)
+    return derivatives
+
+
+def _build_in_background(key, storage, name):
+    # Like a request, the worker drops a database connection that has
+    # outlived CONN_MAX_AGE or broken.
+    close_old_connections()
+    try:
+        if any(build_derivatives(storage, name).get(fmt) for fmt in FORMATS):
+            _refresh_pages(name)
+    except Exception:
+        logger.exception('Cannot build renditions for %s', name)
+    finally:
+        with _building_lock:
+            _building.discard(key)
+        close_old_connections()
+
+
+def _refresh_pages(name):
+    """Drop cached pages that were rendered before ``name`` had renditions."""
+    bump_renditions_version()
+    shown = Destinations.objects.filter(img=name)
+    slugs = list(shown.values_list('slug', flat=True))
+    slugs += SimilarDestination.objects.filter(target__in=shown).values_list('source__slug', flat=True)
+    invalidate_destination(*slugs)
+
+
+def schedule_derivatives(fieldfile):
+    """
+    Start building the renditions of ``fieldfile`` on a background thread,
+    unless a build of it is already running. With ``THUMBNAIL_WORKERS`` set
+    to 0 they are built inline and returned instead.
+    """
+    global _builder
+    storage, name = fieldfile.storage, fieldfile.name
+    if not settings.THUMBNAIL_WORKERS:
+        return build_derivatives(storage, name)
+    key = _cache_key(storage, name)
+    with _building_lock:
+        if key in _building:
+            return None
+        _building.add(key)
+        if _builder is None:
+            _builder = ThreadPoolExecutor(settings.THUMBNAIL_WORKERS, thread_name_prefix='frtuna-thumbnails')
+    _builder.submit(_build_in_background, key, storage, name)
+    return None
+
+
+def get_derivatives(fieldfile, generate=True):
+    """
+    Return the cached renditions of ``fieldfile``. On a miss, return ``{}``
+    and, unless ``generate`` is false, start building them (see
+    ``schedule_derivatives``).
+    """
+    if not fieldfile:
+        return {}
+    prefetched = getattr(fieldfile, '_prefetched_derivatives', None)
+    if prefetched is not None:
+        return prefetched
+    derivatives = cache.get(_cache_key(fieldfile.storage, fieldfile.name))
+    if derivatives is None:
+        if not generate:
+            return {}
+        return schedule_derivatives(fieldfile) or {}
+    return derivatives
+
+
+def prefetch_images(fieldfiles):
+    """
+    Load the renditions of a page of images with one cache round trip and
+    resolve every URL they need in one batch, so rendering the page does
+    no per-card lookups.
+    """
+    by_key = {}
+    for fieldfile in fieldfiles:
+        if fieldfile:
+            by_key.setdefault(_cache_key(fieldfile.storage, fieldfile.name), []).append(fieldfile)
+    if not by_key:
+        return
+    cached = cache.get_many(list(by_key))
+
+    names = {}
+    for key, group in by_key.items():
+        derivatives = cached.get(key)
+        if derivatives is None:
+            derivatives = get_derivatives(group[0])
+        for fieldfile in group:
+            fieldfile._prefetched_derivatives = derivatives
+        batch = names.setdefault(group[0].storage, [])
+        batch.append(group[0].name)
+        batch.extend(name for fmt in FORMATS for _, name in derivatives.get(fmt, ()))
+    for storage, batch in names.items():
+        storage_urls(storage, batch)
+
+
+def srcset(fieldfile, fmt, derivatives=None):
+    """Return a ``srcset`` value for ``fmt`` renditions of ``fieldfile``."""
+    if derivatives is None:
+        derivatives = get_derivatives(fieldfile)
+    renditions = derivatives.get(fmt, ())
+    if not renditions:
+        return ''
+    urls = storage_urls(fieldfile.storage, [fieldfile.name] + [name for _, name in renditions])
+    candidates = [f'{urls[name]} {width}w' for width, name in renditions]
+    if fmt == 'jpeg':
+        # The original is the largest candidate for browsers that want it.
+        candidates.append(f'{urls[fieldfile.name]} {derivatives["width"]}w')
+    return ', '.join(candidates)
@@ -1,7 +1,23 @@
+from django.conf import settings
 from django.urls import path
 
 from . import views
 
+# Under an ASGI server the async views run on the event loop; under WSGI
+# every async view would need its own event loop, so the sync ones are used.
+if settings.ASYNC_VIEWS:
+    index, destinations_api, destinations_export = (
+        views.aindex, views.adestinations_api, views.adestinations_export)
+else:
+    index, destinations_api, destinations_export = (
+        views.index, views.destinations_api, views.destinations_export)
+
 urlpatterns = [
-    path('', views.index, name= 'index'),
-]
\ No newline at end of file
+    path('', index, name= 'index'),
+    path('search', views.search, name= 'search'),
+    path('destinations/near', views.destinations_near, name= 'destinations_near'),
+    path('destinations/<slug:slug>/', views.destination_detail, name= 'destination_detail'),
+    path('api/destinations', destinations_api, name= 'destinations_api'),
+    path('api/destinations/export', destinations_export, name= 'destinations_export'),
+    path('metrics', views.metrics, name= 'metrics'),
+]
@@ -1,6 +1,344 @@
+import hashlib
+import json
+from itertools import islice
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import (
+    Http404, HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, JsonResponse, StreamingHttpResponse,
+)
 from django.shortcuts import render
-from .models import Destinations
+from django.template.loader import render_to_string
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, etag
+from .cache import (
+    acached_fragment, acatalog_etag, aetag, cache_anonymous_page, cached_destination, cached_fragment, catalog_etag,
+)
+from .filters import DestinationFilter, InvalidFilter
+from .geo import nearest_destinations
+from .metrics import prometheus_text
+from .models import Destinations, SimilarDestination
+from .pagination import InvalidCursor, ORDERINGS, apaginate, clamp_page_size, decode_cursor, paginate
+from .search import search_destinations
+from .storage_urls import fieldfile_url, storage_urls
+from .thumbnails import prefetch_images
 # Create your views here.
+def _listing_params(request):
+    """
+    Validated sort, page size, cursor and filter for a destination listing.
+    Raises ``InvalidCursor`` or ``InvalidFilter`` for bad parameters.
+    """
+    sort = request.GET.get('sort', 'id')
+    if sort not in ORDERINGS:
+        sort = 'id'
+    page_size = clamp_page_size(request.GET.get('page_size'))
+    cursor = request.GET.get('cursor') or None
+    if cursor:
+        decode_cursor(cursor, sort)
+    filters = DestinationFilter.from_query(request.GET)
+    return sort, page_size, cursor, filters
+
+
+def _index_context(sort, page_size, filters):
+    return {
+        'sort': sort,
+        'page_size': page_size,
+        'listing_query': urlencode({'sort': sort, 'page_size': page_size, **filters.as_params()}),
+    }
+
+
+@cache_anonymous_page
 def index(request):
-    dests = Destinations.objects.all()
-    return render(request, 'index.html', {'dests': dests})
\ No newline at end of file
+    try:
+        sort, page_size, cursor, filters = _listing_params(request)
+    except (InvalidCursor, InvalidFilter) as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    # Only evaluated when the grid fragment is not already cached.
+    page = SimpleLazyObject(lambda: paginate(
+        filters.apply(Destinations.objects.defer('search_vector')),
+        sort=sort, cursor=cursor, page_size=page_size))
+    dests = SimpleLazyObject(lambda: page.items)
+    context = {'dests': dests, 'page': page, **_index_context(sort, page_size, filters)}
+
+    def render_grid():
+        prefetch_images(dest.img for dest in page.items)
+        return render_to_string('destinations_grid.html', context)
+
+    context['destinations_grid'] = cached_fragment(
+        'destinations_grid', (sort, page_size, cursor, filters.cache_parts()), render_grid, images=True)
+    return render(request, 'index.html', context)
+
+
+@cache_anonymous_page
+async def aindex(request):
+    """
+    Async ``index``. Templates cannot query the database from async code,
+    so the page is fetched up front (on a fragment cache miss) and the user
+    is resolved before rendering.
+    """
+    try:
+        sort, page_size, cursor, filters = _listing_params(request)
+    except (InvalidCursor, InvalidFilter) as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    request.user = await request.auser()
+    context = _index_context(sort, page_size, filters)
+
+    def render_page(page):
+        prefetch_images(dest.img for dest in page.items)
+        return render_to_string('destinations_grid.html', {**context, 'page': page, 'dests': page.items})
+
+    async def render_grid():
+        page = await apaginate(
+            filters.apply(Destinations.objects.defer('search_vector')),
+            sort=sort, cursor=cursor, page_size=page_size)
+        # Image renditions are looked up in the cache, which may be the database.
+        return await sync_to_async(render_page)(page)
+
+    context['destinations_grid'] = await acached_fragment(
+        'destinations_grid', (sort, page_size, cursor, filters.cache_parts()), render_grid, images=True)
+    return await sync_to_async(render)(request, 'index.html', context)
+
+
+# Fields the JSON API exposes; fetched with .values() so no model instances
+# are built. ``img`` is a storage name, turned into a URL by _api_rows.
+API_FIELDS = ('id', 'name', 'desc', 'price', 'offer', 'img')
+EXPORT_CHUNK_SIZE = 2000
+
+
+def _api_rows(rows, storage):
+    urls = storage_urls(storage, [row['img'] for row in rows])
+    for row in rows:
+        row['img'] = urls.get(row['img'])
+    return rows
+
+
+@cache_control(no_cache=True)
+@etag(catalog_etag)
+def destinations_api(request):
+    """
+    JSON listing of destinations, filtered by ``min_price``/``max_price``/
+    ``offer``, keyset-paginated like the home page, with facet counts.
+    Repeat polls with ``If-None-Match`` get a 304 until the catalog changes.
+    """
+    try:
+        sort, page_size, cursor, filters = _listing_params(request)
+    except (InvalidCursor, InvalidFilter) as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+
+    storage = Destinations._meta.get_field('img').storage
+    page = paginate(filters.apply(Destinations.objects.values(*API_FIELDS)),
+                    sort=sort, cursor=cursor, page_size=page_size)
+    return JsonResponse({
+        'results': _api_rows(page.items, storage),
+        'next_cursor': page.next_cursor,
+        'facets': filters.facets(),
+    })
+
+
+@cache_control(no_cache=True)
+@etag(catalog_etag)
+def destinations_export(request):
+    """
+    Every destination matching the filters, as a JSON array streamed in
+    chunks so memory use does not grow with the catalog.
+    """
+    try:
+        filters = DestinationFilter.from_query(request.GET)
+    except InvalidFilter as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+
+    storage = Destinations._meta.get_field('img').storage
+    rows = (filters.apply(Destinations.objects.values(*API_FIELDS))
+            .order_by('id').iterator(chunk_size=EXPORT_CHUNK_SIZE))
+
+    def stream():
+        yield '['
+        separator = ''
+        while chunk := list(islice(rows, EXPORT_CHUNK_SIZE)):
+            for row in _api_rows(chunk, storage):
+                yield separator + json.dumps(row)
+                separator = ','
+        yield ']'
+
+    return StreamingHttpResponse(stream(), content_type='application/json')
+
+
+@cache_control(no_cache=True)
+@aetag(acatalog_etag)
+async def adestinations_api(request):
+    """Async ``destinations_api``."""
+    try:
+        sort, page_size, cursor, filters = _listing_params(request)
+    except (InvalidCursor, InvalidFilter) as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+
+    storage = Destinations._meta.get_field('img').storage
+    page = await apaginate(filters.apply(Destinations.objects.values(*API_FIELDS)),
+                           sort=sort, cursor=cursor, page_size=page_size)
+    return JsonResponse({
+        'results': _api_rows(page.items, storage),
+        'next_cursor': page.next_cursor,
+        'facets': await filters.afacets(),
+    })
+
+
+async def _achunks(rows, size):
+    chunk = []
+    async for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+@cache_control(no_cache=True)
+@aetag(acatalog_etag)
+async def adestinations_export(request):
+    """Async ``destinations_export``; rows are streamed with ``aiterator``."""
+    try:
+        filters = DestinationFilter.from_query(request.GET)
+    except InvalidFilter as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+
+    storage = Destinations._meta.get_field('img').storage
+    rows = (filters.apply(Destinations.objects.values(*API_FIELDS))
+            .order_by('id').aiterator(chunk_size=EXPORT_CHUNK_SIZE))
+
+    async def stream():
+        yield '['
+        separator = ''
+        async for chunk in _achunks(rows, EXPORT_CHUNK_SIZE):
+            for row in _api_rows(chunk, storage):
+                yield separator + json.dumps(row)
+                separator = ','
+        yield ']'
+
+    return StreamingHttpResponse(stream(), content_type='application/json')
+
+
+def _build_destination(slug):
+    dest = Destinations.objects.defer('search_vector').filter(slug=slug).first()
+    if dest is None:
+        return {}
+    # Precomputed by build_similar_destinations; one lookup on (source, rank).
+    similar = [row.target for row in SimilarDestination.objects.filter(source=dest).order_by('rank')
+               .select_related('target').defer('target__search_vector')]
+    prefetch_images([dest.img, *(other.img for other in similar)])
+    html = render_to_string('destination.html', {'dest': dest, 'similar': similar})
+    return {
+        'html': html,
+        'etag': hashlib.sha256(html.encode()).hexdigest(),
+        # The strip shows the neighbours' names and images too.
+        'last_modified': max([dest.updated_at, *(other.updated_at for other in similar)]),
+    }
+
+
+def _destination_entry(request, slug):
+    # ``condition`` asks for the ETag and Last-Modified before the view runs;
+    # keep the entry on the request so all three share one cache read.
+    if not hasattr(request, '_destination_entry'):
+        if len(slug) > Destinations._meta.get_field('slug').max_length:
+            request._destination_entry = {}  # cannot exist; not worth a cache entry
+            return {}
+        request._destination_entry = cached_destination(slug, lambda: _build_destination(slug))
+    return request._destination_entry
+
+
+@cache_control(no_cache=True)
+@condition(
+    etag_func=lambda request, slug: _destination_entry(request, slug).get('etag'),
+    last_modified_func=lambda request, slug: _destination_entry(request, slug).get('last_modified'),
+)
+def destination_detail(request, slug):
+    """
+    A destination's own page, cached per slug until that row changes.
+    Revalidations answer 304 from the cache without touching the database.
+    """
+    entry = _destination_entry(request, slug)
+    if not entry:
+        raise Http404('No destination with that slug.')
+    return HttpResponse(entry['html'])
+
+
+def _coordinate(request, name, limit):
+    """A finite query parameter within ``[-limit, limit]``, or ``None``."""
+    try:
+        value = float(request.GET[name])
+    except (KeyError, ValueError):
+        return None
+    return value if -limit <= value <= limit else None
+
+
+@cache_control(no_cache=True)
+@etag(catalog_etag)
+def destinations_near(request):
+    """
+    JSON list of the ``k`` destinations nearest to ``lat``/``lon``, nearest
+    first, with their great-circle ``distance_km``. Destinations without
+    coordinates are left out.
+    """
+    lat, lon = _coordinate(request, 'lat', 90), _coordinate(request, 'lon', 180)
+    if lat is None or lon is None:
+        return JsonResponse({'error': 'lat and lon must be degrees within [-90, 90] and [-180, 180].'},
+                            status=400)
+    k = clamp_page_size(request.GET.get('k'), default=10)
+
+    nearest = nearest_destinations(lat, lon, k)
+    rows = Destinations.objects.filter(id__in=[pk for pk, _ in nearest])
+    rows = {row['id']: row for row in rows.values(*API_FIELDS, 'slug', 'latitude', 'longitude')}
+    results = [{**rows[pk], 'distance_km': round(km, 3)} for pk, km in nearest if pk in rows]
+    storage = Destinations._meta.get_field('img').storage
+    return JsonResponse({'lat': lat, 'lon': lon, 'k': k, 'results': _api_rows(results, storage)})
+
+
+# Deep pages of a relevance ranking are rarely wanted and cost OFFSET work.
+MAX_SEARCH_PAGE = 50
+
+
+def search(request):
+    query = request.GET.get('q', '').strip()
+    try:
+        page = min(max(int(request.GET.get('page', 1)), 1), MAX_SEARCH_PAGE)
+    except ValueError:
+        page = 1
+    page_size = clamp_page_size(request.GET.get('page_size'), default=10)
+
+    results = search_destinations(query, page=page, page_size=page_size)
+    return JsonResponse({
+        'query': query,
+        'page': page,
+        'has_next': results.has_next and page < MAX_SEARCH_PAGE,
+        'results': [
+            {
+                'id': dest.id,
+                'name': dest.name,
+                'desc': dest.desc,
+                'price': dest.price,
+                'offer': dest.offer,
+                'img': fieldfile_url(dest.img),
+                'rank': round(float(rank), 4),
+            }
+            for dest, rank in results
+        ],
+    })
+
+
+def metrics(request):
+    """
+    Sampled request metrics in the Prometheus text format. When
+    ``METRICS_TOKEN`` is set, scrapers must send it as a bearer token;
+    without one the page only exists with ``DEBUG`` on.
+    """
+    token = settings.METRICS_TOKEN
+    if not token and not settings.DEBUG:
+        raise Http404('Set METRICS_TOKEN to serve metrics.')
+    if token and not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponseForbidden()
+    return HttpResponse(prometheus_text(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,107 @@
+"""
+Gunicorn configuration for ethiopian_places.
+
+Gunicorn reads this file automatically when started from the project root:
+
+    gunicorn
+
+Every value can be overridden from the environment (Railway's "Variables"
+tab) without touching the code.
+
+The default is threaded WSGI workers (``gthread``) running the synchronous
+views: a few processes per CPU, each serving several requests at
+once while others wait on the database or Cloudinary. Set
+``GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker`` (needs ``uvicorn``
+installed) to serve ``ethiopian_places.asgi`` with the async views instead.
+"""
+
+import os
+
+
+def _cpu_count():
+    # Honour CPU affinity/cgroup limits where the platform exposes them, so a
+    # container limited to 2 CPUs does not start workers for the whole host.
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = f'0.0.0.0:{os.environ.get("PORT", "8000")}'
+
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+if worker_class.startswith('uvicorn'):
+    wsgi_app = 'ethiopian_places.asgi:application'
+    os.environ.setdefault('ASYNC_VIEWS', 'True')
+    # Under ASGI every sync ORM call runs on a fresh thread, so persistent
+    # per-thread connections pile up instead of being reused. Close them
+    # after each request (or set DB_POOL=True on PostgreSQL).
+    os.environ.setdefault('DB_CONN_MAX_AGE', '0')
+else:
+    wsgi_app = 'ethiopian_places.wsgi:application'
+
+# (2 x CPUs) + 1 keeps every CPU busy while some workers wait on I/O.
+workers = int(os.environ.get('WEB_CONCURRENCY', 2 * _cpu_count() + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# The catalog version (frtuna.cache), cached sessions and users, and login
+# throttle counts must be seen by every worker; locmem is private to each
+# process, so a save would only reach the worker that handled it. Several
+# workers share the file cache instead, and refuse to start on locmem.
+if workers > 1:
+    os.environ.setdefault('CACHE_BACKEND', 'file')
+    if os.environ['CACHE_BACKEND'] == 'locmem':
+        raise RuntimeError(
+            f'CACHE_BACKEND=locmem cannot be shared by {workers} workers; '
+            'use CACHE_BACKEND=file or db, or WEB_CONCURRENCY=1.'
+        )
+
+# Import Django once in the master so workers fork with it already loaded:
+# faster start-up and copy-on-write memory sharing between workers.
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'True') == 'True'
+
+# Recycle each worker after a jittered number of requests so slow leaks
+# cannot grow forever and workers do not all restart at the same moment.
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+# Keep idle client connections open longer than the default 2 seconds, so the
+# platform's proxy can reuse them instead of reconnecting for every request.
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    # With preload_app, anything the master opened before forking would be
+    # shared by every worker. Database connections must never be shared.
+    if not server.cfg.preload_app:
+        return
+    from django.db import connections
+
+    connections.close_all()
+
+
+def _warm_templates(log):
+    from frtuna.template_cache import warm_templates
+
+    count, seconds, errors = warm_templates()
+    log.info('Compiled %d templates in %.0f ms', count, seconds * 1000)
+    for name, exc in errors.items():
+        log.error('Template %s does not compile: %s', name, exc)
+
+
+def when_ready(server):
+    # With preload_app the master has loaded Django: compile the templates
+    # once here and every worker forks with them already cached.
+    if server.cfg.preload_app:
+        _warm_templates(server.log)
+
+
+def post_worker_init(worker):
+    if not worker.cfg.preload_app:
+        _warm_templates(worker.log)